@@ -12,6 +12,7 @@ such as database, bcrypt, login manager, AI service, and CSRF protection.
 
 Functions:
     create_app: Creates and configures the Flask application.
+    warm_up_indexes: Builds in-memory indexes in a background thread.
 
 Usage:
     Import the create_app function to initialize the Flask application.
@@ -22,14 +23,26 @@ Example:
 """
 
 import os
-from flask import Flask, redirect, url_for
+import threading
+from flask import Flask, jsonify, redirect, request, url_for
 from flask_bcrypt import Bcrypt
 from flask_migrate import Migrate
 from app.auth_manager import AuthManager
 from app.db_manager import DBManager
 from app.log import AppLogger
 from app.services.ai_service import AIService
+from app.services.blob_store import BlobStore
+from app.services.candidate_ranking import CandidateIndex
+from app.services.model_registry import model_registry
+from app.services.ner_service import ner_service
+from app.services.result_cache import AnalysisCache
+from app.services.similarity_index import ResumeVectorIndex
+from app.services.skill_index import SkillIndex
+from app.services.text_extraction import PDFPageExtractor, pdf_text_cache
+from app.services.tracing import tracer
 from app.csrf_manager import CSRFManager  # Import the CSRFManager
+from app.utils.file_utils import SizeLimitedRequest
+from werkzeug.exceptions import RequestEntityTooLarge
 from config import config
 
 # Initialize Flask extensions
@@ -61,6 +74,7 @@ def create_app(config_name='development', template_folder=None):
         template_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
 
     app = Flask(__name__, template_folder=template_folder)  # Use template_folder variable
+    app.request_class = SizeLimitedRequest
 
     if isinstance(config_name, str):
         app.config.from_object(config[config_name])
@@ -70,6 +84,7 @@ def create_app(config_name='development', template_folder=None):
         config_obj = config_name
 
     config_obj.init_app(app)
+    AppLogger.configure_from(app.config)
 
     app.config['DEBUG'] = True  # Enable debug mode
 
@@ -81,9 +96,41 @@ def create_app(config_name='development', template_folder=None):
         auth_manager.init_app(app)  # Initialize AuthManager
         csrf_manager.init_app(app)  # Initialize CSRF protection
 
-        # Initialize AI service with a valid model
-        ai_service = AIService(model_path='distilbert-base-uncased-finetuned-sst-2-english')
+        # Initialize AI service with a valid model; the model itself is loaded on first use
+        ai_service = AIService(model_path='distilbert-base-uncased-finetuned-sst-2-english',
+                               max_batch_size=app.config.get('AI_BATCH_MAX_SIZE', 16),
+                               max_wait_ms=app.config.get('AI_BATCH_MAX_WAIT_MS', 10),
+                               window_overlap=app.config.get('AI_WINDOW_OVERLAP', 128),
+                               aggregation=app.config.get('AI_WINDOW_AGGREGATION', 'mean'),
+                               analysis_mode=app.config.get('CONTENT_ANALYSIS_MODE', 'exact'),
+                               semantic_threshold=app.config.get('SEMANTIC_MATCH_THRESHOLD', 0.7))
         app.ai_service = ai_service
+        ner_service.configure(max_queue_size=app.config.get('NER_QUEUE_SIZE', 64),
+                              timeout=app.config.get('NER_TIMEOUT', 60))
+        app.blob_store = BlobStore(app.config['BLOB_STORE_FOLDER'])
+        app.analysis_cache = AnalysisCache(max_size=app.config.get('ANALYSIS_CACHE_SIZE', 1024))
+        # Built from the stored resume keywords, then kept up to date incrementally
+        app.candidate_index = CandidateIndex(refresh_window=app.config.get('INDEX_REFRESH_WINDOW', 60),
+                                             reconcile_interval=app.config.get('INDEX_RECONCILE_INTERVAL', 60))
+        app.skill_index = SkillIndex(refresh_window=app.config.get('INDEX_REFRESH_WINDOW', 60),
+                                     reconcile_interval=app.config.get('INDEX_RECONCILE_INTERVAL', 60))
+        app.similarity_index = (ResumeVectorIndex(app.config['SIMILARITY_INDEX_FOLDER'],
+                                                  probes=app.config.get('SIMILARITY_INDEX_PROBES', 8),
+                                                  refresh_window=app.config.get('INDEX_REFRESH_WINDOW', 60),
+                                                  reconcile_interval=app.config.get('INDEX_RECONCILE_INTERVAL', 60))
+                                if app.config.get('SIMILARITY_INDEX_FOLDER') else None)
+        pdf_text_cache.extractor.shutdown()
+        pdf_text_cache.extractor = PDFPageExtractor(
+            max_workers=app.config.get('PDF_EXTRACTION_WORKERS', 4),
+            page_timeout=app.config.get('PDF_PAGE_TIMEOUT', 30),
+            min_parallel_pages=app.config.get('PDF_PARALLEL_MIN_PAGES', 8))
+        tracer.enabled = app.config.get('TRACING_ENABLED', True)
+        from app.tasks import init_celery
+        init_celery(app)
+        if app.config.get('MODEL_WARMUP'):
+            model_registry.warm_up()
+        if app.config.get('INDEX_WARMUP'):
+            warm_up_indexes(app, app.candidate_index, app.skill_index)
 
         from app.models import User
 
@@ -100,6 +147,18 @@ def create_app(config_name='development', template_folder=None):
         def home():
             return redirect(url_for('public.home'))
 
+        @app.before_request
+        def reject_oversized_requests():
+            # Refused from the Content-Length header, before a view can read (or swallow errors parsing) the body
+            limit = request.max_content_length
+            if limit is not None and request.content_length is not None and request.content_length > limit:
+                raise RequestEntityTooLarge()
+
+        @app.errorhandler(RequestEntityTooLarge)
+        def request_too_large(e):
+            limit = request.max_content_length
+            return jsonify({"error": f"The request exceeds the maximum size of {limit} bytes"}), 413
+
         # Create tables if they do not exist
         if app.config['TESTING']:
             with app.app_context():
@@ -110,3 +169,28 @@ def create_app(config_name='development', template_folder=None):
         app_logger.error(f"Error initializing the app: {e}")
 
     return app
+
+
+def warm_up_indexes(app, *indexes) -> threading.Thread:
+    """
+    Builds in-memory indexes in a background thread, so the first request does not wait for them.
+
+    Args:
+    app (Flask): The application whose database the indexes are built from.
+    indexes: Objects with a refresh method, such as the candidate index.
+
+    Returns:
+    threading.Thread: The warm-up thread.
+    """
+    def warm_up():
+        with app.app_context():
+            for index in indexes:
+                try:
+                    index.refresh()
+                except Exception as e:
+                    app_logger.error(f"Error warming up {type(index).__name__}: {e}")
+            db_manager.get_db().session.remove()
+
+    thread = threading.Thread(target=warm_up, name='index-warm-up', daemon=True)
+    thread.start()
+    return thread
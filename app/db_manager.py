@@ -9,6 +9,8 @@ Revised: 14 July 2024
 Description:
 This module manages the database connection for the Flask application.
 It includes methods to initialize and retrieve the SQLAlchemy database instance.
+SQLite connections (used by the tests) begin their transactions explicitly, so savepoints nest
+inside the session's transaction as they do on SQL Server.
 
 Usage:
     Import this module and create an instance of DBManager.
@@ -22,7 +24,10 @@ Example:
 """
 
 import logging
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 # Initialize the SQLAlchemy database instance
 db = SQLAlchemy()
@@ -30,10 +35,20 @@ db = SQLAlchemy()
 # Configure logging
 logger = logging.getLogger('db_manager')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('db_manager.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+
+# The sqlite3 module commits on RELEASE of a savepoint opened outside a transaction it started
+# itself; let SQLAlchemy emit BEGIN instead (the recipe of the SQLAlchemy SQLite dialect docs)
+@event.listens_for(Engine, 'connect')
+def _disable_sqlite_implicit_transactions(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.isolation_level = None
+
+
+@event.listens_for(Engine, 'begin')
+def _begin_sqlite_transaction(connection):
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql('BEGIN')
 
 
 class DBManager:
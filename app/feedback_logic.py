@@ -32,10 +32,6 @@ import logging
 # Configure logging
 logger = logging.getLogger('feedback_logic')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('feedback_logic.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 class FeedbackGenerator:
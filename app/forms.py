@@ -31,10 +31,6 @@ from sqlalchemy.exc import SQLAlchemyError
 # Configure logging
 logger = logging.getLogger('forms')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('forms.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 def validate_username(form, field):
@@ -4,56 +4,364 @@ log.py
 Author: William Richmond
 Created on: 28 July 2024
 File name: log.py
-Revised:
+Revised: 18 October 2026
 
 Description:
 This module sets up logging for the ResuMate application.
-It configures the logger to log messages to a file with the appropriate format and level.
+Every logger of the application propagates to a single QueueHandler on the root logger, which
+only puts the record on an in-memory queue, so logging never waits for the disk on a request
+thread. One background QueueListener thread writes the records to the log file, as JSON lines
+by default, and rotates the file by size or time.
+Forked processes, such as Celery and text extraction workers, do not write or rotate the file
+themselves: their queue sends each record as a JSON datagram over a Unix socket pair to the
+process that configured logging, whose listener is the only writer of the file.
+The state of the setup is kept on the root logger's QueueHandler rather than in module globals,
+so configuring again, or reloading a module, reuses it instead of adding handlers.
 
 Classes:
+    JsonFormatter: Formats a record as one line of JSON.
     AppLogger: Handles the creation and configuration of the logger.
 
 Usage:
-    Use the AppLogger.get_logger() method to get the configured logger instance.
+    Use the AppLogger.get_logger() method to get the configured logger instance, or
+    logging.getLogger(name) in a module; create_app applies the LOG_* settings of the configuration.
 
 Example:
     logger = AppLogger.get_logger()
     logger.info('This is an info message')
 """
 
-import logging
 import atexit
+import copy
+import errno
+import json
+import logging
+import logging.handlers
 import os
+import queue
+import socket
+import threading
+from datetime import datetime, timezone
+
+DEFAULT_LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'logs')
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# SQL echo (SQLALCHEMY_ECHO) has its own console handler and would flood the log file
+DEFAULT_EXCLUDED_LOGGERS = ('sqlalchemy.engine',)
+
+# Attributes every LogRecord has; any other attribute was passed in 'extra' and is written as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+# Longest field a forked process sends, in characters, and longest record, in bytes. A record must
+# fit in one datagram, which Linux limits to the socket send buffer (about 208KB by default).
+MAX_FORWARDED_FIELD = 16 * 1024
+MAX_FORWARDED_RECORD = 128 * 1024
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one line of JSON, starting with its time and level.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _ExcludeLoggers(logging.Filter):
+    """
+    Drops the records of some loggers and their children.
+    """
+
+    def __init__(self, names):
+        super().__init__()
+        self.names = tuple(names)
+        self.prefixes = tuple(f'{name}.' for name in self.names)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not (record.name in self.names or record.name.startswith(self.prefixes))
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for the listener thread, with the message and traceback already rendered.
+    The setup the handler belongs to is kept on it, so it is found again after a module reload.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.listener = None
+        self.file_handler = None
+        self.settings = None
+        # The process the listener thread runs in
+        self.pid = None
+        # The receiving and sending sockets of the records of forked processes
+        self.fork_sockets = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render now, as the arguments may change before the listener writes the record, and drop
+        # the traceback so the queued record does not keep the frames alive
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _ForwardingQueue:
+    """
+    Stands in for the queue of a forked process: records are sent to the process that writes the log file.
+    The socket does not block, so a record that does not fit in the socket buffer is dropped and counted,
+    instead of stalling the thread that logged it.
+    """
+    forwards_to_writer = True
+
+    def __init__(self, send_socket):
+        self.send_socket = send_socket
+        # Records dropped since the last one sent
+        self.dropped = 0
+
+    @staticmethod
+    def _shorten(key: str, value: str, length: int) -> str:
+        # Keep the end of a message or traceback, where the exception is, and the start of anything else
+        return '...' + value[-length:] if key in ('msg', 'exc_text') else value[:length] + '...'
+
+    @staticmethod
+    def _serialize(record: logging.LogRecord) -> bytes:
+        # The message is rendered again from msg by the writer
+        fields = {key: value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+                  for key, value in vars(record).items() if key != 'message'}
+        for key, value in fields.items():
+            if isinstance(value, str) and len(value) > MAX_FORWARDED_FIELD:
+                fields[key] = _ForwardingQueue._shorten(key, value, MAX_FORWARDED_FIELD)
+        data = json.dumps(fields).encode('utf-8')
+        while len(data) > MAX_FORWARDED_RECORD:
+            # Many large 'extra' fields: halve the longest one until the record fits
+            key = max(fields, key=lambda name: len(fields[name]) if isinstance(fields[name], str) else 0)
+            if not isinstance(fields[key], str) or len(fields[key]) < 64:
+                break
+            fields[key] = _ForwardingQueue._shorten(key, fields[key], len(fields[key]) // 2)
+            data = json.dumps(fields).encode('utf-8')
+        return data
+
+    def _send(self, data: bytes) -> bool:
+        try:
+            self.send_socket.send(data)
+            return True
+        except BlockingIOError:
+            # The writing process is not keeping up
+            self.dropped += 1
+        except OSError as e:
+            if e.errno != errno.EMSGSIZE:
+                raise
+            self.dropped += 1
+        return False
+
+    def put_nowait(self, record: logging.LogRecord):
+        if not self._send(self._serialize(record)) or not self.dropped:
+            return
+        dropped, self.dropped = self.dropped, 0
+        notice = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': f"Dropped {dropped} log records of process {os.getpid()}, the log writer was not keeping up"})
+        if not self._send(self._serialize(notice)):
+            self.dropped += dropped
+
+
+def _receive_forwarded_records(queue_handler, receive_socket):
+    """
+    Queue the records sent by forked processes for the listener of this process.
+    """
+    while True:
+        try:
+            data = receive_socket.recv(MAX_FORWARDED_RECORD)
+        except OSError:
+            return
+        try:
+            queue_handler.queue.put_nowait(logging.makeLogRecord(json.loads(data)))
+        except ValueError:
+            continue
 
 
 class AppLogger:
-    file_handler = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _queue_handler():
+        """
+        Return the QueueHandler of the application on the root logger, if logging is configured.
+        """
+        for handler in logging.getLogger().handlers:
+            if getattr(handler, 'is_resumate_queue_handler', False):
+                return handler
+        return None
+
+    @staticmethod
+    def configure(log_dir=None, filename='app.log', level=logging.INFO, max_bytes=10 * 1024 * 1024,
+                  backup_count=5, rotate_when=None, json_lines=True, excluded_loggers=DEFAULT_EXCLUDED_LOGGERS):
+        """
+        Configure the queue-backed logging of the application. Calling it again with the same settings
+        does nothing; with other settings, the file handler is replaced and the queue is kept.
+
+        Args:
+            log_dir (str, optional): The directory of the log file. Defaults to the logs directory of the project.
+            filename (str): The name of the log file.
+            level (int or str): The lowest level written.
+            max_bytes (int): Size at which the file is rotated, if rotate_when is not set.
+            backup_count (int): The number of rotated files kept.
+            rotate_when (str, optional): Rotate by time instead of size, e.g. 'midnight' or 'H'.
+            json_lines (bool): Write JSON lines instead of the text format.
+            excluded_loggers (Iterable[str]): Loggers whose records, and their children's, are not written.
+
+        Returns:
+            logging.Logger: The 'resumate' logger.
+        """
+        log_dir = os.path.abspath(log_dir or DEFAULT_LOG_DIR)
+        level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+        excluded_loggers = tuple(excluded_loggers)
+        settings = (log_dir, filename, level, max_bytes, backup_count, rotate_when, json_lines, excluded_loggers)
+        with AppLogger._lock:
+            queue_handler = AppLogger._queue_handler()
+            if queue_handler is not None and getattr(queue_handler.queue, 'forwards_to_writer', False):
+                # A forked process: the process it was forked from writes the file
+                queue_handler.setLevel(level)
+                queue_handler.filters = [_ExcludeLoggers(excluded_loggers)]
+                logging.getLogger('resumate').setLevel(level)
+                return logging.getLogger('resumate')
+            if queue_handler is None or queue_handler.settings != settings:
+                os.makedirs(log_dir, exist_ok=True)
+                path = os.path.join(log_dir, filename)
+                if rotate_when:
+                    file_handler = logging.handlers.TimedRotatingFileHandler(
+                        path, when=rotate_when, backupCount=backup_count, encoding='utf-8', delay=True)
+                else:
+                    file_handler = logging.handlers.RotatingFileHandler(
+                        path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+                file_handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+
+                if queue_handler is None:
+                    queue_handler = _QueueHandler(queue.Queue())
+                    queue_handler.is_resumate_queue_handler = True
+                    AppLogger._receive_from_forks(queue_handler)
+                    logging.getLogger().addHandler(queue_handler)
+                else:
+                    AppLogger._stop(queue_handler)
+                queue_handler.setLevel(level)
+                queue_handler.filters = [_ExcludeLoggers(excluded_loggers)]
+                queue_handler.file_handler = file_handler
+                AppLogger._start(queue_handler)
+                queue_handler.settings = settings
+                logging.getLogger('resumate').setLevel(level)
+        return logging.getLogger('resumate')
+
+    @staticmethod
+    def configure_from(app_config):
+        """
+        Configure logging from the LOG_* settings of a Flask configuration.
+
+        Args:
+            app_config (Mapping): The configuration, e.g. app.config.
+
+        Returns:
+            logging.Logger: The 'resumate' logger.
+        """
+        return AppLogger.configure(log_dir=app_config.get('LOG_FOLDER'),
+                                   filename=app_config.get('LOG_FILE', 'app.log'),
+                                   level=app_config.get('LOG_LEVEL', logging.INFO),
+                                   max_bytes=app_config.get('LOG_MAX_BYTES', 10 * 1024 * 1024),
+                                   backup_count=app_config.get('LOG_BACKUP_COUNT', 5),
+                                   rotate_when=app_config.get('LOG_ROTATE_WHEN'),
+                                   json_lines=app_config.get('LOG_JSON', True),
+                                   excluded_loggers=app_config.get('LOG_EXCLUDED_LOGGERS', DEFAULT_EXCLUDED_LOGGERS))
 
     @staticmethod
     def get_logger():
-        log_instance = logging.getLogger('resumate')
-        if not log_instance.hasHandlers():
-            log_instance.setLevel(logging.INFO)
+        if AppLogger._queue_handler() is None:
+            return AppLogger.configure()
+        return logging.getLogger('resumate')
+
+    @staticmethod
+    def _receive_from_forks(queue_handler):
+        """
+        Open the socket pair forked processes send their records through, where Unix sockets exist.
+        """
+        if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'register_at_fork'):
+            return
+        # Datagrams keep the records of concurrent processes apart
+        receive_socket, send_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        # Forked processes drop records rather than wait for the writer; see _ForwardingQueue
+        send_socket.setblocking(False)
+        queue_handler.fork_sockets = (receive_socket, send_socket)
+        threading.Thread(target=_receive_forwarded_records, args=(queue_handler, receive_socket),
+                         name='log-fork-receiver', daemon=True).start()
 
-            # Ensure the logs directory exists
-            log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'logs')
-            os.makedirs(log_dir, exist_ok=True)
+    @staticmethod
+    def _start(queue_handler):
+        queue_handler.listener = logging.handlers.QueueListener(queue_handler.queue, queue_handler.file_handler)
+        queue_handler.listener.start()
+        queue_handler.pid = os.getpid()
 
-            AppLogger.file_handler = logging.FileHandler(os.path.join(log_dir, 'app.log'))
-            AppLogger.file_handler.setLevel(logging.INFO)
-            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            AppLogger.file_handler.setFormatter(formatter)
-            log_instance.addHandler(AppLogger.file_handler)
-        return log_instance
+    @staticmethod
+    def _stop(queue_handler):
+        if queue_handler.listener is not None:
+            # Writes the records still queued before returning
+            queue_handler.listener.stop()
+            queue_handler.listener = None
+        if queue_handler.file_handler is not None:
+            queue_handler.file_handler.close()
+        queue_handler.settings = None
+
+    @staticmethod
+    def _restart_after_fork():
+        """
+        Send the records of a forked child, e.g. a Celery or extraction worker, to the process writing the file.
+        Without Unix sockets a listener of its own is started, as threads do not survive a fork.
+        """
+        queue_handler = AppLogger._queue_handler()
+        if (queue_handler is None or queue_handler.listener is None or queue_handler.pid == os.getpid()
+                or getattr(queue_handler.queue, 'forwards_to_writer', False)):
+            return
+        fork_sockets = getattr(queue_handler, 'fork_sockets', None)
+        if fork_sockets is None:
+            queue_handler.queue = queue.Queue()
+            AppLogger._start(queue_handler)
+            return
+        receive_socket, send_socket = fork_sockets
+        # Closed here, so sending fails instead of blocking if the writing process has exited
+        receive_socket.close()
+        queue_handler.queue = _ForwardingQueue(send_socket)
+        # The listener thread did not survive the fork, and the file is only written by the parent
+        queue_handler.listener = None
+        queue_handler.file_handler = None
 
     @staticmethod
     def close_logger():
-        if AppLogger.file_handler:
-            AppLogger.file_handler.close()
+        with AppLogger._lock:
+            queue_handler = AppLogger._queue_handler()
+            if queue_handler is not None:
+                AppLogger._stop(queue_handler)
 
 
 # Initialize logger
 app_logger = AppLogger.get_logger()
 
-# Make sure to close the logger at application exit
+# Make sure the queued records are written at application exit
 atexit.register(AppLogger.close_logger)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=AppLogger._restart_after_fork)
@@ -28,6 +28,10 @@ Classes:
     FeedbackTemplate: Represents a feedback template.
     UploadedFile: Represents a file uploaded by a user.
     AIResult: Represents the AI processing result of an uploaded file.
+    ExtractedText: Represents the text extracted from a file, keyed by content hash.
+    AnalysisJob: Represents a queued analysis of an uploaded file.
+    IngestJob: Represents a queued bulk ingestion of an archive of resumes.
+    FileBlob: Represents a stored file content, shared by every upload with the same bytes.
 
 Usage:
     Import the models module and use the classes to interact with the database.
@@ -39,6 +43,7 @@ Example:
 from hashlib import md5
 from flask_bcrypt import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from sqlalchemy import event, inspect
 from app.db_manager import db
 
 
@@ -109,16 +114,23 @@ class Resume(db.Model):
         id (int): Resume ID.
         user_id (int): ID of the user who uploaded the resume.
         content (str): Content of the resume.
+        revision (int): Incremented every time the content is written.
+        keywords (str): The ranking vocabulary keywords found in the content, one per line.
+        taxonomy_version (str): The version of the vocabularies the keywords were found with.
         uploaded_at (datetime): Timestamp when the resume was uploaded.
         updated_at (datetime): Timestamp when the resume was last updated.
     """
     __tablename__ = 'resume'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     content = db.Column(db.Text, nullable=False)
+    revision = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    keywords = db.Column(db.Text)
+    taxonomy_version = db.Column(db.String(16))
     uploaded_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp(),
+                           index=True)
     user = db.relationship('User', back_populates='resumes')
     feedback = db.relationship('Feedback', back_populates='resume', lazy='dynamic')
     templates = db.relationship('ResumeTemplate', back_populates='resume', lazy='dynamic')
@@ -128,6 +140,15 @@ class Resume(db.Model):
         return f'<Resume {self.id} by User {self.user_id}>'
 
 
+@event.listens_for(Resume.content, 'set')
+def _increment_resume_revision(resume, content, previous, initiator):
+    # Lets the in-memory indexes tell an edited resume from one they have already read. New
+    # resumes keep the default; stored ones are incremented by the UPDATE itself, so concurrent
+    # edits of the same resume each add one.
+    if inspect(resume).has_identity:
+        resume.revision = Resume.revision + 1
+
+
 class Feedback(db.Model):
     """
     Represents feedback on a résumé.
@@ -141,7 +162,7 @@ class Feedback(db.Model):
     __tablename__ = 'feedback'
 
     id = db.Column(db.Integer, primary_key=True)
-    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=False)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=False, index=True)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     resume = db.relationship('Resume', back_populates='feedback')
@@ -186,10 +207,13 @@ class ResumeTemplate(db.Model):
         applied_at (datetime): Timestamp when the template was applied.
     """
     __tablename__ = 'resume_template'
+    # The unique constraint also serves lookups by resume_id
+    __table_args__ = (db.UniqueConstraint('resume_id', 'template_id',
+                                          name='uq_resume_template_resume_id_template_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=False)
-    template_id = db.Column(db.Integer, db.ForeignKey('template.id'), nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey('template.id'), nullable=False, index=True)
     applied_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     resume = db.relationship('Resume', back_populates='templates')
     template = db.relationship('Template', back_populates='resumes')
@@ -226,10 +250,12 @@ class ResumeSkill(db.Model):
         skill_id (int): ID of the skill.
     """
     __tablename__ = 'resume_skill'
+    # The unique constraint also serves lookups by resume_id
+    __table_args__ = (db.UniqueConstraint('resume_id', 'skill_id', name='uq_resume_skill_resume_id_skill_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=False)
-    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False, index=True)
     resume = db.relationship('Resume', back_populates='skills')
     skill = db.relationship('Skill', back_populates='resumes')
 
@@ -274,8 +300,8 @@ class UserSession(db.Model):
     __tablename__ = 'user_session'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    session_token = db.Column(db.String(128), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    session_token = db.Column(db.String(128), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     expires_at = db.Column(db.DateTime, nullable=False)
     user = db.relationship('User', back_populates='sessions')
@@ -297,7 +323,7 @@ class Log(db.Model):
     __tablename__ = 'log'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     action = db.Column(db.String(128), nullable=False)
     timestamp = db.Column(db.DateTime, default=db.func.current_timestamp())
     user = db.relationship('User', back_populates='logs')
@@ -336,10 +362,13 @@ class TemplateCategoryMapping(db.Model):
         category_id (int): ID of the category.
     """
     __tablename__ = 'template_category_mapping'
+    # The unique constraint also serves lookups by template_id
+    __table_args__ = (db.UniqueConstraint('template_id', 'category_id',
+                                          name='uq_template_category_mapping_template_id_category_id'),)
 
     id = db.Column(db.Integer, primary_key=True)
     template_id = db.Column(db.Integer, db.ForeignKey('template.id'), nullable=False)
-    category_id = db.Column(db.Integer, db.ForeignKey('template_category.id'), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey('template_category.id'), nullable=False, index=True)
     template = db.relationship('Template', back_populates='categories')
     category = db.relationship('TemplateCategory', back_populates='template')
 
@@ -377,15 +406,22 @@ class UploadedFile(db.Model):
         user_id (int): ID of the user who uploaded the file.
         filename (str): Name of the uploaded file.
         file_path (str): Path to the uploaded file.
+        content_hash (str): SHA-256 of the file contents.
+        blob_id (int): ID of the stored content of the file.
     """
     __tablename__ = 'uploaded_file'
 
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     filename = db.Column(db.String(128), nullable=False)
     file_path = db.Column(db.String(256), nullable=False)
+    content_hash = db.Column(db.String(64), index=True)
+    blob_id = db.Column(db.Integer, db.ForeignKey('file_blob.id'), nullable=True)
     user = db.relationship('User', back_populates='uploads')
+    blob = db.relationship('FileBlob', back_populates='uploads')
     ai_results = db.relationship('AIResult', back_populates='file', lazy='dynamic')
+    extracted_text = db.relationship('ExtractedText', uselist=False, viewonly=True,
+                                     primaryjoin='foreign(UploadedFile.content_hash) == ExtractedText.content_hash')
 
     def __repr__(self):
         return f'<UploadedFile {self.filename}>'
@@ -397,15 +433,140 @@ class AIResult(db.Model):
 
     Attributes:
         id (int): AIResult ID.
-        file_id (int): ID of the uploaded file.
+        file_id (int): ID of the uploaded file, if the result belongs to one.
+        cache_key (str): Content hash of the resume, job description, model and taxonomy versions.
         result_data (str): Data resulting from AI processing.
+        created_at (datetime): Timestamp when the result was created.
     """
     __tablename__ = 'ai_result'
 
     id = db.Column(db.Integer, primary_key=True)
-    file_id = db.Column(db.Integer, db.ForeignKey('uploaded_file.id'), nullable=False)
+    file_id = db.Column(db.Integer, db.ForeignKey('uploaded_file.id'), nullable=True, index=True)
+    cache_key = db.Column(db.String(64), index=True)
     result_data = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     file = db.relationship('UploadedFile', back_populates='ai_results')
 
     def __repr__(self):
         return f'<AIResult {self.id}>'
+
+
+class ExtractedText(db.Model):
+    """
+    Represents the text extracted from a file, keyed by content hash.
+
+    Attributes:
+        id (int): ExtractedText ID.
+        content_hash (str): SHA-256 of the file the text was extracted from.
+        pages (str): JSON list with the text of each page; the plain text is the pages joined by form feeds.
+        page_count (int): Number of pages in the file.
+        created_at (datetime): Timestamp when the text was extracted.
+    """
+    __tablename__ = 'extracted_text'
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)
+    pages = db.Column(db.Text, nullable=False)
+    page_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<ExtractedText {self.content_hash[:12]} ({self.page_count} pages)>'
+
+
+class AnalysisJob(db.Model):
+    """
+    Represents a queued analysis of an uploaded file.
+
+    Attributes:
+        id (str): Job ID, also used as the Celery task ID.
+        user_id (int): ID of the user who queued the analysis.
+        file_id (int): ID of the uploaded file being analysed.
+        job_description (str): The job description the resume is scored against.
+        status (str): One of 'queued', 'running', 'done' or 'failed'.
+        progress (float): Fraction of the pipeline completed, from 0 to 1.
+        error (str): The error message if the job failed.
+        ai_result_id (int): ID of the AIResult written when the job finished.
+        created_at (datetime): Timestamp when the job was queued.
+        updated_at (datetime): Timestamp when the job last changed.
+    """
+    __tablename__ = 'analysis_job'
+
+    STATUSES = ('queued', 'running', 'done', 'failed')
+
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    file_id = db.Column(db.Integer, db.ForeignKey('uploaded_file.id'), nullable=False)
+    job_description = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    error = db.Column(db.Text, nullable=True)
+    ai_result_id = db.Column(db.Integer, db.ForeignKey('ai_result.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    file = db.relationship('UploadedFile')
+    ai_result = db.relationship('AIResult')
+
+    def __repr__(self):
+        return f'<AnalysisJob {self.id} {self.status}>'
+
+
+class IngestJob(db.Model):
+    """
+    Represents a queued bulk ingestion of an archive of resumes.
+
+    Attributes:
+        id (str): Job ID, also used as the Celery task ID.
+        user_id (int): ID of the admin who queued the ingestion; the resumes belong to this user.
+        filename (str): The name of the uploaded archive.
+        archive_path (str): Path to the archive while it waits to be ingested.
+        status (str): One of 'queued', 'running', 'done' or 'failed'.
+        files (int): Number of files read from the archive so far.
+        report (str): The ingestion report as JSON, once the job has finished.
+        error (str): The error message if the job failed.
+        created_at (datetime): Timestamp when the job was queued.
+        updated_at (datetime): Timestamp when the job last changed.
+    """
+    __tablename__ = 'ingest_job'
+
+    STATUSES = ('queued', 'running', 'done', 'failed')
+
+    id = db.Column(db.String(36), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    filename = db.Column(db.String(256), nullable=False)
+    archive_path = db.Column(db.String(512), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    files = db.Column(db.Integer, nullable=False, default=0)
+    report = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<IngestJob {self.id} {self.status}>'
+
+
+class FileBlob(db.Model):
+    """
+    Represents a stored file content, shared by every upload with the same bytes.
+
+    Attributes:
+        id (int): FileBlob ID.
+        content_hash (str): SHA-256 of the content, which also determines the storage path.
+        size (int): Size of the content in bytes.
+        storage_path (str): Path to the stored content.
+        ref_count (int): Number of uploads referencing the content.
+        created_at (datetime): Timestamp when the content was first stored.
+    """
+    __tablename__ = 'file_blob'
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    storage_path = db.Column(db.String(256), nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    uploads = db.relationship('UploadedFile', back_populates='blob', lazy='dynamic')
+
+    def __repr__(self):
+        return f'<FileBlob {self.content_hash[:12]} ({self.ref_count} references)>'
@@ -1,16 +1,184 @@
 import docx2txt
-from pdfminer.high_level import extract_text
 import logging
-import spacy
+import re
+import threading
+from flask import has_app_context
 from spacy.matcher import PhraseMatcher
-from typing import Dict, List
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from app.db_manager import db
+from app.models import Skill
+from app.services.model_registry import model_registry
+from app.services.text_extraction import pdf_text_cache
 
 # Initialize logger
 logger = logging.getLogger('resumate.resume_parser')
 logger.setLevel(logging.DEBUG)
 
-# Load SpaCy model
-nlp_spacy = spacy.load("en_core_web_lg")
+
+def get_nlp():
+    """
+    Return the shared SpaCy model, loading it on first use.
+    """
+    return model_registry.get('spacy')
+
+
+# Phrases matched in every resume, in addition to the names in the Skill table
+DEFAULT_PHRASES = ["John Doe", "Software Engineer", "Senior Developer", "Python", "Java", "SQL"]
+
+
+class PhraseMatcherRegistry:
+    """
+    A process-wide cache of the PhraseMatcher used by ResumeParser.
+
+    Matchers are built lazily on first use and cached by vocabulary version. Adding phrases
+    extends the cached matchers in place, while invalidate() bumps the version so the next
+    lookup rebuilds the matcher from the base phrases and the Skill table (e.g. after a Skill
+    is renamed or deleted). Added phrases only last until the next invalidation.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.base_phrases: List[str] = list(phrases)
+        self.added_phrases: List[str] = []
+        self.version = 0
+        # Keyed by (vocabulary version, whether Skill names were loaded from the database)
+        self._matchers: Dict[Tuple[int, bool], PhraseMatcher] = {}
+        self._phrases: Dict[Tuple[int, bool], Set[str]] = {}
+        self._nlp = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _load_skill_names() -> List[str]:
+        """
+        Load the skill names from the database when an application context is available.
+
+        Returns:
+            List[str]: The skill names, or an empty list if they could not be loaded.
+        """
+        try:
+            return [name for (name,) in db.session.query(Skill.name)]
+        except SQLAlchemyError as e:
+            logger.error(f"An error occurred while loading skills for the phrase matcher: {e}")
+            return []
+
+    def get_matcher(self, nlp) -> PhraseMatcher:
+        """
+        Return the matcher for the current vocabulary version, building it if needed.
+
+        Args:
+            nlp: The SpaCy language model.
+
+        Returns:
+            PhraseMatcher: The cached PhraseMatcher.
+        """
+        key = (self.version, has_app_context())
+        matcher = self._matchers.get(key)
+        if matcher is not None:
+            return matcher
+
+        with self._lock:
+            key = (self.version, key[1])
+            matcher = self._matchers.get(key)
+            if matcher is None:
+                skill_names = self._load_skill_names() if key[1] else []
+                phrases = list(dict.fromkeys(self.base_phrases + self.added_phrases + skill_names))
+                matcher = ResumeParser.setup_phrase_matcher(nlp, phrases)
+                self._nlp = nlp
+                self._phrases[key] = set(phrases)
+                self._matchers[key] = matcher
+                logger.info(f"Built phrase matcher for vocabulary version {key[0]} with {len(phrases)} phrases")
+            return matcher
+
+    def add_phrases(self, phrases: Iterable[str]):
+        """
+        Add phrases to the vocabulary without rebuilding the cached matchers.
+
+        Args:
+            phrases (Iterable[str]): The phrases to add.
+        """
+        with self._lock:
+            phrases = [phrase for phrase in phrases if phrase]
+            self.added_phrases.extend(phrase for phrase in phrases if phrase not in self.added_phrases)
+            for key, matcher in self._matchers.items():
+                new_phrases = [phrase for phrase in phrases if phrase not in self._phrases[key]]
+                if new_phrases:
+                    matcher.add("PHRASES", [self._nlp.make_doc(text) for text in new_phrases])
+                    self._phrases[key].update(new_phrases)
+
+    def invalidate(self):
+        """
+        Drop the cached matchers and move to a new vocabulary version.
+        """
+        with self._lock:
+            self.version += 1
+            self.added_phrases = []
+            self._matchers.clear()
+            self._phrases.clear()
+            logger.info(f"Phrase matcher invalidated, vocabulary version is now {self.version}")
+
+
+phrase_matcher_registry = PhraseMatcherRegistry(DEFAULT_PHRASES)
+
+
+@event.listens_for(Skill, 'after_insert')
+def _skill_inserted(mapper, connection, target):
+    phrase_matcher_registry.add_phrases([target.name])
+
+
+@event.listens_for(Skill, 'after_update')
+@event.listens_for(Skill, 'after_delete')
+def _skill_changed(mapper, connection, target):
+    phrase_matcher_registry.invalidate()
+
+
+# The sections returned by identify_sections, in order
+SECTION_NAMES = ("personal_info", "experience", "education", "skills", "achievements", "certifications",
+                 "projects", "references", "summary")
+
+# Heading keyword -> section it starts
+SECTION_HEADINGS = {
+    "experience": "experience",
+    "education": "education",
+    "skills": "skills",
+    "achievements": "achievements",
+    "accomplishments": "achievements",
+    "certifications": "certifications",
+    "projects": "projects",
+    "references": "references",
+    "summary": "summary",
+    "profile": "summary",
+    "name": "personal_info",
+    "email": "personal_info",
+    "phone": "personal_info"
+}
+
+# A heading starts a line in any case and is followed by a colon, or stands alone on its line.
+# [^\S\n] is whitespace other than a newline, so "\r" and PDF form feeds around a heading are skipped.
+# The lookahead on the first letters rejects most lines before the keywords are tried one by one.
+_HEADING_INITIALS = ''.join(sorted({key[0] for key in SECTION_HEADINGS}))
+_HEADING = (r'[^\S\n]*(?=[' + _HEADING_INITIALS + _HEADING_INITIALS.upper() + r'])('
+            + '|'.join(sorted(map(re.escape, SECTION_HEADINGS), key=len, reverse=True)) + r')[^\S\n]*(?::|$)')
+# Matched at the start of the text only
+SECTION_HEADING_PATTERN = re.compile(_HEADING, re.IGNORECASE | re.MULTILINE)
+# Searching for the newline literal is much faster than trying '^' at every character
+LINE_HEADING_PATTERN = re.compile(r'\n' + _HEADING, re.IGNORECASE | re.MULTILINE)
+
+
+class SectionSpan(NamedTuple):
+    """
+    The location of a section in a resume text.
+
+    Attributes:
+        section (str): The section the heading starts.
+        heading_start (int): Offset of the heading.
+        start (int): Offset of the section content, just after the heading.
+        end (int): Offset one past the end of the section content.
+    """
+    section: str
+    heading_start: int
+    start: int
+    end: int
 
 
 class ResumeParser:
@@ -19,19 +187,20 @@ class ResumeParser:
     """
 
     @staticmethod
-    def extract_text_from_file(resume_file_path: str) -> str:
+    def extract_text_from_file(resume_file_path: str, content_hash: Optional[str] = None) -> str:
         """
-        Extract text from a given file.
+        Extract text from a given file. PDF text is cached by file content, so a file is only parsed once.
 
         Args:
             resume_file_path (str): The path to the resume file.
+            content_hash (str, optional): The SHA-256 of the file, if already known.
 
         Returns:
             str: The extracted text from the file.
         """
         try:
             if resume_file_path.endswith('.pdf'):
-                return extract_text(resume_file_path)
+                return pdf_text_cache.get_text(resume_file_path, content_hash)
             elif resume_file_path.endswith('.docx'):
                 return docx2txt.process(resume_file_path)
             else:
@@ -41,69 +210,41 @@ class ResumeParser:
             return ""
 
     @staticmethod
-    def identify_sections(resume_text_content: str) -> Dict[str, str]:
+    def section_spans(resume_text_content: str) -> List[SectionSpan]:
         """
-        Identify sections in the resume text.
+        Locate the sections of the resume text in a single pass.
 
         Args:
             resume_text_content (str): The resume text.
 
         Returns:
-            dict: A dictionary with identified sections.
+            List[SectionSpan]: The sections in order of appearance, as offsets into the text.
         """
-        resume_sections: Dict[str, str] = {
-            "personal_info": "",
-            "experience": "",
-            "education": "",
-            "skills": "",
-            "achievements": "",
-            "certifications": "",
-            "projects": "",
-            "references": "",
-            "summary": "",
-        }
-
-        section_map = {
-            "experience": "experience",
-            "education": "education",
-            "skills": "skills",
-            "achievements": "achievements",
-            "accomplishments": "achievements",
-            "certifications": "certifications",
-            "projects": "projects",
-            "references": "references",
-            "summary": "summary",
-            "profile": "summary",
-            "name": "personal_info",
-            "email": "personal_info",
-            "phone": "personal_info"
-        }
-
-        lines = resume_text_content.split('\n')
-        current_section = None
+        first = SECTION_HEADING_PATTERN.match(resume_text_content)
+        headings = ([first] if first else []) + list(LINE_HEADING_PATTERN.finditer(resume_text_content))
+        ends = [heading.start() for heading in headings[1:]] + [len(resume_text_content)]
+        return [SectionSpan(SECTION_HEADINGS[heading.group(1).lower()], heading.start(1), heading.end(), end)
+                for heading, end in zip(headings, ends)]
 
-        for line in lines:
-            line_lower = line.strip().lower()
-            section_found = False
-            for key, section in section_map.items():
-                if line_lower.startswith(f"{key}:"):
-                    logger.debug(f"Section key found: {key} in line: {line_lower}")
-                    current_section = section
-                    section_found = True
-                    resume_sections[current_section] += (line.replace(f"{key.capitalize()}:", "")
-                                                         .replace(f"{key}:", "").strip() + " ")
-                    break
+    @staticmethod
+    def identify_sections(resume_text_content: str) -> Dict[str, str]:
+        """
+        Identify sections in the resume text.
 
-            if not section_found and current_section:
-                logger.debug(f"Appending to current_section {current_section}: {line.strip()}")
-                resume_sections[current_section] += line.strip() + " "
+        Headings are matched in any case, with or without a trailing colon. Text before the
+        first heading is not assigned to a section.
 
-        for key in resume_sections:
-            resume_sections[key] = ' '.join(resume_sections[key].split())
-            logger.debug(f"Section {key}: {resume_sections[key]}")
+        Args:
+            resume_text_content (str): The resume text.
 
-        logger.debug(f"Final sections: {resume_sections}")
-        return resume_sections
+        Returns:
+            dict: A dictionary with identified sections.
+        """
+        contents: Dict[str, List[str]] = {section: [] for section in SECTION_NAMES}
+        for span in ResumeParser.section_spans(resume_text_content):
+            contents[span.section].append(resume_text_content[span.start:span.end])
+        # Joined once per section, with runs of whitespace collapsed to single spaces
+        return {section: ' '.join(' '.join(parts).split()) for section, parts in contents.items()}
 
     @staticmethod
     def setup_phrase_matcher(nlp, phrases: List[str]):
@@ -134,23 +275,58 @@ class ResumeParser:
             dict: A dictionary with extracted information.
         """
         try:
+            nlp_spacy = get_nlp()
             doc_spacy = nlp_spacy(resume_text_content)
+            matcher = phrase_matcher_registry.get_matcher(nlp_spacy)
+            return ResumeParser._match_phrases(doc_spacy, matcher)
+        except Exception as e:
+            logger.error(f"An error occurred while parsing the resume: {e}")
+            return {}
+
+    @staticmethod
+    def parse_many(resume_texts: Iterable[str], batch_size: int = 64, n_process: int = 1,
+                   components: Iterable[str] = ()) -> Iterator[Dict[str, List[str]]]:
+        """
+        Parse many resume texts, streaming them through SpaCy in batches.
 
-            # Define specific phrases to match
-            phrases = ["John Doe", "Software Engineer", "Senior Developer", "Python", "Java", "SQL"]
-            matcher = ResumeParser.setup_phrase_matcher(nlp_spacy, phrases)
-            matches = matcher(doc_spacy)
+        Only the pipeline components listed in components are run. Phrase matching needs
+        nothing but the tokenizer, so by default the tagger, parser, lemmatizer, NER and the
+        rest of the pipeline are disabled.
 
-            matched_phrases = [doc_spacy[start:end].text for match_id, start, end in matches]
+        Args:
+            resume_texts (Iterable[str]): The resume texts to parse. May be a lazy iterator.
+            batch_size (int): The number of texts SpaCy buffers per batch.
+            n_process (int): The number of processes SpaCy uses for the pipeline.
+            components (Iterable[str]): The pipeline components to keep enabled.
 
-            logger.debug(f"Matched phrases: {matched_phrases}")
+        Yields:
+            dict: A dictionary with extracted information for each text, in input order.
+        """
+        nlp_spacy = get_nlp()
+        components = set(components)
+        disabled = [name for name in nlp_spacy.pipe_names if name not in components]
+        matcher = phrase_matcher_registry.get_matcher(nlp_spacy)
 
-            return {
-                "matched_phrases": matched_phrases
-            }
+        try:
+            docs = nlp_spacy.pipe(resume_texts, batch_size=batch_size, n_process=n_process, disable=disabled)
+            for doc_spacy in docs:
+                try:
+                    yield ResumeParser._match_phrases(doc_spacy, matcher)
+                except Exception as e:
+                    logger.error(f"An error occurred while parsing the resume: {e}")
+                    yield {}
         except Exception as e:
-            logger.error(f"An error occurred while parsing the resume: {e}")
-            return {}
+            logger.error(f"An error occurred while parsing resumes in batch: {e}")
+            raise
+
+    @staticmethod
+    def _match_phrases(doc_spacy, matcher: PhraseMatcher) -> Dict[str, List[str]]:
+        matches = matcher(doc_spacy)
+        matched_phrases = [doc_spacy[start:end].text for match_id, start, end in matches]
+        logger.debug(f"Matched phrases: {matched_phrases}")
+        return {
+            "matched_phrases": matched_phrases
+        }
 
 
 # Example usage
@@ -8,7 +8,9 @@ Revised: [Add revised date]
 
 Description:
 This module defines the admin-related routes for the ResuMate application.
-It includes routes for managing users, resumes, and viewing analytics.
+It includes routes for managing users, resumes, bulk resume ingestion, candidate ranking,
+skill search, similar resumes, viewing and following logs, viewing analytics and serving
+the latency metrics of the analysis pipeline to Prometheus.
 
 Usage:
     Import this module and initialize the routes with the given Flask app instance.
@@ -20,12 +22,22 @@ Example:
     app.register_blueprint(admin_bp, url_prefix='/admin')
 """
 
+import hmac
+import json
 import logging
-from flask import Blueprint, render_template, flash, redirect, url_for, request
+import os
+from flask import Blueprint, Response, render_template, flash, redirect, url_for, request, jsonify, current_app
 from flask_login import login_required, current_user  # Added current_user import
-from app.models import User
+from werkzeug.utils import secure_filename
+from app.models import IngestJob, JobDescription, Resume, User
 from app.db_manager import DBManager
 from app.log import AppLogger
+from app.services.log_reader import LogFileNotFoundError, follow, list_log_files, resolve_log_file, tail
+from app.services.skill_index import SkillQueryError
+from app.services.tracing import DEFAULT_BUCKETS, tracer
+from app.services.user_listing import list_users_from_args
+from app.tasks import enqueue_ingest
+from app.utils.file_utils import FileTooLargeError, request_size_limit, stream_to_temp_file
 
 # Initialize logger
 app_logger = AppLogger.get_logger()
@@ -48,21 +60,41 @@ def admin_dashboard():
         The rendered admin_dashboard.html template.
     """
     user_count = User.query.count()
-    return render_template('admin/admin_dashboard.html', user_count=user_count)
+    return render_template('admin/admin_dashboard.html', user_count=user_count, stage_latencies=tracer.summary())
 
 
 @admin_bp.route('/users')
 @login_required
 def admin_users():
     """
-    Displays a list of all users for admin.
+    Displays a page of users for admin, using keyset pagination.
+
+    Query Parameters:
+        after: The cursor of the previous page (optional).
+        limit: The number of users per page (optional, capped by USERS_MAX_PAGE_SIZE).
+        sort: 'id', 'username' or 'email' (optional, defaults to 'id').
+        order: 'asc' or 'desc' (optional, defaults to 'asc').
+        q: Only list users whose username or email starts with this text (optional).
+        format: 'json' to return the page as JSON, e.g. for infinite scrolling (optional).
 
     Returns:
-        The rendered users.html template with a list of users.
+        The rendered users.html template with a page of users, or the page as JSON.
     """
+    as_json = request.args.get('format') == 'json'
+    try:
+        page = list_users_from_args(request.args, current_app.config.get('USERS_PAGE_SIZE', 50),
+                                    current_app.config.get('USERS_MAX_PAGE_SIZE', 200))
+    except ValueError as e:
+        if as_json:
+            return jsonify({"error": str(e)}), 400
+        flash(str(e), 'warning')
+        return redirect(url_for('admin.admin_users'))
+
     try:
-        all_users = User.query.all()
-        return render_template('admin/users.html', title='Users', users=all_users)
+        if as_json:
+            return jsonify(page.to_dict()), 200
+        return render_template('admin/users.html', title='Users', users=page.users, page=page,
+                               search=request.args.get('q', ''), limit=request.args.get('limit', type=int))
     except Exception as e:
         logger.error(f"Error retrieving users: {e}")
         flash('An error occurred while retrieving users. Please try again.', 'danger')
@@ -101,23 +133,312 @@ def admin_user_detail(user_id):
         return redirect(url_for('admin.admin_users'))
 
 
+@admin_bp.route('/ingest', methods=['POST'])
+@login_required
+@request_size_limit('INGEST_MAX_ARCHIVE_SIZE')
+def admin_ingest():
+    """
+    Queues the ingestion of a zip or tar archive of resumes. Only admins and the owner can ingest resumes.
+
+    The archive is streamed to INGEST_FOLDER and ingested by a Celery task, so a large drop does
+    not hold the request: the task stores the resumes, extracts their text in worker processes
+    and inserts the rows in batches. Poll the status URL for the progress and the report.
+
+    Request Form:
+        archive: The zip or tar archive (optionally gzip or bzip2 compressed).
+
+    Returns:
+        JSON response with the ingest job ID, its status and status URL, with status 202.
+    """
+    if not (current_user.is_admin or current_user.is_owner):
+        return jsonify({"error": "You do not have permission to ingest resumes"}), 403
+
+    archive = request.files.get('archive')
+    if not archive or archive.filename == '':
+        return jsonify({"error": "An archive file is required"}), 400
+
+    try:
+        archive_path, _, _ = stream_to_temp_file(archive.stream, current_app.config['INGEST_FOLDER'],
+                                                 max_size=current_app.config.get('INGEST_MAX_ARCHIVE_SIZE'))
+        job = enqueue_ingest(archive_path, secure_filename(archive.filename), current_user.id)
+        return jsonify(_ingest_job_payload(job)), 202
+    except FileTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
+    except Exception as e:
+        logger.error(f"Error queuing ingestion of archive {archive.filename}: {e}")
+        return jsonify({"error": "Failed to queue the ingestion"}), 500
+
+
+def _ingest_job_payload(job):
+    payload = {"job_id": job.id, "filename": job.filename, "status": job.status, "files": job.files,
+               "status_url": url_for('admin.admin_ingest_status', job_id=job.id)}
+    if job.report:
+        payload["report"] = json.loads(job.report)
+    if job.error:
+        payload["error"] = job.error
+    return payload
+
+
+@admin_bp.route('/ingest/<job_id>')
+@login_required
+def admin_ingest_status(job_id):
+    """
+    Returns the state of a queued ingestion. Only admins and the owner can view ingestions.
+
+    Returns:
+        JSON response with the status, the number of files read so far and, once done, the report.
+    """
+    if not (current_user.is_admin or current_user.is_owner):
+        return jsonify({"error": "You do not have permission to view ingestions"}), 403
+
+    try:
+        job = db.session.get(IngestJob, job_id)
+        if job is None:
+            return jsonify({"error": "Ingest job not found"}), 404
+        return jsonify(_ingest_job_payload(job)), 200
+    except Exception as e:
+        logger.error(f"Error retrieving ingest job {job_id}: {e}")
+        return jsonify({"error": "Failed to retrieve the ingest job"}), 500
+
+
+@admin_bp.route('/job_descriptions/<int:job_description_id>/candidates')
+@login_required
+def admin_rank_candidates(job_description_id):
+    """
+    Ranks the stored resumes against a job description. Only admins and the owner can rank candidates.
+
+    Parameters:
+        job_description_id (int): The ID of the job description.
+
+    Query Parameters:
+        k: The number of candidates to return (optional, capped by CANDIDATE_RANK_MAX_K).
+
+    Returns:
+        JSON response with the best candidates, highest score first.
+    """
+    if not (current_user.is_admin or current_user.is_owner):
+        return jsonify({"error": "You do not have permission to rank candidates"}), 403
+
+    job_description = db.session.get(JobDescription, job_description_id)
+    if job_description is None:
+        return jsonify({"error": "Job description not found"}), 404
+
+    top_k = request.args.get('k', current_app.config.get('CANDIDATE_RANK_TOP_K', 10), type=int)
+    top_k = max(1, min(top_k, current_app.config.get('CANDIDATE_RANK_MAX_K', 100)))
+    try:
+        ranked = current_app.candidate_index.rank(job_description.description, top_k=top_k)
+        resumes = {resume.id: resume for resume in
+                   Resume.query.filter(Resume.id.in_([candidate.resume_id for candidate in ranked])).all()}
+        candidates = [{
+            "resume_id": candidate.resume_id,
+            "user_id": resumes[candidate.resume_id].user_id,
+            "score": candidate.score,
+            "matched_keywords": candidate.matched_keywords,
+        } for candidate in ranked if candidate.resume_id in resumes]
+        return jsonify({"job_description_id": job_description.id, "title": job_description.title,
+                        "candidates": candidates}), 200
+    except Exception as e:
+        logger.error(f"Error ranking candidates for job description {job_description_id}: {e}")
+        return jsonify({"error": "Failed to rank candidates"}), 500
+
+
+@admin_bp.route('/resumes/search')
+@login_required
+def admin_search_resumes():
+    """
+    Finds the resumes matching a boolean skill query. Only admins and the owner can search resumes.
+
+    Query Parameters:
+        q: The skill query, e.g. "Python AND AWS AND NOT Java".
+        limit: The number of resume IDs to return (optional, capped by SKILL_SEARCH_MAX_RESULTS).
+
+    Returns:
+        JSON response with the number of matching resumes and the first matching resume IDs.
+    """
+    if not (current_user.is_admin or current_user.is_owner):
+        return jsonify({"error": "You do not have permission to search resumes"}), 403
+
+    expression = request.args.get('q', '')
+    max_results = current_app.config.get('SKILL_SEARCH_MAX_RESULTS', 1000)
+    limit = max(1, min(request.args.get('limit', max_results, type=int), max_results))
+    try:
+        resume_ids = current_app.skill_index.query(expression)
+    except SkillQueryError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error searching resumes for '{expression}': {e}")
+        return jsonify({"error": "Failed to search resumes"}), 500
+    return jsonify({"query": expression, "total": int(len(resume_ids)),
+                    "resume_ids": resume_ids[:limit].tolist()}), 200
+
+
+@admin_bp.route('/resumes/<int:resume_id>/similar')
+@login_required
+def admin_similar_resumes(resume_id):
+    """
+    Finds the resumes most similar to a resume. Only admins and the owner can search resumes.
+
+    Parameters:
+        resume_id (int): The ID of the resume.
+
+    Query Parameters:
+        k: The number of resumes to return (optional, capped by CANDIDATE_RANK_MAX_K).
+
+    Returns:
+        JSON response with the most similar resumes and their cosine similarity.
+    """
+    if not (current_user.is_admin or current_user.is_owner):
+        return jsonify({"error": "You do not have permission to search resumes"}), 403
+
+    similarity_index = current_app.similarity_index
+    if similarity_index is None:
+        return jsonify({"error": "Similarity search is not enabled"}), 503
+
+    resume = db.session.get(Resume, resume_id)
+    if resume is None:
+        return jsonify({"error": "Resume not found"}), 404
+
+    top_k = request.args.get('k', current_app.config.get('CANDIDATE_RANK_TOP_K', 10), type=int)
+    top_k = max(1, min(top_k, current_app.config.get('CANDIDATE_RANK_MAX_K', 100)))
+    try:
+        similar = similarity_index.similar_to(resume.id, top_k=top_k, text=resume.content)
+        # Resumes deleted since the last refresh of the index are still in it
+        existing = {resume_id for (resume_id,) in Resume.query.with_entities(Resume.id)
+                    .filter(Resume.id.in_([match.resume_id for match in similar]))}
+        similar = [match for match in similar if match.resume_id in existing]
+        return jsonify({"resume_id": resume.id,
+                        "similar": [{"resume_id": match.resume_id, "score": match.score} for match in similar]}), 200
+    except Exception as e:
+        logger.error(f"Error finding resumes similar to resume {resume_id}: {e}")
+        return jsonify({"error": "Failed to find similar resumes"}), 500
+
+
 @admin_bp.route('/logs')
 @login_required
 def admin_logs():
     """
-    Displays system logs for admin.
+    Displays the last entries of a log file for admin. Only admins and the owner can view logs.
+
+    Query Parameters:
+        file: The log file (optional, defaults to app.log or the first log file).
+        before: The byte offset older entries end at, from the previous page (optional).
+        limit: The number of entries per page (optional, capped by LOG_VIEWER_MAX_PAGE_SIZE).
+        level: Only show entries at this level or above, e.g. 'WARNING' (optional).
+        q: Only show entries containing this text, ignoring case (optional).
+        format: 'json' to return the page as JSON (optional).
 
     Returns:
-        The rendered logs.html template with system logs.
+        The rendered logs.html template with a page of log entries, or the page as JSON.
     """
+    as_json = request.args.get('format') == 'json'
+    if not (current_user.is_admin or current_user.is_owner):
+        if as_json:
+            return jsonify({"error": "You do not have permission to view logs"}), 403
+        flash('You do not have permission to view logs.', 'danger')
+        return redirect(url_for('public.index'))
+
+    directory = current_app.config['LOG_VIEWER_FOLDER']
+    files = list_log_files(directory)
+    name = request.args.get('file') or ('app.log' if 'app.log' in files else next(iter(files), None))
+    max_limit = current_app.config.get('LOG_VIEWER_MAX_PAGE_SIZE', 1000)
+    limit = request.args.get('limit', current_app.config.get('LOG_VIEWER_PAGE_SIZE', 200), type=int)
+    level = request.args.get('level') or None
+    contains = request.args.get('q') or None
+    try:
+        if name is None:
+            raise LogFileNotFoundError("There are no log files")
+        page = tail(resolve_log_file(directory, name), limit=max(1, min(limit, max_limit)),
+                    before=request.args.get('before', type=int), level=level, contains=contains)
+    except LogFileNotFoundError as e:
+        if as_json:
+            return jsonify({"error": str(e)}), 404
+        flash(str(e), 'warning')
+        return redirect(url_for('admin.admin_dashboard'))
+    except ValueError as e:
+        if as_json:
+            return jsonify({"error": str(e)}), 400
+        flash(str(e), 'warning')
+        return redirect(url_for('admin.admin_logs', file=name))
+
     try:
-        log_files = ['ai_service.log', 'app.log', 'config.log', 'forms.log', 'resumate.log', 'upload_utils.log',
-                     'wsgi.log']
-        logs = {}
-        for log_file in log_files:
-            with open(f'logs/{log_file}', 'r') as file:
-                logs[log_file] = file.readlines()
-        return render_template('admin/logs.html', title='System Logs', logs=logs)
+        if as_json:
+            return jsonify({"file": name, **page.to_dict()}), 200
+        return render_template('admin/logs.html', title='System Logs', files=files, file=name, page=page,
+                               level=level or '', search=contains or '', limit=limit)
     except Exception as e:
         logger.error(f"Error retrieving logs: {e}")
         flash('An error occurred while retrieving logs. Please try again.', 'danger')
+        return redirect(url_for('admin.admin_dashboard'))
+
+
+@admin_bp.route('/logs/follow')
+@login_required
+def admin_follow_log():
+    """
+    Streams the entries appended to a log file as server-sent events. Only admins and the owner can view logs.
+
+    Every event carries one entry as JSON, with its end offset as the event ID, so a reconnecting
+    EventSource resumes after the last entry it received. The stream ends after LOG_FOLLOW_MAX_DURATION
+    seconds and the browser reconnects.
+
+    Query Parameters:
+        file: The log file.
+        from: The byte offset to start at, e.g. the end of the page shown (optional, defaults to the end of the file).
+        level: Only stream entries at this level or above (optional).
+        q: Only stream entries containing this text, ignoring case (optional).
+
+    Returns:
+        A text/event-stream response.
+    """
+    if not (current_user.is_admin or current_user.is_owner):
+        return jsonify({"error": "You do not have permission to view logs"}), 403
+
+    try:
+        path = resolve_log_file(current_app.config['LOG_VIEWER_FOLDER'], request.args.get('file', ''))
+        position = request.headers.get('Last-Event-ID', type=int)
+        if position is None:
+            position = request.args.get('from', type=int)
+        if position is None:
+            position = os.path.getsize(path)
+        entries = follow(path, position, level=request.args.get('level') or None,
+                         contains=request.args.get('q') or None,
+                         poll_interval=current_app.config.get('LOG_FOLLOW_POLL_INTERVAL', 1.0),
+                         max_duration=current_app.config.get('LOG_FOLLOW_MAX_DURATION', 300))
+    except LogFileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def events():
+        for entry in entries:
+            if entry is None:
+                yield ': keepalive\n\n'
+            else:
+                yield f"id: {entry.end}\ndata: {json.dumps(entry.to_dict())}\n\n"
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@admin_bp.route('/metrics')
+def metrics():
+    """
+    Serves the latency histograms of the analysis pipeline stages in the Prometheus text format.
+    Admins and the owner can view them when logged in; a scraper sends 'Authorization: Bearer <METRICS_TOKEN>'.
+
+    Returns:
+        A text/plain response with the metrics.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    has_token = bool(token) and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    is_admin = current_user.is_authenticated and (current_user.is_admin or current_user.is_owner)
+    if not (has_token or is_admin):
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+
+    try:
+        body = tracer.render_prometheus(
+            buckets=current_app.config.get('METRICS_LATENCY_BUCKETS', DEFAULT_BUCKETS))
+        return Response(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+    except Exception as e:
+        logger.error(f"Error rendering metrics: {e}")
+        return Response('Failed to render metrics\n', status=500, mimetype='text/plain')
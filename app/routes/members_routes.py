@@ -8,8 +8,8 @@ Revised: [Add revised date]
 
 Description:
 This module defines the member-related routes for the ResuMate application.
-It includes routes for uploading and analyzing resumes, as well as viewing
-user profiles and dashboard.
+It includes routes for uploading and analyzing resumes, polling queued analysis
+jobs, as well as viewing user profiles and dashboard.
 
 Usage:
     Import this module and initialize the routes with the given Flask app instance.
@@ -21,15 +21,23 @@ Example:
     app.register_blueprint(members_bp, url_prefix='/members')
 """
 
+import hashlib
+import json
 import logging
 import os
+import time
 from io import BytesIO
 from docx import Document
 from flask import Blueprint, request, send_file, jsonify, current_app
 from flask import render_template, flash, redirect, url_for
-from flask_login import login_required
+from flask_login import current_user, login_required
+from sqlalchemy.exc import SQLAlchemyError
 from app.auth_manager import login_manager
-from app.models import User
+from app.db_manager import db
+from app.models import AnalysisJob, User
+from app.services.content_analysis import TAXONOMY_VERSION
+from app.services.tracing import tracer
+from app.services.user_listing import list_users_from_args
 from app.utils.file_handler import FileHandler
 
 members_bp = Blueprint('members', __name__, template_folder='app/templates/members')
@@ -66,14 +74,34 @@ def member_profile():
 @login_required
 def users():
     """
-    Displays a list of all users.
+    Displays a page of users, using keyset pagination.
+
+    Query Parameters:
+        after: The cursor of the previous page (optional).
+        limit: The number of users per page (optional, capped by USERS_MAX_PAGE_SIZE).
+        sort: 'id', 'username' or 'email' (optional, defaults to 'id').
+        order: 'asc' or 'desc' (optional, defaults to 'asc').
+        q: Only list users whose username or email starts with this text (optional).
+        format: 'json' to return the page as JSON, e.g. for infinite scrolling (optional).
 
     Returns:
-        The rendered users.html template with a list of users.
+        The rendered users.html template with a page of users, or the page as JSON.
     """
+    as_json = request.args.get('format') == 'json'
+    try:
+        page = list_users_from_args(request.args, current_app.config.get('USERS_PAGE_SIZE', 50),
+                                    current_app.config.get('USERS_MAX_PAGE_SIZE', 200))
+    except ValueError as e:
+        if as_json:
+            return jsonify({"error": str(e)}), 400
+        flash(str(e), 'warning')
+        return redirect(url_for('members.users'))
+
     try:
-        all_users = User.query.all()
-        return render_template('members/users.html', title='Users', users=all_users)
+        if as_json:
+            return jsonify(page.to_dict()), 200
+        return render_template('members/users.html', title='Users', users=page.users, page=page,
+                               search=request.args.get('q', ''), limit=request.args.get('limit', type=int))
     except Exception as e:
         logger.error(f"Error retrieving users: {e}")
         flash('An error occurred while retrieving users. Please try again.', 'danger')
@@ -105,14 +133,15 @@ def user_profile(user_id):
 @login_required
 def upload_resume():
     """
-    Handles file uploads for resumes.
+    Handles file uploads for resumes and queues their analysis.
 
     Request Form:
         file: The file to be uploaded.
         user_id: The ID of the user uploading the file.
+        job_description: The job description to score the resume against (optional).
 
     Returns:
-        JSON response with the upload status and file ID.
+        JSON response with the upload status, file ID and analysis job ID.
     """
     user_id = request.form.get('user_id')
     try:
@@ -130,6 +159,8 @@ def analyze_resume():
     """
     Analyze a resume against a job description.
 
+    The time spent in each stage of the analysis is returned in the Server-Timing header.
+
     Request Form:
         resume_file: The resume file to be analyzed.
         job_description: The job description text.
@@ -144,22 +175,167 @@ def analyze_resume():
         if not resume_file or not job_description:
             return jsonify({"error": "Resume file and job description are required"}), 400
 
+        with tracer.trace('analyze_resume') as trace:
+            response, status_code = _analyze_uploaded_resume(resume_file, job_description)
+        response.headers['Server-Timing'] = trace.server_timing()
+        return response, status_code
+    except Exception as e:
+        logger.error(f"Error analyzing resume: {e}")
+        return jsonify({"error": "Failed to analyze resume"}), 500
+
+
+def _analyze_uploaded_resume(resume_file, job_description):
+    ai_service = current_app.ai_service
+    analysis_cache = current_app.analysis_cache
+    resume_bytes = resume_file.read()
+
+    # Identical resume, job description, model and taxonomy: reuse the earlier result
+    cache_key = analysis_cache.make_key(resume_bytes, job_description, ai_service.model_version,
+                                        TAXONOMY_VERSION)
+    with tracer.span('cache_lookup'):
+        analysis_result = analysis_cache.get(cache_key)
+    if analysis_result is not None:
+        return jsonify({"analysis_result": analysis_result}), 200
+
+    with tracer.span('extraction'):
         resume_text = ""
         if resume_file.filename.endswith('.docx'):
-            document = Document(BytesIO(resume_file.read()))
+            document = Document(BytesIO(resume_bytes))
             for paragraph in document.paragraphs:
                 resume_text += paragraph.text + "\n"
         else:
-            resume_text = resume_file.read().decode('utf-8')
+            resume_text = resume_bytes.decode('utf-8')
 
-        if not resume_text.strip():
-            return jsonify({"error": "Resume text is required"}), 400
+    if not resume_text.strip():
+        return jsonify({"error": "Resume text is required"}), 400
 
-        analysis_result = current_app.ai_service.analyze_resume(resume_text, job_description)
-        return jsonify({"analysis_result": analysis_result}), 200
+    analysis_result = ai_service.analyze_resume(resume_text, job_description)
+    if "error" not in analysis_result:
+        with tracer.span('persistence'):
+            if analysis_cache.put(cache_key, analysis_result) is not None:
+                try:
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    logger.error(f"Error storing analysis result: {e}")
+    return jsonify({"analysis_result": analysis_result}), 200
+
+
+def _job_etag(job):
+    state = f"{job.id}:{job.status}:{job.progress}:{job.error}:{job.ai_result_id}"
+    return hashlib.sha1(state.encode('utf-8')).hexdigest()
+
+
+def _get_user_job(job_id):
+    """
+    Return a job of the current user, or any job for admins and the owner.
+    """
+    job = db.session.get(AnalysisJob, job_id)
+    if job is None or (job.user_id != current_user.id and not (current_user.is_admin or current_user.is_owner)):
+        return None
+    return job
+
+
+def _wait_for_change(job, etag, wait):
+    """
+    Re-read the job until its ETag differs from the given one or the wait time has passed.
+    """
+    deadline = time.monotonic() + wait
+    interval = current_app.config.get('JOB_POLL_INTERVAL', 0.5)
+    while _job_etag(job) == etag and job.status not in ('done', 'failed'):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # The worker commits in another session: end this transaction before waiting, so no snapshot
+        # is held open and, under snapshot or repeatable read isolation, the re-read sees the commit
+        db.session.rollback()
+        time.sleep(min(interval, remaining))
+        db.session.refresh(job)
+    return job
+
+
+def _job_response(job, payload, status_code=200):
+    """
+    Build a JSON response for the job, or 304 if the client already has this state.
+    """
+    etag = _job_etag(job)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(payload)
+        response.status_code = status_code
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@members_bp.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def job_status(job_id):
+    """
+    Return the state of a queued analysis.
+
+    Supports conditional requests: a client sending the last ETag in If-None-Match gets
+    304 Not Modified while the job is unchanged. With the wait query parameter the request
+    is held until the job changes from the state in If-None-Match, or from its current state
+    if no ETag is sent, or the wait time passes.
+
+    Query Parameters:
+        wait: Seconds to wait for a change, capped at JOB_POLL_MAX_WAIT (optional).
+
+    Returns:
+        JSON response with the job status, progress, error and, once done, the analysis result.
+    """
+    try:
+        job = _get_user_job(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+
+        wait = min(request.args.get('wait', 0, type=float), current_app.config.get('JOB_POLL_MAX_WAIT', 30))
+        if wait > 0:
+            client_etags = list(request.if_none_match)
+            job = _wait_for_change(job, client_etags[0] if client_etags else _job_etag(job), wait)
+
+        payload = {
+            "job_id": job.id,
+            "file_id": job.file_id,
+            "status": job.status,
+            "progress": job.progress,
+            "error": job.error,
+            "result_url": url_for('members.job_result', job_id=job.id),
+        }
+        if job.status == 'done' and job.ai_result is not None:
+            payload["analysis_result"] = json.loads(job.ai_result.result_data)
+        return _job_response(job, payload)
     except Exception as e:
-        logger.error(f"Error analyzing resume: {e}")
-        return jsonify({"error": "Failed to analyze resume"}), 500
+        logger.error(f"Error retrieving status of job {job_id}: {e}")
+        return jsonify({"error": "Failed to retrieve job status"}), 500
+
+
+@members_bp.route('/jobs/<job_id>/result', methods=['GET'])
+@login_required
+def job_result(job_id):
+    """
+    Return the result of a queued analysis.
+
+    Returns:
+        JSON response with the analysis result (200), the current state while the job is
+        queued or running (202), or the error if the job failed (422).
+    """
+    try:
+        job = _get_user_job(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+
+        if job.status == 'done' and job.ai_result is not None:
+            return _job_response(job, {"job_id": job.id,
+                                       "analysis_result": json.loads(job.ai_result.result_data)})
+        if job.status == 'failed':
+            return _job_response(job, {"job_id": job.id, "status": job.status, "error": job.error}, 422)
+        return _job_response(job, {"job_id": job.id, "status": job.status, "progress": job.progress}, 202)
+    except Exception as e:
+        logger.error(f"Error retrieving result of job {job_id}: {e}")
+        return jsonify({"error": "Failed to retrieve job result"}), 500
 
 
 @members_bp.route('/download_sample_resume')
@@ -8,6 +8,10 @@ Revised: [Add revised date]
 
 Description:
 This module implements the AI service for analyzing resumes.
+Classification requests from concurrent callers are micro-batched into single forward passes.
+Long resumes are tokenized once and split into overlapping windows that are all scored in
+the same batch, then the window scores are aggregated into one result per resume.
+The content analysis matches keywords exactly, or also by word-vector similarity in 'semantic' mode.
 
 Classes:
     AIService: A class to handle AI-based analysis of resumes.
@@ -23,10 +27,17 @@ Example:
     print(analysis_result)
 """
 
-from transformers import pipeline
+from typing import List, Tuple
+
+import numpy as np
 
 from app.log import AppLogger  # Import from app
-from app.services.content_analysis import ContentAnalyzer
+from app.services.batcher import DynamicBatcher
+from app.services.chunking import AGGREGATION_STRATEGIES, aggregate_window_scores, split_into_windows
+from app.services.content_analysis import ANALYSIS_MODES, ContentAnalyzer
+from app.services.model_registry import model_registry, register_text_classifier
+from app.services.semantic_matching import SEMANTIC_MATCH_THRESHOLD
+from app.services.tracing import tracer
 
 # Set up logging using AppLogger
 logger = AppLogger.get_logger()
@@ -35,17 +46,132 @@ logger = AppLogger.get_logger()
 class AIService:
     """
     A class to handle AI-based analysis of resumes.
+
+    The classification model is loaded from the model registry on first use, so creating
+    the service is cheap and does not require the model to be available.
     """
 
-    def __init__(self, model_path: str):
-        try:
-            self.model = pipeline('text-classification', model=model_path)
-            self.content_analyzer = ContentAnalyzer()
-            logger.info("AIService initialized successfully with model: %s", model_path)
-        except Exception as e:
-            logger.error(f"Error initializing AIService with model {model_path}: {e}")
-            self.model = None  # Set model to None to indicate failure
-            raise
+    def __init__(self, model_path: str, max_batch_size: int = 16, max_wait_ms: float = 10,
+                 window_overlap: int = 128, aggregation: str = 'mean', analysis_mode: str = 'exact',
+                 semantic_threshold: float = SEMANTIC_MATCH_THRESHOLD):
+        """
+        Args:
+            model_path (str): The name or path of the text-classification model.
+            max_batch_size (int): The maximum number of resumes classified in one forward pass.
+            max_wait_ms (float): The longest a request waits for others to join its batch.
+            window_overlap (int): The number of tokens shared by consecutive windows of a long resume.
+            aggregation (str): How window scores are combined: 'mean', 'max' or 'length_weighted'.
+            analysis_mode (str): How the content analysis matches keywords: 'exact' or 'semantic'.
+            semantic_threshold (float): The lowest word-vector similarity counted as a match in semantic mode.
+        """
+        if aggregation not in AGGREGATION_STRATEGIES:
+            raise ValueError(f"Unknown aggregation strategy '{aggregation}'")
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{analysis_mode}'")
+
+        self.model_path = model_path
+        self.window_overlap = window_overlap
+        self.aggregation = aggregation
+        self.analysis_mode = analysis_mode
+        self.semantic_threshold = semantic_threshold
+        self.model_name = register_text_classifier(model_path)
+        self.content_analyzer = ContentAnalyzer()
+        self.batcher = DynamicBatcher(self._classify_batch, max_batch_size=max_batch_size,
+                                      max_wait_ms=max_wait_ms, name='ai-service-batcher')
+        logger.info("AIService initialized with model: %s", model_path)
+
+    @property
+    def model_version(self) -> str:
+        """
+        Identifies the model and the settings that affect its scores, for caching results.
+        """
+        version = f"{self.model_path}:{self.aggregation}:{self.window_overlap}"
+        if self.analysis_mode == 'semantic':
+            version += f":semantic:{self.semantic_threshold}"
+        return version
+
+    @property
+    def model(self):
+        """
+        The text-classification pipeline, loaded on first access.
+        """
+        return model_registry.get(self.model_name)
+
+    def _tokenize_windows(self, resume_texts: List[str]) -> Tuple[List[List[int]], List[int]]:
+        """
+        Tokenize each resume once and split it into windows that fit the model.
+
+        Args:
+            resume_texts (List[str]): The resume texts.
+
+        Returns:
+            tuple: The windows of all resumes, and the index of the resume each window belongs to.
+        """
+        tokenizer = self.model.tokenizer
+        # Some tokenizers report a huge sentinel max length, so also respect the model's limit
+        max_length = min(tokenizer.model_max_length,
+                         getattr(self.model.model.config, 'max_position_embeddings', tokenizer.model_max_length))
+        window_size = max_length - tokenizer.num_special_tokens_to_add()
+        overlap = min(self.window_overlap, window_size - 1)
+
+        token_ids = tokenizer(resume_texts, add_special_tokens=False)['input_ids']
+        windows, owners = [], []
+        for index, ids in enumerate(token_ids):
+            for window in split_into_windows(ids, window_size, overlap):
+                windows.append(window)
+                owners.append(index)
+        return windows, owners
+
+    def _predict_windows(self, windows: List[List[int]]) -> np.ndarray:
+        """
+        Run all windows through the model as one batch.
+
+        Args:
+            windows (List[List[int]]): Token ids of each window, without special tokens.
+
+        Returns:
+            np.ndarray: Class probabilities of shape (windows, labels).
+        """
+        import torch  # Imported lazily like the rest of the model stack
+
+        classifier = self.model
+        tokenizer = classifier.tokenizer
+        inputs = [tokenizer.build_inputs_with_special_tokens(window) for window in windows]
+        encoded = tokenizer.pad({'input_ids': inputs}, return_tensors='pt')
+        encoded = {key: value.to(classifier.device) for key, value in encoded.items()}
+        with torch.no_grad():
+            logits = classifier.model(**encoded).logits
+        return torch.softmax(logits, dim=-1).cpu().numpy()
+
+    def _classify_batch(self, resume_texts: List[str]) -> List[List[dict]]:
+        """
+        Classify a batch of resumes, scoring every window of every resume in one forward pass.
+
+        Args:
+            resume_texts (List[str]): The resume texts.
+
+        Returns:
+            List[List[dict]]: One result per resume, shaped like the output of the pipeline for a single text.
+        """
+        windows, owners = self._tokenize_windows(resume_texts)
+        window_scores = self._predict_windows(windows)
+        id2label = self.model.model.config.id2label
+
+        owners = np.asarray(owners)
+        window_lengths = np.asarray([len(window) for window in windows])
+        results = []
+        for index in range(len(resume_texts)):
+            mask = owners == index
+            scores = aggregate_window_scores(window_scores[mask], window_lengths[mask], self.aggregation)
+            best = int(scores.argmax())
+            results.append([{"label": id2label[best], "score": float(scores[best]), "windows": int(mask.sum())}])
+        return results
+
+    def batch_stats(self) -> dict:
+        """
+        Return the micro-batching metrics, including the batch fill rate.
+        """
+        return self.batcher.stats()
 
     def analyze_resume(self, resume_text: str, job_description: str) -> dict:
         """
@@ -59,12 +185,13 @@ class AIService:
             dict: The combined analysis results from the AI model and content analysis.
         """
         try:
-            if not self.model:
-                raise ValueError("Model is not loaded")
-
             logger.debug("Starting resume analysis")
-            ai_analysis = self.model(resume_text)
-            content_analysis = self.content_analyzer.analyze({"noun_chunks": resume_text.split()}, job_description)
+            # Includes the wait for the batch, which is part of the latency of a request
+            with tracer.span('inference'):
+                ai_analysis = self.batcher.process(resume_text)
+            content_analysis = self.content_analyzer.analyze({"noun_chunks": resume_text.split()}, job_description,
+                                                             mode=self.analysis_mode,
+                                                             threshold=self.semantic_threshold)
 
             logger.info("Resume analysis completed successfully")
             return {
@@ -0,0 +1,184 @@
+"""
+batcher.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: batcher.py
+Revised: [Add revised date]
+
+Description:
+This module implements an in-process dynamic batcher for model inference.
+Concurrent callers submit single items; a worker thread collects them until either the
+maximum batch size is reached or the oldest item has waited the maximum wait time, runs
+them through the model as one batch and hands each caller its own result. On CPU this
+gives much higher throughput than running one forward pass per request.
+
+Classes:
+    DynamicBatcher: Collects concurrent requests into batches for a batch processing function.
+
+Usage:
+    Create a DynamicBatcher with a function that maps a list of inputs to a list of outputs
+    of the same length, then call submit or process from any thread.
+
+Example:
+    from app.services.batcher import DynamicBatcher
+
+    batcher = DynamicBatcher(lambda texts: model(texts), max_batch_size=16, max_wait_ms=10)
+    result = batcher.process("Resume text")
+    print(batcher.stats())
+"""
+
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from app.log import AppLogger
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+
+class DynamicBatcher:
+    """
+    Collects concurrent requests into batches for a batch processing function.
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], List[Any]], max_batch_size: int = 16,
+                 max_wait_ms: float = 10, max_queue_size: int = 256, timeout: float = 120,
+                 name: str = 'batcher'):
+        """
+        Args:
+            process_batch (Callable[[List[Any]], List[Any]]): Function returning one output per input.
+            max_batch_size (int): The maximum number of items run in one batch.
+            max_wait_ms (float): The longest time the first item of a batch waits for more items.
+            max_queue_size (int): The maximum number of items waiting to be batched.
+            timeout (float): Seconds a caller waits for a queue slot and for its result.
+            name (str): The name of the worker thread.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self.name = name
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batch_count = 0
+        self._item_count = 0
+        self._batch_sizes: Counter = Counter()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _collect_batch(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Still take whatever is already waiting, without blocking
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            # Skip requests whose caller cancelled them while they were queued
+            running = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            items = [item for item, _ in running]
+            futures = [future for _, future in running]
+            try:
+                if items:
+                    results = self.process_batch(items)
+                    if len(results) != len(items):
+                        raise ValueError(f"Batch function returned {len(results)} results for {len(items)} items")
+                    for future, result in zip(futures, results):
+                        future.set_result(result)
+                    self._record_batch(len(items))
+            except Exception as e:
+                logger.error(f"Error processing batch of {len(items)} items in {self.name}: {e}")
+                for future in futures:
+                    future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _record_batch(self, size: int):
+        with self._stats_lock:
+            self._batch_count += 1
+            self._item_count += size
+            self._batch_sizes[size] += 1
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item (Any): The input item.
+
+        Returns:
+            Future: A future resolving to the output for this item.
+
+        Raises:
+            RuntimeError: If the queue stays full for longer than the timeout.
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        try:
+            self._queue.put((item, future), timeout=self.timeout)
+        except queue.Full:
+            logger.error(f"{self.name} queue is full, rejecting request")
+            raise RuntimeError(f"{self.name} is overloaded, try again later")
+        return future
+
+    def process(self, item: Any) -> Any:
+        """
+        Run a single item through the batcher and wait for its output.
+
+        Args:
+            item (Any): The input item.
+
+        Returns:
+            Any: The output for this item.
+        """
+        return self.submit(item).result(timeout=self.timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return batching metrics.
+
+        Returns:
+            dict: The number of batches and items processed, the mean batch size, the fill rate
+            (mean batch size divided by the maximum batch size) and a histogram of batch sizes.
+        """
+        with self._stats_lock:
+            mean_batch_size = self._item_count / self._batch_count if self._batch_count else 0.0
+            return {
+                "batches": self._batch_count,
+                "items": self._item_count,
+                "mean_batch_size": mean_batch_size,
+                "fill_rate": mean_batch_size / self.max_batch_size,
+                "batch_sizes": dict(self._batch_sizes),
+                "queue_size": self._queue.qsize(),
+            }
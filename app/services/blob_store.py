@@ -0,0 +1,248 @@
+"""
+blob_store.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: blob_store.py
+Revised: [Add revised date]
+
+Description:
+This module implements content-addressed storage for uploaded files.
+Each distinct file content is stored once, under a path derived from its SHA-256, and is
+tracked by a FileBlob row with a reference count. Uploads of identical bytes point at the
+same blob, so disk usage grows with unique content and the text and analysis results cached
+by content hash are reused. Deleting an UploadedFile releases its reference; blobs that are
+no longer referenced are removed by collect_garbage.
+A new reference is only flushed: the caller commits it together with the UploadedFile row
+that holds it, so a failed upload never leaves a reference behind.
+
+Classes:
+    BlobStore: Stores file contents by hash and keeps their reference counts.
+
+Usage:
+    Create a BlobStore for a root directory and store upload streams with it.
+
+Example:
+    from app.services.blob_store import BlobStore
+
+    blob_store = BlobStore('uploads/blobs')
+    blob = blob_store.store(file.stream, extension='.pdf', max_size=10 * 1024 * 1024)
+    db.session.add(UploadedFile(filename='resume.pdf', file_path=blob.storage_path, blob_id=blob.id))
+    db.session.commit()
+"""
+
+import os
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError
+
+from app.db_manager import db
+from app.log import AppLogger
+from app.models import FileBlob, UploadedFile
+from app.utils.file_utils import stream_to_temp_file
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+
+class BlobStore:
+    """
+    Stores file contents by hash and keeps their reference counts.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root (str): The directory the blobs are stored under.
+        """
+        self.root = root
+        self.temp_dir = os.path.join(root, 'tmp')
+
+    def path_for(self, content_hash: str, extension: str = '') -> str:
+        """
+        Return the storage path for a content hash.
+
+        Two levels of subdirectories keep the number of files per directory small. The
+        extension is kept because text extraction picks the parser by file extension.
+
+        Args:
+            content_hash (str): The hex SHA-256 of the content.
+            extension (str): The file extension, including the dot.
+
+        Returns:
+            str: The path the content is stored at.
+        """
+        return os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash + extension.lower())
+
+    @staticmethod
+    def _add_reference(blob: FileBlob):
+        db.session.execute(update(FileBlob).where(FileBlob.id == blob.id)
+                           .values(ref_count=FileBlob.ref_count + 1))
+        db.session.refresh(blob)
+
+    def store(self, stream, extension: str = '', max_size: int = None) -> FileBlob:
+        """
+        Store the content of a stream, or add a reference to it if the same bytes are already stored.
+
+        The blob and its new reference are flushed, not committed: the caller commits them with the
+        row referencing the blob, or rolls back and calls discard_unrecorded.
+
+        Args:
+            stream: A binary file-like object with the content.
+            extension (str): The file extension, including the dot.
+            max_size (int, optional): The maximum content size in bytes.
+
+        Returns:
+            FileBlob: The blob holding the content, with the new reference counted.
+
+        Raises:
+            FileTooLargeError: If the content is larger than max_size.
+        """
+        temp_path, content_hash, size = stream_to_temp_file(stream, self.temp_dir, max_size)
+        try:
+            blob = FileBlob.query.filter_by(content_hash=content_hash).first()
+            if blob is not None:
+                if not os.path.exists(blob.storage_path):
+                    # The stored copy went missing; the new upload has the same bytes
+                    os.makedirs(os.path.dirname(blob.storage_path), exist_ok=True)
+                    os.replace(temp_path, blob.storage_path)
+                self._add_reference(blob)
+                logger.info(f"Reusing stored content {content_hash} ({blob.ref_count} references)")
+                return blob
+
+            storage_path = self.path_for(content_hash, extension)
+            os.makedirs(os.path.dirname(storage_path), exist_ok=True)
+            os.replace(temp_path, storage_path)
+            blob = FileBlob(content_hash=content_hash, size=size, storage_path=storage_path, ref_count=1)
+            try:
+                # A savepoint, so a conflict does not roll back the caller's transaction
+                with db.session.begin_nested():
+                    db.session.add(blob)
+            except IntegrityError:
+                # Another upload stored the same content first
+                blob = FileBlob.query.filter_by(content_hash=content_hash).one()
+                if blob.storage_path != storage_path:
+                    os.remove(storage_path)
+                self._add_reference(blob)
+            logger.info(f"Stored content {content_hash} ({size} bytes) at {blob.storage_path}")
+            return blob
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def write(self, stream, extension: str = '', max_size: int = None) -> Tuple[str, int, str]:
+        """
+        Write content to its hash-derived path without recording it in the database.
+
+        Used for bulk ingestion, where references are added for a whole batch at once with
+        add_references.
+
+        Args:
+            stream: A binary file-like object with the content.
+            extension (str): The file extension, including the dot.
+            max_size (int, optional): The maximum content size in bytes.
+
+        Returns:
+            tuple: The content hash, the size in bytes and the storage path.
+
+        Raises:
+            FileTooLargeError: If the content is larger than max_size.
+        """
+        temp_path, content_hash, size = stream_to_temp_file(stream, self.temp_dir, max_size)
+        storage_path = self.path_for(content_hash, extension)
+        if os.path.exists(storage_path):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(storage_path), exist_ok=True)
+            os.replace(temp_path, storage_path)
+        return content_hash, size, storage_path
+
+    @staticmethod
+    def add_references(contents: Iterable[Tuple[str, int, str]]) -> Dict[str, FileBlob]:
+        """
+        Add one reference per entry to the blobs of contents written with write.
+
+        Existing blobs are updated with one statement each and new blobs are added to the
+        session; the caller commits them together with the rows that reference them.
+
+        Args:
+            contents (Iterable[Tuple[str, int, str]]): (content hash, size, storage path) per reference.
+
+        Returns:
+            Dict[str, FileBlob]: The blob of each content hash.
+        """
+        contents = list(contents)
+        counts = Counter(content_hash for content_hash, _, _ in contents)
+        existing = {blob.content_hash: blob
+                    for blob in FileBlob.query.filter(FileBlob.content_hash.in_(list(counts))).all()}
+        blobs = dict(existing)
+
+        for content_hash, size, storage_path in contents:
+            blob = blobs.get(content_hash)
+            if blob is None:
+                blob = FileBlob(content_hash=content_hash, size=size, storage_path=storage_path,
+                                ref_count=counts[content_hash])
+                db.session.add(blob)
+                blobs[content_hash] = blob
+            elif blob.storage_path != storage_path and os.path.exists(storage_path):
+                # Same content stored earlier under another extension
+                os.remove(storage_path)
+
+        for content_hash, blob in existing.items():
+            db.session.execute(update(FileBlob).where(FileBlob.id == blob.id)
+                               .values(ref_count=FileBlob.ref_count + counts[content_hash]))
+        db.session.flush()
+        return blobs
+
+    @staticmethod
+    def discard_unrecorded(content_hash: str, storage_path: str):
+        """
+        Remove a stored file whose blob was rolled back, e.g. because the upload row could not be saved.
+        A file whose blob is still recorded, by this or another upload, is kept.
+
+        Args:
+            content_hash (str): The content hash of the blob.
+            storage_path (str): The path the content was stored at.
+        """
+        if FileBlob.query.filter_by(content_hash=content_hash).first() is None and os.path.exists(storage_path):
+            os.remove(storage_path)
+            logger.info(f"Removed content {content_hash} of a failed upload")
+
+    @staticmethod
+    def collect_garbage() -> int:
+        """
+        Delete the blobs no upload references any more.
+
+        The rows are deleted and committed before the files are removed, so a failed commit never
+        leaves rows pointing at missing files.
+
+        Returns:
+            int: The number of blobs deleted.
+        """
+        blobs = FileBlob.query.filter(FileBlob.ref_count <= 0).all()
+        paths = [(blob.content_hash, blob.storage_path) for blob in blobs]
+        for blob in blobs:
+            db.session.delete(blob)
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error deleting unreferenced blobs: {e}")
+            return 0
+
+        for content_hash, storage_path in paths:
+            try:
+                if os.path.exists(storage_path):
+                    os.remove(storage_path)
+            except OSError as e:
+                logger.error(f"Error deleting stored content {content_hash}: {e}")
+        return len(paths)
+
+
+@event.listens_for(UploadedFile, 'after_delete')
+def _release_blob(mapper, connection, target):
+    if target.blob_id is not None:
+        connection.execute(update(FileBlob).where(FileBlob.id == target.blob_id)
+                           .values(ref_count=FileBlob.ref_count - 1))
@@ -0,0 +1,315 @@
+"""
+bulk_ingest.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: bulk_ingest.py
+Revised: [Add revised date]
+
+Description:
+This module implements bulk ingestion of resumes from archives and directories.
+Files are read one at a time from a zip or tar archive (tar archives as a true stream) or a
+directory tree, written to the blob store, and their text is extracted in a pool of worker
+processes. Rows are inserted in batches: one query per batch looks up the blobs, and the
+UploadedFile, Resume, ResumeSkill and ExtractedText rows of the whole batch are committed
+together. If a batch cannot be committed, its files are reported as failed and the contents
+it wrote to the blob store are removed again.
+A report with the throughput and the failed files is returned at the end.
+
+Classes:
+    IngestReport: The outcome of a bulk ingestion.
+    BulkIngestor: Ingests many resume files with parallel text extraction and batched inserts.
+
+Functions:
+    iter_archive: Yields the files of a zip or tar archive.
+    iter_directory: Yields the files under a directory.
+
+Usage:
+    Create a BulkIngestor with a blob store and a user, then pass it the entries of an archive
+    or a directory.
+
+Example:
+    from app.services.bulk_ingest import BulkIngestor, iter_directory
+
+    ingestor = BulkIngestor(current_app.blob_store, user_id=1)
+    report = ingestor.ingest(iter_directory('campus_drop'))
+    print(report.to_dict())
+"""
+
+import json
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import docx2txt
+from werkzeug.utils import secure_filename
+
+from app.db_manager import db
+from app.log import AppLogger
+from app.models import ExtractedText, FileBlob, Resume, UploadedFile
+from app.services.skill_index import record_resume_skills
+from app.services.text_extraction import ExtractedDocument, can_start_worker_processes, extract_pdf_pages
+from app.utils.file_utils import FileTooLargeError
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+INGEST_BATCH_SIZE = 200
+INGEST_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _is_resume_file(name: str) -> bool:
+    basename = os.path.basename(name)
+    # Skip hidden files and the metadata folders some archivers add
+    if not basename or basename.startswith('.') or '__MACOSX' in name:
+        return False
+    return os.path.splitext(basename)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def iter_archive(archive_path: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yields the files of a zip or tar archive.
+
+    Tar archives (optionally compressed) are read as a stream. Zip archives keep their index
+    at the end, so members are opened one at a time through the index.
+
+    Args:
+        archive_path (str): The path to the archive.
+
+    Yields:
+        Tuple[str, BinaryIO]: The member name and a stream with its content.
+    """
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and _is_resume_file(member.filename):
+                    with archive.open(member) as stream:
+                        yield member.filename, stream
+        return
+
+    with tarfile.open(archive_path, mode='r|*') as archive:
+        for member in archive:
+            if member.isfile() and _is_resume_file(member.name):
+                yield member.name, archive.extractfile(member)
+
+
+def iter_directory(directory: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yields the files under a directory.
+
+    Args:
+        directory (str): The directory to walk.
+
+    Yields:
+        Tuple[str, BinaryIO]: The file path relative to the directory and a stream with its content.
+    """
+    for root, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            if _is_resume_file(path):
+                with open(path, 'rb') as stream:
+                    yield os.path.relpath(path, directory), stream
+
+
+def _extract_text(file_path: str) -> Tuple[Optional[List[str]], str]:
+    # Runs in a worker process, so it must stay a module level function. PDFs are extracted
+    # serially here because the pool already runs one file per process.
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == '.pdf':
+        pages = extract_pdf_pages(file_path)
+        return pages, ExtractedDocument('', pages).text
+    if extension == '.docx':
+        return None, docx2txt.process(file_path)
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return None, f.read()
+
+
+class IngestReport:
+    """
+    The outcome of a bulk ingestion.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.ingested = 0
+        self.duplicates = 0
+        self.failures: List[Dict[str, str]] = []
+        self.started = time.monotonic()
+        self.seconds = 0.0
+
+    def fail(self, name: str, error: str):
+        logger.error(f"Failed to ingest {name}: {error}")
+        self.failures.append({"file": name, "error": error})
+
+    def finish(self):
+        self.seconds = time.monotonic() - self.started
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a JSON serializable dictionary.
+        """
+        return {
+            "files": self.files,
+            "ingested": self.ingested,
+            "duplicates": self.duplicates,
+            "failed": len(self.failures),
+            "failures": self.failures,
+            "seconds": round(self.seconds, 3),
+            "files_per_second": round(self.files_per_second, 1),
+        }
+
+
+class BulkIngestor:
+    """
+    Ingests many resume files with parallel text extraction and batched inserts.
+    """
+
+    def __init__(self, blob_store, user_id: int, batch_size: int = INGEST_BATCH_SIZE,
+                 max_workers: int = INGEST_WORKERS, max_size: Optional[int] = None):
+        """
+        Args:
+            blob_store (BlobStore): The store the files are written to.
+            user_id (int): The ID of the user the uploads and resumes belong to.
+            batch_size (int): The number of files inserted per transaction.
+            max_workers (int): The number of text extraction processes. 1 extracts in the calling process,
+                as do daemonic processes, which may not start worker processes.
+            max_size (int, optional): The maximum size of a single file in bytes.
+        """
+        self.blob_store = blob_store
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_size = max_size
+
+    def ingest(self, entries: Iterable[Tuple[str, BinaryIO]],
+               on_batch: Optional[Callable[[IngestReport], None]] = None) -> IngestReport:
+        """
+        Ingest the given files.
+
+        Args:
+            entries (Iterable[Tuple[str, BinaryIO]]): Name and content stream of each file, e.g.
+                from iter_archive or iter_directory.
+            on_batch (Callable[[IngestReport], None], optional): Called with the report so far after
+                each batch, e.g. to record the progress of a queued ingestion.
+
+        Returns:
+            IngestReport: The number of files ingested, the failures and the throughput.
+        """
+        report = IngestReport()
+        pool = None
+        if self.max_workers > 1:
+            if can_start_worker_processes():
+                pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                logger.info("Running in a daemonic process, extracting the ingested files in-process")
+        batch = []
+        try:
+            for name, stream in entries:
+                report.files += 1
+                try:
+                    content_hash, size, storage_path = self.blob_store.write(
+                        stream, extension=os.path.splitext(name)[1], max_size=self.max_size)
+                except (FileTooLargeError, OSError) as e:
+                    report.fail(name, str(e))
+                    continue
+
+                extraction = None
+                if pool is not None:
+                    try:
+                        extraction = pool.submit(_extract_text, storage_path)
+                    except (AssertionError, OSError, BrokenProcessPool) as e:
+                        # The workers are started by the first submit
+                        logger.error(f"Could not start the extraction processes, extracting in-process: {e}")
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = None
+                batch.append((name, content_hash, size, storage_path, extraction))
+                if len(batch) >= self.batch_size:
+                    self._commit_batch(batch, report, on_batch)
+                    batch = []
+            if batch:
+                self._commit_batch(batch, report, on_batch)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        report.finish()
+        logger.info(f"Ingested {report.ingested} of {report.files} files in {report.seconds:.1f}s "
+                    f"({report.files_per_second:.1f} files/s, {len(report.failures)} failed)")
+        return report
+
+    @staticmethod
+    def _extraction_result(extraction, storage_path):
+        try:
+            if extraction is not None:
+                try:
+                    return extraction.result(), None
+                except (BrokenProcessPool, CancelledError):
+                    # Submitted before the pool broke or was shut down
+                    pass
+            return _extract_text(storage_path), None
+        except Exception as e:
+            return (None, ''), f"Text extraction failed: {e}"
+
+    def _commit_batch(self, batch, report: IngestReport, on_batch):
+        ingested, duplicates, failed = report.ingested, report.duplicates, len(report.failures)
+        try:
+            self._insert_batch(batch, report)
+        except Exception as e:
+            db.session.rollback()
+            report.ingested, report.duplicates = ingested, duplicates
+            del report.failures[failed:]
+            for name, content_hash, _, storage_path, _ in batch:
+                # Contents first written by this batch have no blob row after the rollback
+                self.blob_store.discard_unrecorded(content_hash, storage_path)
+                report.fail(name, f"The batch could not be saved: {e}")
+        if on_batch is not None:
+            on_batch(report)
+
+    def _insert_batch(self, batch, report: IngestReport):
+        # Collect the texts first: adding references may remove duplicate copies of a file
+        results = [self._extraction_result(extraction, storage_path)
+                   for _, _, _, storage_path, extraction in batch]
+
+        hashes = list({content_hash for _, content_hash, _, _, _ in batch})
+        stored = {row.content_hash for row in FileBlob.query.with_entities(FileBlob.content_hash)
+                  .filter(FileBlob.content_hash.in_(hashes)).all()}
+        known_texts = {row.content_hash for row in ExtractedText.query.with_entities(ExtractedText.content_hash)
+                       .filter(ExtractedText.content_hash.in_(hashes)).all()}
+        blobs = self.blob_store.add_references((content_hash, size, storage_path)
+                                               for _, content_hash, size, storage_path, _ in batch)
+
+        rows = []
+        resumes = []
+        for (name, content_hash, _, _, _), ((pages, text), error) in zip(batch, results):
+            blob = blobs[content_hash]
+            if content_hash in stored:
+                report.duplicates += 1
+            stored.add(content_hash)
+            # The upload is kept even if extraction fails, so the file can be re-analysed later
+            rows.append(UploadedFile(user_id=self.user_id, filename=secure_filename(os.path.basename(name)),
+                                     file_path=blob.storage_path, content_hash=content_hash, blob=blob))
+            if error is None and not text.strip():
+                error = "No text could be extracted"
+            if error is not None:
+                report.fail(name, error)
+                continue
+
+            resumes.append(Resume(user_id=self.user_id, content=text))
+            if pages is not None and content_hash not in known_texts:
+                # Fills the PDF text cache, so later analyses of these files skip extraction
+                rows.append(ExtractedText(content_hash=content_hash, pages=json.dumps(pages), page_count=len(pages)))
+                known_texts.add(content_hash)
+            report.ingested += 1
+
+        db.session.add_all(rows + resumes)
+        db.session.flush()
+        record_resume_skills((resume.id, resume.content) for resume in resumes)
+        db.session.commit()
@@ -0,0 +1,93 @@
+"""
+chunking.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: chunking.py
+Revised: [Add revised date]
+
+Description:
+This module implements token-aware chunking for long resumes.
+A resume is tokenized once, split into overlapping windows that fit the model's maximum
+input length, and the per-window class probabilities are aggregated back into a single
+score per resume, so multi-page CVs are scored in full instead of being truncated.
+
+Functions:
+    split_into_windows: Splits a sequence of token ids into overlapping windows.
+    aggregate_window_scores: Combines per-window class probabilities into one distribution.
+
+Constants:
+    AGGREGATION_STRATEGIES: The supported aggregation strategies.
+
+Usage:
+    Import the functions from this module to chunk token sequences and aggregate scores.
+
+Example:
+    from app.services.chunking import split_into_windows, aggregate_window_scores
+
+    windows = split_into_windows(token_ids, window_size=510, overlap=128)
+    scores = aggregate_window_scores(window_probabilities, [len(w) for w in windows], 'mean')
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+AGGREGATION_STRATEGIES = ('mean', 'max', 'length_weighted')
+
+
+def split_into_windows(token_ids: Sequence[int], window_size: int, overlap: int) -> List[List[int]]:
+    """
+    Splits a sequence of token ids into overlapping windows.
+
+    Args:
+        token_ids (Sequence[int]): The token ids of the whole text, without special tokens.
+        window_size (int): The maximum number of tokens per window.
+        overlap (int): The number of tokens shared by consecutive windows.
+
+    Returns:
+        List[List[int]]: The windows in order. A short text yields a single window.
+    """
+    if window_size < 1:
+        raise ValueError("window_size must be at least 1")
+    if not 0 <= overlap < window_size:
+        raise ValueError("overlap must be between 0 and window_size - 1")
+
+    token_ids = list(token_ids)
+    if len(token_ids) <= window_size:
+        return [token_ids]
+
+    step = window_size - overlap
+    windows = []
+    for start in range(0, len(token_ids), step):
+        windows.append(token_ids[start:start + window_size])
+        if start + window_size >= len(token_ids):
+            break
+    return windows
+
+
+def aggregate_window_scores(window_scores: np.ndarray, window_lengths: Sequence[int],
+                            strategy: str = 'mean') -> np.ndarray:
+    """
+    Combines per-window class probabilities into one distribution.
+
+    Args:
+        window_scores (np.ndarray): Array of shape (windows, labels) with class probabilities.
+        window_lengths (Sequence[int]): The number of tokens in each window.
+        strategy (str): 'mean' averages the windows, 'max' takes the highest probability of each
+            label across windows and 'length_weighted' averages the windows weighted by length.
+
+    Returns:
+        np.ndarray: The aggregated scores, one per label.
+    """
+    window_scores = np.asarray(window_scores, dtype=np.float32)
+    if strategy == 'mean':
+        return window_scores.mean(axis=0)
+    if strategy == 'max':
+        return window_scores.max(axis=0)
+    if strategy == 'length_weighted':
+        weights = np.asarray(window_lengths, dtype=np.float32)
+        if weights.sum() <= 0:
+            return window_scores.mean(axis=0)
+        return np.average(window_scores, axis=0, weights=weights)
+    raise ValueError(f"Unknown aggregation strategy '{strategy}', expected one of {AGGREGATION_STRATEGIES}")
@@ -8,6 +8,14 @@ Revised: [Add revised date]
 
 Description:
 This module implements content analysis algorithms to score and rank resumes based on relevance.
+Keywords are matched exactly by default. The 'semantic' mode also counts keywords whose word
+vectors are similar to a phrase of the resume or a clause of the job description, so related
+terms are credited even when the keyword does not appear verbatim.
+
+Constants:
+    KEYWORD_MATCHER: The skill and education vocabularies compiled into a single-pass matcher.
+    TAXONOMY_VERSION: A hash of the vocabularies, used to invalidate cached analysis results.
+    ANALYSIS_MODES: The supported matching modes, 'exact' and 'semantic'.
 
 Classes:
     ContentAnalyzer: A class to handle content analysis of resumes compared to job descriptions.
@@ -28,8 +36,15 @@ Example:
     print(analysis_results)
 """
 
+import hashlib
+import json
 import logging
 
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.model_registry import model_registry
+from app.services.semantic_matching import SEMANTIC_MATCH_THRESHOLD, SemanticMatcher, split_clauses
+from app.services.tracing import tracer
+
 logger = logging.getLogger('resumate')
 logger.setLevel(logging.INFO)
 
@@ -96,6 +111,30 @@ EDUCATION_KEYWORDS = [
     "Technical Training in Software Development"
 ]
 
+VOCABULARIES = {
+    "hard_skills": HARD_SKILLS,
+    "soft_skills": SOFT_SKILLS,
+    "education": EDUCATION_KEYWORDS,
+}
+
+# Compile the vocabularies once at import so every text is scanned in a single pass
+KEYWORD_MATCHER = KeywordMatcher(VOCABULARIES)
+
+# Changes whenever a vocabulary changes, so cached results scored with the old one are not reused
+TAXONOMY_VERSION = hashlib.sha256(
+    json.dumps([HARD_SKILLS, SOFT_SKILLS, EDUCATION_KEYWORDS]).encode('utf-8')
+).hexdigest()[:16]
+
+ANALYSIS_MODES = ('exact', 'semantic')
+
+
+# Registered lazily so the exact mode never loads the word vectors
+def _load_semantic_matcher():
+    return SemanticMatcher(model_registry.get('word_vectors'), VOCABULARIES)
+
+
+model_registry.register('semantic_matcher', _load_semantic_matcher)
+
 
 class ContentAnalyzer:
     """
@@ -103,41 +142,57 @@ class ContentAnalyzer:
     """
 
     @staticmethod
-    def analyze(resume_data, job_description):
+    def analyze(resume_data, job_description, mode='exact', threshold=SEMANTIC_MATCH_THRESHOLD,
+                semantic_matcher=None):
         """
         Analyze the resume content and compare it with the job description.
 
         Args:
             resume_data (dict): The parsed resume data.
             job_description (str): The job description text.
+            mode (str): 'exact' to match keywords verbatim, or 'semantic' to also match similar phrases.
+            threshold (float): The lowest cosine similarity counted as a match in semantic mode.
+            semantic_matcher (SemanticMatcher, optional): The matcher used in semantic mode.
+                Defaults to the shared one built from the SpaCy model's word vectors.
 
         Returns:
             dict: Analysis results including scores and matching keywords.
         """
         try:
-            resume_text = " ".join(resume_data["noun_chunks"]).lower()
-            job_text = job_description.lower()
-
-            def match_keywords(text, keywords):
-                return {kw for kw in keywords if kw.lower() in text}
-
-            matching_hard_skills = match_keywords(resume_text, HARD_SKILLS)
-            matching_soft_skills = match_keywords(resume_text, SOFT_SKILLS)
-            matching_education = match_keywords(resume_text, EDUCATION_KEYWORDS)
-
-            all_keywords = HARD_SKILLS + SOFT_SKILLS + EDUCATION_KEYWORDS
-            total_keywords = match_keywords(job_text, all_keywords)
-
-            score = (len(matching_hard_skills | matching_soft_skills | matching_education) /
-                     len(total_keywords)) if total_keywords else 0
+            if mode not in ANALYSIS_MODES:
+                raise ValueError(f"Unknown analysis mode '{mode}'")
+            resume_text = " ".join(resume_data["noun_chunks"])
+
+            with tracer.span('phrase_matching'):
+                resume_matches = KEYWORD_MATCHER.match_categories(resume_text)
+                job_matches = KEYWORD_MATCHER.match_categories(job_description)
+                if mode == 'semantic':
+                    matcher = semantic_matcher or model_registry.get('semantic_matcher')
+                    for matches, phrases in ((resume_matches, resume_data["noun_chunks"]),
+                                             (job_matches, split_clauses(job_description))):
+                        for category, keywords in matcher.match_categories(phrases, threshold).items():
+                            matches[category] |= keywords
+
+            with tracer.span('scoring'):
+                matching_hard_skills = resume_matches["hard_skills"]
+                matching_soft_skills = resume_matches["soft_skills"]
+                matching_education = resume_matches["education"]
+
+                total_keywords = set().union(*job_matches.values())
+
+                score = (len(matching_hard_skills | matching_soft_skills | matching_education) /
+                         len(total_keywords)) if total_keywords else 0
 
             logger.info("Content analysis completed successfully")
-            return {
+            results = {
                 "matching_hard_skills": list(matching_hard_skills),
                 "matching_soft_skills": list(matching_soft_skills),
                 "matching_education": list(matching_education),
                 "score": score
             }
+            if mode == 'semantic':
+                results["mode"] = mode
+            return results
         except Exception as e:
             logger.error(f"An error occurred while analyzing the resume: {e}")
             return {}
@@ -0,0 +1,178 @@
+"""
+keyword_matcher.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: keyword_matcher.py
+Revised: [Add revised date]
+
+Description:
+This module implements a multi-pattern keyword matcher based on the Aho-Corasick algorithm.
+All keyword vocabularies are compiled once into a single automaton, so a text is scanned in
+one pass and the matches of every category (with offsets) are reported together.
+Matches are case-insensitive and respect word boundaries, so "Java" does not match inside
+"JavaScript" and "SQL" does not match inside "MySQL".
+
+Classes:
+    KeywordMatch: A single keyword occurrence found in a text.
+    KeywordMatcher: A compiled Aho-Corasick automaton over categorized keyword vocabularies.
+
+Usage:
+    Build a KeywordMatcher once with a mapping of category names to keyword lists, then
+    call find_all or match_categories for every text to scan.
+
+Example:
+    from app.services.keyword_matcher import KeywordMatcher
+
+    matcher = KeywordMatcher({"hard_skills": ["Python", "Java"], "soft_skills": ["teamwork"]})
+    matcher.match_categories("Python developer who values teamwork")
+    # {'hard_skills': {'Python'}, 'soft_skills': {'teamwork'}}
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """
+    A single keyword occurrence found in a text.
+
+    Attributes:
+        category (str): The vocabulary category the keyword belongs to.
+        keyword (str): The keyword as it was declared in the vocabulary.
+        start (int): Offset of the first character of the match.
+        end (int): Offset one past the last character of the match.
+    """
+    category: str
+    keyword: str
+    start: int
+    end: int
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """
+    A compiled Aho-Corasick automaton over categorized keyword vocabularies.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        """
+        Compile the vocabularies into a single automaton.
+
+        Args:
+            vocabularies (Dict[str, Iterable[str]]): Mapping of category name to its keywords.
+        """
+        self.categories: List[str] = list(vocabularies)
+        # Each state has its transitions, a failure link and the patterns that end there.
+        # An output is (category, keyword, length, check_left_boundary, check_right_boundary).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str, int, bool, bool]]] = [[]]
+
+        for category, keywords in vocabularies.items():
+            for keyword in keywords:
+                self._add_keyword(category, keyword)
+        self._build_failure_links()
+
+    def _add_keyword(self, category: str, keyword: str):
+        pattern = keyword.lower()
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+
+        # Boundaries only matter on edges that are word characters, e.g. "C++" must not
+        # start inside a word but may be followed by anything.
+        self._output[state].append(
+            (category, keyword, len(pattern), _is_word_char(pattern[0]), _is_word_char(pattern[-1]))
+        )
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit the outputs of the failure state so suffix matches are reported too
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        """
+        Scan the text once and yield every keyword occurrence.
+
+        Overlapping keywords (e.g. "Computer Science" inside "Master of Computer Science")
+        are all reported. Offsets refer to positions in the lower-cased text, which are the
+        same as in the original text for all but a handful of special Unicode characters.
+
+        Args:
+            text (str): The text to scan.
+
+        Yields:
+            KeywordMatch: The matches in order of their end offset.
+        """
+        text_lower = text.lower()
+        text_length = len(text_lower)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        state = 0
+        for index, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+
+            end = index + 1
+            for category, keyword, length, check_left, check_right in output[state]:
+                start = end - length
+                if check_left and start > 0 and _is_word_char(text_lower[start - 1]):
+                    continue
+                if check_right and end < text_length and _is_word_char(text_lower[end]):
+                    continue
+                yield KeywordMatch(category, keyword, start, end)
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """
+        Return every keyword occurrence in the text.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            List[KeywordMatch]: The matches in order of their end offset.
+        """
+        return list(self.iter_matches(text))
+
+    def match_categories(self, text: str) -> Dict[str, Set[str]]:
+        """
+        Return the distinct keywords found in the text, grouped by category.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            Dict[str, Set[str]]: Mapping of every category to the keywords matched in the text.
+        """
+        matched: Dict[str, Set[str]] = {category: set() for category in self.categories}
+        for match in self.iter_matches(text):
+            matched[match.category].add(match.keyword)
+        return matched
@@ -0,0 +1,332 @@
+"""
+log_reader.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: log_reader.py
+Revised: [Add revised date]
+
+Description:
+This module reads the application log files for the admin log viewer without loading them.
+The newest entries are read backwards from the end of a file in fixed size blocks, so showing
+the last entries of a file costs the same whatever its size. Older entries are paged by byte
+offset: every page reports where its oldest entry starts, and the next page ends there.
+A following reader streams the entries appended to a file, reading only the new bytes.
+An entry is a JSON line written by the application logging, or a line of the text log format
+starting with the timestamp, logger and level, together with the lines that follow it without a
+timestamp, such as a traceback.
+
+Classes:
+    LogFileNotFoundError: Raised when a log file is not one of the viewable files.
+    LogEntry: An entry of a log file.
+    LogPage: A page of entries, oldest first.
+
+Functions:
+    list_log_files: Returns the names of the viewable log files in a directory.
+    resolve_log_file: Returns the path of a viewable log file.
+    tail: Returns the last entries of a log file before a byte offset.
+    follow: Returns an iterator over the entries appended to a log file.
+
+Usage:
+    Call tail for the newest page, then again with before=page.next_before for older pages.
+    Call follow with page.end to stream the entries written after the page.
+
+Example:
+    from app.services.log_reader import follow, resolve_log_file, tail
+
+    path = resolve_log_file('logs', 'app.log')
+    page = tail(path, limit=100, level='WARNING')
+    for entry in follow(path, page.end, max_duration=60):
+        print(entry)
+"""
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# The start of an entry: a JSON line of app.log.JsonFormatter, which starts with the time and level,
+# or the text format '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+ENTRY_HEADER_PATTERN = re.compile(rb'\{"time": "[^"]*", "level": "([A-Z]+)"'
+                                  rb'|\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - .*? - ([A-Z]+) - ')
+BLOCK_SIZE = 64 * 1024
+
+
+class LogFileNotFoundError(LookupError):
+    """
+    Raised when a log file is not one of the viewable files.
+    """
+
+
+@dataclass
+class LogEntry:
+    """
+    An entry of a log file.
+
+    Attributes:
+        start (int): Byte offset of the entry in the file.
+        end (int): Byte offset just past the entry, including its last newline.
+        level (str): The level name, or None for lines before the first timestamped line.
+        text (str): The entry, possibly several lines.
+    """
+    start: int
+    end: int
+    level: Optional[str]
+    text: str
+
+    def to_dict(self) -> dict:
+        """
+        Return the entry as a JSON serializable dictionary.
+        """
+        return {"start": self.start, "end": self.end, "level": self.level, "text": self.text}
+
+
+@dataclass
+class LogPage:
+    """
+    A page of entries, oldest first.
+
+    Attributes:
+        entries (List[LogEntry]): The entries of the page.
+        next_before (int): The offset to pass as 'before' for the previous entries, or None at the start of the file.
+        end (int): The offset the page was read up to, where following the file should start.
+    """
+    entries: List[LogEntry] = field(default_factory=list)
+    next_before: Optional[int] = None
+    end: int = 0
+
+    def to_dict(self) -> dict:
+        """
+        Return the page as a JSON serializable dictionary.
+        """
+        return {"entries": [entry.to_dict() for entry in self.entries], "next_before": self.next_before,
+                "end": self.end}
+
+
+def list_log_files(directory: str) -> List[str]:
+    """
+    Return the names of the viewable log files in a directory.
+
+    Args:
+        directory (str): The log directory.
+
+    Returns:
+        List[str]: The names of the '.log' files and their rotated copies, e.g. 'app.log.1', sorted.
+    """
+    try:
+        return sorted(name for name in os.listdir(directory)
+                      if (name.endswith('.log') or '.log.' in name) and os.path.isfile(os.path.join(directory, name)))
+    except FileNotFoundError:
+        return []
+
+
+def resolve_log_file(directory: str, name: str) -> str:
+    """
+    Return the path of a viewable log file.
+
+    Args:
+        directory (str): The log directory.
+        name (str): The name of the file, as listed by list_log_files.
+
+    Returns:
+        str: The path of the file.
+
+    Raises:
+        LogFileNotFoundError: If the name is not one of the listed files, e.g. a path outside the directory.
+    """
+    if name not in list_log_files(directory):
+        raise LogFileNotFoundError(f"Unknown log file '{name}'")
+    return os.path.join(directory, name)
+
+
+def _level_of(line: bytes) -> Tuple[bool, Optional[str]]:
+    match = ENTRY_HEADER_PATTERN.match(line)
+    return (True, match.group(match.lastindex).decode('ascii')) if match else (False, None)
+
+
+def _make_entry(start: int, end: int, level: Optional[str], lines: List[bytes]) -> LogEntry:
+    text = b'\n'.join(lines).decode('utf-8', errors='replace').replace('\r', '')
+    return LogEntry(start=start, end=end, level=level, text=text)
+
+
+def _matcher(level: Optional[str], contains: Optional[str]) -> Callable[[LogEntry], bool]:
+    """
+    Build the filter of the entries at or above a level and containing a text, ignoring case.
+    """
+    min_level = None
+    if level:
+        min_level = logging.getLevelName(level.upper())
+        if not isinstance(min_level, int):
+            raise ValueError(f"Unknown log level '{level}'")
+    needle = contains.lower() if contains else None
+
+    def matches(entry: LogEntry) -> bool:
+        if min_level is not None:
+            entry_level = logging.getLevelName(entry.level) if entry.level else None
+            if not isinstance(entry_level, int) or entry_level < min_level:
+                return False
+        return needle is None or needle in entry.text.lower()
+
+    return matches
+
+
+def _reverse_lines(file, end: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield the start offset and content of every line before an offset, last line first.
+    The text after the last newline before the offset, an unfinished line, is yielded first.
+    """
+    position = end
+    remainder = b''
+    while position > 0:
+        size = min(BLOCK_SIZE, position)
+        position -= size
+        file.seek(position)
+        lines = (file.read(size) + remainder).split(b'\n')
+        remainder = lines[0]
+        line_end = position + len(remainder)
+        offsets = []
+        for line in lines[1:]:
+            offsets.append(line_end + 1)
+            line_end += 1 + len(line)
+        for line_start, line in zip(reversed(offsets), reversed(lines[1:])):
+            yield line_start, line
+    yield 0, remainder
+
+
+def _reverse_entries(file, end: int) -> Iterator[LogEntry]:
+    """
+    Yield the complete entries before an offset, last entry first.
+    """
+    lines = _reverse_lines(file, end)
+    # The unfinished line after the last newline is left to follow
+    unfinished_start, _ = next(lines)
+    entry_end = unfinished_start
+    entry_lines: List[bytes] = []
+    for line_start, line in lines:
+        entry_lines.append(line)
+        is_header, level = _level_of(line)
+        if is_header or line_start == 0:
+            entry_lines.reverse()
+            yield _make_entry(line_start, entry_end, level, entry_lines)
+            entry_end = line_start
+            entry_lines = []
+
+
+def tail(path: str, limit: int = 200, before: Optional[int] = None, level: Optional[str] = None,
+         contains: Optional[str] = None) -> LogPage:
+    """
+    Return the last entries of a log file before a byte offset.
+
+    Args:
+        path (str): The log file.
+        limit (int): The most entries returned.
+        before (int, optional): Only return entries starting before this offset, the next_before of
+            the newer page. Defaults to the end of the file.
+        level (str, optional): Only return entries at this level or above, e.g. 'WARNING'.
+        contains (str, optional): Only return entries containing this text, ignoring case.
+
+    Returns:
+        LogPage: The entries, oldest first.
+
+    Raises:
+        ValueError: If the level is unknown.
+    """
+    matches = _matcher(level, contains)
+    entries: List[LogEntry] = []
+    # The end of the last complete line, or the start of the file if there is none
+    page_end = None
+    with open(path, 'rb') as file:
+        size = file.seek(0, os.SEEK_END)
+        end = size if before is None else max(0, min(before, size))
+        for entry in _reverse_entries(file, end):
+            if page_end is None:
+                page_end = entry.end
+            if matches(entry):
+                entries.append(entry)
+                if len(entries) == limit:
+                    break
+    entries.reverse()
+    next_before = entries[0].start if len(entries) == limit and entries[0].start > 0 else None
+    return LogPage(entries=entries, next_before=next_before, end=page_end or 0)
+
+
+def follow(path: str, position: int, level: Optional[str] = None, contains: Optional[str] = None,
+           poll_interval: float = 1.0, max_duration: float = 300.0,
+           sleep: Callable[[float], None] = time.sleep) -> Iterator[Optional[LogEntry]]:
+    """
+    Return an iterator over the entries appended to a log file after an offset.
+
+    An entry is yielded once the next entry starts or the file stops growing, so the lines of a
+    traceback stay together. When the file is truncated or replaced, e.g. by log rotation, reading
+    starts again at the beginning of the new file.
+
+    Args:
+        path (str): The log file.
+        position (int): The offset to start reading at, e.g. the end of the last page shown.
+        level (str, optional): Only yield entries at this level or above.
+        contains (str, optional): Only yield entries containing this text, ignoring case.
+        poll_interval (float): Seconds to wait before looking for new entries again.
+        max_duration (float): Seconds after which to stop following.
+        sleep (Callable[[float], None]): Waits between polls.
+
+    Returns:
+        Iterator[Optional[LogEntry]]: The new entries matching the filters, and None whenever nothing
+        was appended, which a caller can use to keep its connection alive.
+
+    Raises:
+        ValueError: If the level is unknown, when follow is called rather than on the first entry.
+    """
+    return _follow(path, position, _matcher(level, contains), poll_interval, max_duration, sleep)
+
+
+def _follow(path: str, position: int, matches: Callable[[LogEntry], bool], poll_interval: float,
+            max_duration: float, sleep: Callable[[float], None]) -> Iterator[Optional[LogEntry]]:
+    deadline = time.monotonic() + max_duration
+    file = open(path, 'rb')
+    try:
+        if position > os.fstat(file.fileno()).st_size:
+            position = 0
+        file.seek(position)
+        buffer = b''
+        pending: Optional[Tuple[int, Optional[str], List[bytes]]] = None
+        while True:
+            chunk = file.read(BLOCK_SIZE)
+            if chunk:
+                lines = (buffer + chunk).split(b'\n')
+                buffer = lines.pop()
+                for line in lines:
+                    is_header, entry_level = _level_of(line)
+                    if is_header or pending is None:
+                        if pending is not None:
+                            entry = _make_entry(pending[0], position, pending[1], pending[2])
+                            if matches(entry):
+                                yield entry
+                        pending = (position, entry_level, [line])
+                    else:
+                        pending[2].append(line)
+                    position += len(line) + 1
+                continue
+
+            # The file stopped growing: the last entry is complete
+            if pending is not None:
+                entry = _make_entry(pending[0], position, pending[1], pending[2])
+                pending = None
+                if matches(entry):
+                    yield entry
+            if time.monotonic() >= deadline:
+                return
+            yield None
+            sleep(poll_interval)
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_ino != os.fstat(file.fileno()).st_ino or stat.st_size < position + len(buffer):
+                file.close()
+                file = open(path, 'rb')
+                position, buffer = 0, b''
+    finally:
+        file.close()
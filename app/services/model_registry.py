@@ -0,0 +1,166 @@
+"""
+model_registry.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: model_registry.py
+Revised: [Add revised date]
+
+Description:
+This module implements a process-wide registry for the heavy NLP models used by ResuMate.
+Models are registered with a loader function and are only loaded on first use (or by a
+background warm-up thread), so importing the application and serving pages that do not
+need a model stays fast. Every module that asks for the same model shares one instance.
+
+Classes:
+    ModelRegistry: A registry that lazily loads and shares models.
+
+Constants:
+    SPACY_MODEL: Name of the SpaCy model used for resume parsing.
+    BERT_NER_MODEL: Name of the BERT model used for keyword extraction.
+
+Usage:
+    Use the module-level model_registry instance to get models by name.
+
+Example:
+    from app.services.model_registry import model_registry
+
+    nlp = model_registry.get('spacy')
+    model_registry.warm_up()  # Load every registered model in a background thread
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.log import AppLogger
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+SPACY_MODEL = "en_core_web_lg"
+BERT_NER_MODEL = "bert-base-uncased"
+
+
+class ModelRegistry:
+    """
+    A registry that lazily loads models and shares one instance of each per process.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        # Set once a warm-up thread has attempted to load every model it was given
+        self.ready = threading.Event()
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """
+        Register a loader for a model. Registering a name again replaces its loader and
+        drops any instance already loaded.
+
+        Args:
+            name (str): The name of the model.
+            loader (Callable[[], Any]): A function that loads and returns the model.
+        """
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._loaders
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        """
+        Return the model registered under the given name, loading it on first use.
+
+        Args:
+            name (str): The name of the model.
+
+        Returns:
+            Any: The loaded model.
+
+        Raises:
+            KeyError: If no model is registered under the name.
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                logger.info(f"Loading model '{name}'...")
+                model = self._loaders[name]()
+                self._models[name] = model
+                logger.info(f"Model '{name}' loaded successfully")
+        return model
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """
+        Load models in a background thread. The ready event is set once it finishes.
+
+        Args:
+            names (Iterable[str], optional): The models to load. Defaults to every registered model.
+
+        Returns:
+            threading.Thread: The warm-up thread.
+        """
+        names = list(names) if names is not None else list(self._loaders)
+        self.ready.clear()
+        thread = threading.Thread(target=self._warm_up, args=(names,), name='model-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up(self, names):
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Error warming up model '{name}': {e}")
+        self.ready.set()
+
+
+# The heavy libraries are imported inside the loaders so that importing this module is cheap
+def _load_spacy_model():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+def _load_bert_ner_pipeline():
+    from transformers import BertTokenizer, BertForTokenClassification, pipeline
+    tokenizer = BertTokenizer.from_pretrained(BERT_NER_MODEL)
+    model = BertForTokenClassification.from_pretrained(BERT_NER_MODEL, num_labels=2)
+    return pipeline("ner", model=model, tokenizer=tokenizer)
+
+
+def register_text_classifier(model_path: str) -> str:
+    """
+    Register a HuggingFace text-classification pipeline for the given model.
+
+    Args:
+        model_path (str): The model name or path.
+
+    Returns:
+        str: The name the pipeline is registered under.
+    """
+    name = f"text-classification:{model_path}"
+    if not model_registry.is_registered(name):
+        def _load_text_classifier():
+            from transformers import pipeline
+            return pipeline('text-classification', model=model_path)
+
+        model_registry.register(name, _load_text_classifier)
+    return name
+
+
+model_registry = ModelRegistry()
+model_registry.register('spacy', _load_spacy_model)
+model_registry.register('bert_ner', _load_bert_ner_pipeline)
@@ -0,0 +1,104 @@
+"""
+ner_service.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: ner_service.py
+Revised: [Add revised date]
+
+Description:
+This module implements the shared named entity recognition (NER) inference service.
+All keyword extraction in the process goes through one BERT NER pipeline taken from the
+model registry. Requests go through a DynamicBatcher: they wait on its bounded queue and are
+run by its single worker thread, which keeps the (not thread-safe) pipeline safe to use from
+concurrent request threads and applies back-pressure when the service is overloaded. The
+queue size and timeout come from the NER_* settings of the configuration.
+
+Classes:
+    NERService: A thread-safe, queue-backed service for NER keyword extraction.
+
+Usage:
+    Use the module-level ner_service instance to extract keywords from text.
+
+Example:
+    from app.services.ner_service import ner_service
+
+    keywords = ner_service.extract_keywords("Sample text for keyword extraction.")
+"""
+
+from concurrent.futures import Future
+from typing import List
+
+from app.log import AppLogger
+from app.services.batcher import DynamicBatcher
+from app.services.model_registry import model_registry
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+NER_QUEUE_SIZE = 64
+NER_TIMEOUT = 60
+
+
+class NERService:
+    """
+    A thread-safe, queue-backed service for NER keyword extraction.
+    """
+
+    def __init__(self, model_name: str = 'bert_ner', max_queue_size: int = NER_QUEUE_SIZE,
+                 timeout: float = NER_TIMEOUT):
+        """
+        Args:
+            model_name (str): The name of the NER pipeline in the model registry.
+            max_queue_size (int): The maximum number of requests waiting for the model.
+            timeout (float): Seconds to wait for a queue slot and for the result.
+        """
+        self.model_name = model_name
+        self.configure(max_queue_size, timeout)
+
+    def configure(self, max_queue_size: int = NER_QUEUE_SIZE, timeout: float = NER_TIMEOUT):
+        """
+        Replace the request queue with one of the given size. Requests already queued are still run.
+
+        Args:
+            max_queue_size (int): The maximum number of requests waiting for the model.
+            timeout (float): Seconds to wait for a queue slot and for the result.
+        """
+        self.timeout = timeout
+        # The pipeline is run one text at a time, so a batch holds a single request
+        self.batcher = DynamicBatcher(self._extract_batch, max_batch_size=1, max_wait_ms=0,
+                                      max_queue_size=max_queue_size, timeout=timeout, name='ner-service')
+
+    def _extract_batch(self, texts: List[str]) -> List[List[str]]:
+        ner_pipeline = model_registry.get(self.model_name)
+        return [[result['word'] for result in ner_pipeline(text) if result['entity'] == 'LABEL_1'] for text in texts]
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for keyword extraction.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            Future: A future resolving to the list of extracted keywords.
+
+        Raises:
+            RuntimeError: If the request queue stays full for longer than the timeout.
+        """
+        return self.batcher.submit(text)
+
+    def extract_keywords(self, text: str) -> List[str]:
+        """
+        Extract keywords from text using the shared BERT NER pipeline.
+
+        Args:
+            text (str): The input text.
+
+        Returns:
+            List[str]: A list of extracted keywords.
+        """
+        return self.batcher.process(text)
+
+
+ner_service = NERService()
@@ -0,0 +1,175 @@
+"""
+result_cache.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: result_cache.py
+Revised: [Add revised date]
+
+Description:
+This module implements a content-hash cache for resume analysis results.
+Results are keyed by the SHA-256 of the resume bytes, a hash of the job description, the
+model version and the taxonomy version. Because the versions are part of the key, changing
+the model or the skill vocabularies automatically stops old results from being served.
+The cache has an in-process LRU tier and a persistent tier backed by the AIResult table.
+
+Classes:
+    AnalysisCache: A two-tier (LRU + database) cache of analysis results.
+
+Usage:
+    Create an AnalysisCache, build a key with make_key and use get/put around the analysis.
+
+Example:
+    from app.services.result_cache import AnalysisCache
+
+    cache = AnalysisCache(max_size=1024)
+    key = cache.make_key(resume_bytes, job_description, model_version, taxonomy_version)
+    result = cache.get(key)
+    if result is None:
+        result = ai_service.analyze_resume(resume_text, job_description)
+        cache.put(key, result)
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from flask import has_app_context
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db_manager import db
+from app.log import AppLogger
+from app.models import AIResult
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+
+class AnalysisCache:
+    """
+    A two-tier (LRU + database) cache of analysis results.
+    """
+
+    def __init__(self, max_size: int = 1024, persistent: bool = True):
+        """
+        Args:
+            max_size (int): The maximum number of results kept in memory.
+            persistent (bool): Whether results are also stored in and read from the AIResult table.
+        """
+        self.max_size = max_size
+        self.persistent = persistent
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(resume_bytes: bytes, job_description: str, model_version: str, taxonomy_version: str) -> str:
+        """
+        Build the cache key for an analysis.
+
+        Args:
+            resume_bytes (bytes): The raw bytes of the resume file.
+            job_description (str): The job description text.
+            model_version (str): The version of the model and its scoring settings.
+            taxonomy_version (str): The version of the skill vocabularies.
+
+        Returns:
+            str: A hex SHA-256 digest identifying the analysis.
+        """
+        return AnalysisCache.make_key_for_hash(hashlib.sha256(resume_bytes).hexdigest(), job_description,
+                                               model_version, taxonomy_version)
+
+    @staticmethod
+    def make_key_for_hash(resume_hash: str, job_description: str, model_version: str, taxonomy_version: str) -> str:
+        """
+        Build the cache key for an analysis of a resume whose SHA-256 is already known, e.g. a stored upload.
+
+        Args:
+            resume_hash (str): The hex SHA-256 of the resume file.
+            job_description (str): The job description text.
+            model_version (str): The version of the model and its scoring settings.
+            taxonomy_version (str): The version of the skill vocabularies.
+
+        Returns:
+            str: The same key make_key builds from the bytes of the file.
+        """
+        job_hash = hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{resume_hash}:{job_hash}:{model_version}:{taxonomy_version}"
+                              .encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, result: dict):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a result, first in memory and then in the database.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict: The cached result, or None if it is not cached.
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        if self.persistent and has_app_context():
+            try:
+                ai_result = (AIResult.query.filter_by(cache_key=key)
+                             .order_by(AIResult.id.desc()).first())
+                if ai_result is not None:
+                    result = json.loads(ai_result.result_data)
+                    self._remember(key, result)
+                    with self._lock:
+                        self.hits += 1
+                    return result
+            except (SQLAlchemyError, ValueError) as e:
+                logger.error(f"Error reading cached analysis result: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict, file_id: Optional[int] = None) -> Optional[AIResult]:
+        """
+        Store a result in memory and, if persistent, add it to the AIResult table.
+
+        The row is only flushed, inside a savepoint, so the caller's transaction is neither committed
+        nor rolled back here; the caller commits the result together with its own changes.
+
+        Args:
+            key (str): The cache key.
+            result (dict): The analysis result. Must be JSON serializable.
+            file_id (int, optional): The uploaded file the result belongs to.
+
+        Returns:
+            AIResult: The stored row, or None if the result was only kept in memory.
+        """
+        self._remember(key, result)
+        if self.persistent and has_app_context():
+            try:
+                ai_result = AIResult(file_id=file_id, cache_key=key, result_data=json.dumps(result))
+                with db.session.begin_nested():
+                    db.session.add(ai_result)
+                return ai_result
+            except SQLAlchemyError as e:
+                logger.error(f"Error storing analysis result in the database: {e}")
+        return None
+
+    def clear(self):
+        """
+        Drop every result held in memory.
+        """
+        with self._lock:
+            self._entries.clear()
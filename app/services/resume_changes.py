@@ -0,0 +1,101 @@
+"""
+resume_changes.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: resume_changes.py
+Revised: [Add revised date]
+
+Description:
+This module finds the resumes stored, edited or deleted since an in-memory index last read them.
+Resumes are read by updated_at rather than by ID, since IDs are assigned when rows are inserted
+but become visible in commit order: a batch that commits late has lower IDs than rows already
+read. Each poll re-reads the resumes updated within a trailing window before the newest change
+seen, which must be longer than the longest transaction writing resumes, and compares their
+revision with the one already read. Deleted resumes leave no row to read, so the stored IDs are
+compared with the known ones every reconcile interval.
+
+Classes:
+    ResumeChanges: The resumes to (re)read and the resumes to drop.
+    ResumeChangeFeed: Tracks the revision of every resume an index has read.
+
+Usage:
+    Give each index its own ResumeChangeFeed and poll it when the index refreshes.
+
+Example:
+    from app.services.resume_changes import ResumeChangeFeed
+
+    feed = ResumeChangeFeed(window=60, reconcile_interval=60)
+    changes = feed.poll()
+    index.remove(changes.deleted)
+    index.load(changes.changed)
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from app.models import Resume
+
+# Seconds of changes before the newest one that every poll reads again
+REFRESH_WINDOW = 60
+# Seconds between two comparisons of the stored resume IDs with the known ones
+RECONCILE_INTERVAL = 60
+
+
+class ResumeChanges(NamedTuple):
+    """
+    The resumes to (re)read and the resumes to drop.
+
+    Attributes:
+        changed (List[int]): Resumes stored or edited since the last poll, in ID order.
+        deleted (List[int]): Resumes returned by an earlier poll that no longer exist.
+    """
+    changed: List[int]
+    deleted: List[int]
+
+
+class ResumeChangeFeed:
+    """
+    Tracks the revision of every resume an index has read.
+    """
+
+    def __init__(self, window: float = REFRESH_WINDOW, reconcile_interval: float = RECONCILE_INTERVAL):
+        """
+        Args:
+            window (float): Seconds of changes before the newest one that every poll reads again.
+            reconcile_interval (float): Seconds between two checks for deleted resumes.
+        """
+        self.window = timedelta(seconds=window)
+        self.reconcile_interval = reconcile_interval
+        self._revisions: Dict[int, int] = {}
+        self._newest: Optional[datetime] = None
+        self._reconciled_at = time.monotonic()
+
+    def poll(self) -> ResumeChanges:
+        """
+        Return the resumes that changed since the last poll. The first poll returns every resume.
+
+        Returns:
+            ResumeChanges: The changed and the deleted resumes.
+        """
+        query = Resume.query.with_entities(Resume.id, Resume.revision, Resume.updated_at)
+        if self._newest is not None:
+            query = query.filter(Resume.updated_at >= self._newest - self.window)
+
+        changed = []
+        for resume_id, revision, updated_at in query.order_by(Resume.id):
+            if self._revisions.get(resume_id) != revision:
+                self._revisions[resume_id] = revision
+                changed.append(resume_id)
+            if updated_at is not None and (self._newest is None or updated_at > self._newest):
+                self._newest = updated_at
+
+        deleted = []
+        if time.monotonic() - self._reconciled_at >= self.reconcile_interval:
+            stored = {resume_id for (resume_id,) in Resume.query.with_entities(Resume.id)}
+            deleted = sorted(resume_id for resume_id in self._revisions if resume_id not in stored)
+            for resume_id in deleted:
+                del self._revisions[resume_id]
+            self._reconciled_at = time.monotonic()
+        return ResumeChanges(changed, deleted)
@@ -0,0 +1,232 @@
+"""
+semantic_matching.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: semantic_matching.py
+Revised: [Add revised date]
+
+Description:
+This module implements semantic keyword matching with word vectors.
+Texts are embedded as the normalized mean of their word vectors, so "PostgreSQL" can count
+towards "SQL" and "worked closely with the team" towards "teamwork" even though neither
+appears verbatim. The word vectors are kept in one contiguous float32 array with their
+inverse norms computed once at startup, the vocabulary keywords are embedded once into a
+keyword matrix, and the vectors of resume and job description phrases are cached by content
+hash. Matching a text is then a single keyword-by-phrase similarity matrix product in NumPy.
+
+Classes:
+    WordVectors: A word vector table in a contiguous float32 array.
+    SemanticMatcher: Matches categorized keywords against phrases by cosine similarity.
+
+Usage:
+    Get the word vectors of the SpaCy model from the model registry ('word_vectors'), then
+    create a SemanticMatcher for the keyword vocabularies. ContentAnalyzer uses the shared one from
+    the model registry in its 'semantic' mode.
+
+Example:
+    from app.services.semantic_matching import SemanticMatcher, WordVectors
+
+    matcher = SemanticMatcher(WordVectors.from_spacy(nlp), {"hard_skills": ["SQL", "Python"]})
+    matcher.match_categories(["PostgreSQL administration"], threshold=0.6)
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.services.model_registry import model_registry
+
+# Words with the characters used in skill names, e.g. "c++", "c#" and "node.js"
+TOKEN_PATTERN = re.compile(r"[^\W_][\w+#.]*[\w+#]|[^\W_]")
+# Job descriptions are split into clauses, so each requirement is compared on its own
+CLAUSE_PATTERN = re.compile(r"[\n;:•,]|\.(?:\s|$)|\band\b|\bor\b", re.IGNORECASE)
+SEMANTIC_MATCH_THRESHOLD = 0.7
+EMBEDDING_CACHE_SIZE = 8192
+
+
+def split_clauses(text: str) -> List[str]:
+    """
+    Splits a text into the clauses compared one by one in semantic matching.
+
+    Args:
+        text (str): The text to split, e.g. a job description.
+
+    Returns:
+        List[str]: The non-empty clauses.
+    """
+    return [clause.strip() for clause in CLAUSE_PATTERN.split(text) if clause and clause.strip()]
+
+
+class WordVectors:
+    """
+    A word vector table in a contiguous float32 array.
+    """
+
+    def __init__(self, data: np.ndarray, key2row: Mapping[Hashable, int],
+                 key_of: Callable[[str], Hashable] = None):
+        """
+        Args:
+            data (np.ndarray): The vectors, one row per entry. Not copied if already contiguous float32.
+            key2row (Mapping): Maps the key of each word to its row in data.
+            key_of (Callable[[str], Hashable], optional): Turns a word into its key. Defaults to the word itself.
+        """
+        self.data = np.ascontiguousarray(data, dtype=np.float32)
+        norms = np.linalg.norm(self.data, axis=1)
+        # Rows without a vector keep a zero vector instead of dividing by zero
+        self.inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0).astype(np.float32)
+        self.key2row = key2row
+        self.key_of = key_of or (lambda word: word)
+
+    @property
+    def dimensions(self) -> int:
+        return self.data.shape[1]
+
+    @classmethod
+    def from_spacy(cls, nlp) -> 'WordVectors':
+        """
+        Use the vector table of a SpaCy model, without copying it.
+
+        Args:
+            nlp (Language): A SpaCy model with word vectors, e.g. en_core_web_lg.
+
+        Returns:
+            WordVectors: The vector table of the model.
+        """
+        from spacy.strings import hash_string
+        vectors = nlp.vocab.vectors
+        return cls(vectors.data, vectors.key2row, hash_string)
+
+    @classmethod
+    def from_words(cls, words: Mapping[str, Sequence[float]]) -> 'WordVectors':
+        """
+        Build a table from a mapping of words to vectors.
+
+        Args:
+            words (Mapping[str, Sequence[float]]): The vector of each word.
+
+        Returns:
+            WordVectors: The vector table.
+        """
+        return cls(np.array(list(words.values()), dtype=np.float32),
+                   {word: row for row, word in enumerate(words)})
+
+    def _row(self, token: str) -> int:
+        row = self.key2row.get(self.key_of(token), -1)
+        if row < 0 and not token.islower():
+            row = self.key2row.get(self.key_of(token.lower()), -1)
+        return row
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a text as the normalized mean of the unit vectors of its words.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            np.ndarray: A unit float32 vector, or zeros if none of the words has a vector.
+        """
+        rows = [row for row in map(self._row, TOKEN_PATTERN.findall(text)) if row >= 0]
+        if not rows:
+            return np.zeros(self.dimensions, dtype=np.float32)
+        rows = np.asarray(rows)
+        vector = (self.data[rows] * self.inverse_norms[rows, None]).sum(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+class SemanticMatcher:
+    """
+    Matches categorized keywords against phrases by cosine similarity.
+    """
+
+    def __init__(self, word_vectors: WordVectors, vocabularies: Dict[str, Iterable[str]],
+                 cache_size: int = EMBEDDING_CACHE_SIZE):
+        """
+        Embed the keywords of every vocabulary once.
+
+        Args:
+            word_vectors (WordVectors): The word vector table.
+            vocabularies (Dict[str, Iterable[str]]): Mapping of category name to its keywords.
+            cache_size (int): The number of phrase vectors kept in memory.
+        """
+        self.word_vectors = word_vectors
+        self.dimensions = word_vectors.dimensions
+        self.categories: List[str] = list(vocabularies)
+        self.keywords: List[Tuple[str, str]] = [(category, keyword) for category, keywords in vocabularies.items()
+                                                for keyword in keywords]
+        self.keyword_vectors = np.ascontiguousarray(
+            np.stack([word_vectors.embed(keyword) for _, keyword in self.keywords]), dtype=np.float32)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed(self, phrases: Sequence[str]) -> np.ndarray:
+        """
+        Embed phrases, reusing the vectors of phrases seen before.
+
+        Args:
+            phrases (Sequence[str]): The phrases, e.g. resume noun chunks or job description clauses.
+
+        Returns:
+            np.ndarray: One unit vector per phrase, shape (phrases, dimensions).
+        """
+        vectors = np.zeros((len(phrases), self.dimensions), dtype=np.float32)
+        for index, phrase in enumerate(phrases):
+            key = hashlib.sha256(phrase.encode('utf-8')).hexdigest()
+            with self._lock:
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+            if vector is None:
+                vector = self.word_vectors.embed(phrase)
+                with self._lock:
+                    self._cache[key] = vector
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            vectors[index] = vector
+        return vectors
+
+    def similarities(self, phrases: Sequence[str]) -> np.ndarray:
+        """
+        Return the best similarity of every keyword to any of the phrases.
+
+        Args:
+            phrases (Sequence[str]): The phrases to compare the keywords with.
+
+        Returns:
+            np.ndarray: One cosine similarity per keyword, in the order of self.keywords.
+        """
+        if not phrases:
+            return np.zeros(len(self.keywords), dtype=np.float32)
+        return (self.keyword_vectors @ self.embed(phrases).T).max(axis=1)
+
+    def match_categories(self, phrases: Sequence[str], threshold: float = SEMANTIC_MATCH_THRESHOLD
+                         ) -> Dict[str, Set[str]]:
+        """
+        Return the keywords similar to any of the phrases, grouped by category.
+
+        Args:
+            phrases (Sequence[str]): The phrases to compare the keywords with.
+            threshold (float): The lowest cosine similarity that counts as a match.
+
+        Returns:
+            Dict[str, Set[str]]: Mapping of every category to the keywords matched by the phrases.
+        """
+        matched: Dict[str, Set[str]] = {category: set() for category in self.categories}
+        for index in np.flatnonzero(self.similarities(phrases) >= threshold):
+            category, keyword = self.keywords[index]
+            matched[category].add(keyword)
+        return matched
+
+
+def _load_word_vectors():
+    return WordVectors.from_spacy(model_registry.get('spacy'))
+
+
+model_registry.register('word_vectors', _load_word_vectors)
@@ -0,0 +1,482 @@
+"""
+similarity_index.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: similarity_index.py
+Revised: [Add revised date]
+
+Description:
+This module implements an approximate nearest-neighbour index over resume embeddings.
+Each resume is embedded as the normalized mean of its word vectors. The vectors are
+appended to a memory-mapped float32 file, so the index survives restarts and is never
+loaded into memory at once. Once enough resumes are indexed, the vectors are clustered
+with spherical k-means into inverted lists (IVF). A query only scans the lists of the
+centroids closest to it, which keeps "find similar resumes" at a few milliseconds for
+100k resumes. Lists are retrained each time the corpus doubles. The index is refreshed
+incrementally from a ResumeChangeFeed: each refresh embeds only the resumes stored or edited
+since the revision stored with their row, overwriting the row of an edited resume, and
+masks the rows of deleted resumes out of every query.
+Writers in any process are serialized by an exclusive lock on a file of the index directory,
+so concurrent refreshes, e.g. in several Celery worker processes, never lose or repeat rows.
+
+Classes:
+    SimilarResume: A resume and its cosine similarity to the query.
+    ResumeVectorIndex: A persistent IVF index over resume embeddings.
+
+Usage:
+    Use the ResumeVectorIndex created by the application factory (current_app.similarity_index).
+    The update_similarity_index task applies the resume changes after uploads and ingestions.
+
+Example:
+    from app.services.similarity_index import ResumeVectorIndex
+
+    index = ResumeVectorIndex('instance/similarity_index')
+    index.refresh()
+    for similar in index.similar_to(resume_id=42, top_k=5):
+        print(similar.resume_id, similar.score)
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+from app.log import AppLogger
+from app.models import Resume
+from app.services.model_registry import model_registry
+from app.services.resume_changes import RECONCILE_INTERVAL, REFRESH_WINDOW, ResumeChangeFeed
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+# Brute force is exact and fast enough below this many resumes
+IVF_MIN_TRAIN_SIZE = 4096
+IVF_MAX_LISTS = 1024
+IVF_TRAIN_SAMPLE = 50000
+IVF_TRAIN_ITERATIONS = 10
+IVF_DEFAULT_PROBES = 8
+INITIAL_CAPACITY = 1024
+REFRESH_BATCH_SIZE = 500
+# The resume ID of the rows of deleted resumes
+REMOVED_ID = -1
+# Rows multiplied at a time when assigning vectors to lists, to bound temporary memory
+ASSIGN_CHUNK_SIZE = 8192
+
+
+class SimilarResume(NamedTuple):
+    """
+    A resume and its cosine similarity to the query.
+
+    Attributes:
+        resume_id (int): The ID of the resume.
+        score (float): The cosine similarity, from -1 to 1.
+    """
+    resume_id: int
+    score: float
+
+
+def _default_embed(text: str) -> np.ndarray:
+    return model_registry.get('word_vectors').embed(text)
+
+
+class ResumeVectorIndex:
+    """
+    A persistent IVF index over resume embeddings.
+
+    The files under the index directory are written by one process at a time, which holds an
+    exclusive lock on its 'write.lock' file; other processes reopen them when they change.
+    Each resume has at most one row, which stores the revision it was embedded from.
+    """
+
+    def __init__(self, directory: str, embed: Optional[Callable[[str], np.ndarray]] = None,
+                 probes: int = IVF_DEFAULT_PROBES, min_train_size: int = IVF_MIN_TRAIN_SIZE,
+                 refresh_window: float = REFRESH_WINDOW, reconcile_interval: float = RECONCILE_INTERVAL):
+        """
+        Args:
+            directory (str): The directory the index files are stored in.
+            embed (Callable[[str], np.ndarray], optional): Embeds a resume text. Defaults to the
+                word vectors of the SpaCy model.
+            probes (int): The number of inverted lists scanned per query.
+            min_train_size (int): The number of resumes from which queries use inverted lists.
+            refresh_window (float): Seconds of resume changes before the newest one that every refresh reads again.
+            reconcile_interval (float): Seconds between two checks for deleted resumes.
+        """
+        self.directory = directory
+        self.embed = embed or _default_embed
+        self.probes = probes
+        self.min_train_size = min_train_size
+        self._changes = ResumeChangeFeed(refresh_window, reconcile_interval)
+        self._refresh_lock = threading.Lock()
+        self._lock = threading.RLock()
+        # Nesting depth of _writing in the thread holding _lock; the file lock is held while above 0
+        self._write_depth = 0
+        self._lock_file = None
+        self._meta = None
+        self._meta_mtime = None
+        self._vectors = None
+        self._ids = None
+        self._revisions = None
+        self._lists = None
+        self._centroids = None
+        self._list_order = None
+        self._list_offsets = None
+
+    # Storage
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _writing(self):
+        """
+        Hold the write lock of the index, shared by the threads and processes using the directory,
+        and load the latest state written by the previous holder.
+        """
+        with self._lock:
+            if self._write_depth == 0:
+                os.makedirs(self.directory, exist_ok=True)
+                self._lock_file = open(self._path('write.lock'), 'a+b')
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+                    else:
+                        self._lock_file.seek(0)
+                        while True:
+                            try:
+                                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                                break
+                            except OSError:
+                                # LK_LOCK gives up after ten seconds; keep waiting like flock
+                                continue
+                except Exception:
+                    self._lock_file.close()
+                    self._lock_file = None
+                    raise
+                # The modification time may not have changed if another process wrote within its resolution
+                self._meta_mtime = None
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+                if self._write_depth == 0:
+                    # Closing the file releases the lock
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _write_meta(self):
+        for memmap in (self._vectors, self._ids, self._revisions, self._lists):
+            memmap.flush()
+        temp_path = self._path(f'meta.json.{os.getpid()}.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(self._meta, f)
+        # The row count is published last and atomically, so readers never see unwritten rows
+        os.replace(temp_path, self._path('meta.json'))
+        self._meta_mtime = os.stat(self._path('meta.json')).st_mtime_ns
+
+    def _open_arrays(self):
+        capacity = self._meta['capacity']
+        dimensions = self._meta['dimensions']
+        self._vectors = np.memmap(self._path('vectors.f32'), dtype=np.float32, mode='r+',
+                                  shape=(capacity, dimensions))
+        self._ids = np.memmap(self._path('ids.i64'), dtype=np.int64, mode='r+', shape=(capacity,))
+        self._revisions = np.memmap(self._path('revisions.i64'), dtype=np.int64, mode='r+', shape=(capacity,))
+        self._lists = np.memmap(self._path('lists.i32'), dtype=np.int32, mode='r+', shape=(capacity,))
+        centroids_path = self._path('centroids.npy')
+        self._centroids = np.load(centroids_path) if self._meta['lists'] and os.path.exists(centroids_path) else None
+        self._list_order = None
+
+    def _resize_files(self, capacity: int):
+        dimensions = self._meta['dimensions']
+        for name, row_size in (('vectors.f32', 4 * dimensions), ('ids.i64', 8), ('revisions.i64', 8),
+                               ('lists.i32', 4)):
+            with open(self._path(name), 'ab') as f:
+                f.truncate(capacity * row_size)
+
+    def _load(self) -> bool:
+        meta_path = self._path('meta.json')
+        if not os.path.exists(meta_path):
+            return False
+        mtime = os.stat(meta_path).st_mtime_ns
+        if mtime != self._meta_mtime:
+            with open(meta_path) as f:
+                self._meta = json.load(f)
+            self._meta_mtime = mtime
+            self._open_arrays()
+        return True
+
+    def _create(self, dimensions: int):
+        os.makedirs(self.directory, exist_ok=True)
+        self._meta = {'dimensions': dimensions, 'count': 0, 'removed': 0, 'capacity': INITIAL_CAPACITY,
+                      'lists': 0, 'trained_count': 0}
+        self._resize_files(INITIAL_CAPACITY)
+        self._open_arrays()
+        self._write_meta()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._meta['count'] - self._meta['removed'] if self._load() else 0
+
+    def _rows_of(self, resume_ids: np.ndarray) -> np.ndarray:
+        # The row of each resume, or -1 if it is not indexed
+        ids = np.asarray(self._ids[:self._meta['count']])
+        if not len(ids):
+            return np.full(len(resume_ids), -1)
+        order = np.argsort(ids, kind='stable')
+        rows = order[np.minimum(np.searchsorted(ids, resume_ids, sorter=order), len(ids) - 1)]
+        return np.where(ids[rows] == resume_ids, rows, -1)
+
+    # Writing
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def _upsert(self, resume_ids: np.ndarray, revisions: np.ndarray, vectors: np.ndarray):
+        rows = self._rows_of(resume_ids)
+        # Another writer may have stored a later revision since these were read
+        keep = (rows < 0) | (np.asarray(self._revisions[np.maximum(rows, 0)]) <= revisions) | (revisions == 0)
+        rows, resume_ids, revisions, vectors = rows[keep], resume_ids[keep], revisions[keep], vectors[keep]
+
+        count = self._meta['count']
+        new = rows < 0
+        needed = count + int(new.sum())
+        if needed > self._meta['capacity']:
+            capacity = self._meta['capacity']
+            while capacity < needed:
+                capacity *= 2
+            # Doubling keeps appends amortized constant time
+            self._vectors = self._ids = self._revisions = self._lists = None
+            self._resize_files(capacity)
+            self._meta['capacity'] = capacity
+            self._open_arrays()
+
+        rows[new] = np.arange(count, needed)
+        self._vectors[rows] = vectors
+        self._ids[rows] = resume_ids
+        self._revisions[rows] = revisions
+        self._lists[rows] = self._assign(vectors) if self._centroids is not None else -1
+        self._meta['count'] = needed
+        self._list_order = None
+
+    def add(self, resume_ids: List[int], texts: List[str], revisions: Optional[List[int]] = None):
+        """
+        Embed resumes and store them in the index, replacing the rows of resumes already indexed.
+
+        Args:
+            resume_ids (List[int]): The IDs of the resumes.
+            texts (List[str]): The text of each resume.
+            revisions (List[int], optional): The revision of each resume. Rows stored without
+                one are embedded again by the next refresh.
+        """
+        if not resume_ids:
+            return
+        vectors = self._normalize(np.stack([np.asarray(self.embed(text), dtype=np.float32) for text in texts]))
+        revisions = np.zeros(len(resume_ids), dtype=np.int64) if revisions is None else revisions
+        with self._writing():
+            if not self._load():
+                self._create(vectors.shape[1])
+            self._upsert(np.asarray(resume_ids, dtype=np.int64), np.asarray(revisions, dtype=np.int64), vectors)
+            live = self._meta['count'] - self._meta['removed']
+            if live >= max(self.min_train_size, 2 * self._meta['trained_count']):
+                self._train()
+            self._write_meta()
+
+    def remove(self, resume_ids: List[int]):
+        """
+        Mask resumes out of every query.
+
+        Args:
+            resume_ids (List[int]): The IDs of the resumes.
+        """
+        if not resume_ids:
+            return
+        with self._writing():
+            if not self._load():
+                return
+            rows = self._rows_of(np.asarray(resume_ids, dtype=np.int64))
+            rows = rows[rows >= 0]
+            if not len(rows):
+                return
+            self._ids[rows] = REMOVED_ID
+            self._lists[rows] = -1
+            self._meta['removed'] += len(rows)
+            self._list_order = None
+            self._write_meta()
+
+    def _stale(self, resume_ids: List[int], revisions: List[int]) -> List[bool]:
+        # Whether the stored row of each resume is missing or older than its revision
+        with self._lock:
+            if not self._load():
+                return [True] * len(resume_ids)
+            rows = self._rows_of(np.asarray(resume_ids, dtype=np.int64))
+            stored = np.where(rows >= 0, np.asarray(self._revisions[np.maximum(rows, 0)]), -1)
+            return list(stored != np.asarray(revisions, dtype=np.int64))
+
+    def refresh(self) -> int:
+        """
+        Embed the resumes stored or edited since the last refresh and remove the deleted ones.
+
+        Every process reads all resume revisions on its first refresh, but only the resumes
+        whose stored row is older are embedded again.
+
+        Returns:
+            int: The number of resumes embedded.
+        """
+        embedded = 0
+        with self._refresh_lock:
+            changes = self._changes.poll()
+            self.remove(changes.deleted)
+            for start in range(0, len(changes.changed), REFRESH_BATCH_SIZE):
+                resume_ids = changes.changed[start:start + REFRESH_BATCH_SIZE]
+                revisions = dict(Resume.query.with_entities(Resume.id, Resume.revision)
+                                 .filter(Resume.id.in_(resume_ids)).all())
+                resume_ids = [resume_id for resume_id in resume_ids if resume_id in revisions]
+                stale = [resume_id for resume_id, is_stale
+                         in zip(resume_ids, self._stale(resume_ids, [revisions[i] for i in resume_ids])) if is_stale]
+                if not stale:
+                    continue
+                rows = (Resume.query.with_entities(Resume.id, Resume.revision, Resume.content)
+                        .filter(Resume.id.in_(stale)).order_by(Resume.id).all())
+                self.add([resume_id for resume_id, _, _ in rows], [content for _, _, content in rows],
+                         [revision for _, revision, _ in rows])
+                embedded += len(rows)
+        if embedded or changes.deleted:
+            logger.info(f"Indexed {embedded} and removed {len(changes.deleted)} resumes for similarity search "
+                        f"({len(self)} in total)")
+        return embedded
+
+    # Inverted lists
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK_SIZE):
+            chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK_SIZE])
+            lists[start:start + len(chunk)] = (chunk @ self._centroids.T).argmax(axis=1)
+        return lists
+
+    def _train(self):
+        count = self._meta['count']
+        live_rows = np.flatnonzero(np.asarray(self._ids[:count]) != REMOVED_ID)
+        list_count = int(min(IVF_MAX_LISTS, max(1, np.sqrt(len(live_rows)))))
+        rng = np.random.default_rng(count)
+        sample_rows = np.sort(rng.choice(live_rows, size=min(len(live_rows), IVF_TRAIN_SAMPLE), replace=False))
+        sample = np.asarray(self._vectors[sample_rows])
+
+        # Spherical k-means: centroids are kept at unit length, so similarity is a dot product
+        centroids = sample[rng.choice(len(sample), size=list_count, replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assignments = (sample @ centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            empty = ~sums.any(axis=1)
+            # An empty list is reseeded with a random sample instead of being dropped
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = self._normalize(sums)
+
+        self._centroids = centroids
+        temp_path = self._path(f'centroids.{os.getpid()}.tmp.npy')
+        np.save(temp_path, centroids)
+        os.replace(temp_path, self._path('centroids.npy'))
+        lists = self._assign(self._vectors[:count])
+        # Removed rows stay out of every list
+        lists[np.asarray(self._ids[:count]) == REMOVED_ID] = -1
+        self._lists[:count] = lists
+        self._meta['lists'] = list_count
+        self._meta['trained_count'] = len(live_rows)
+        self._list_order = None
+        logger.info(f"Trained {list_count} inverted lists over {len(live_rows)} resume vectors")
+
+    def _inverted_lists(self):
+        if self._list_order is None:
+            lists = np.asarray(self._lists[:self._meta['count']])
+            self._list_order = np.argsort(lists, kind='stable')
+            self._list_offsets = np.searchsorted(lists[self._list_order], np.arange(self._meta['lists'] + 1))
+        return self._list_order, self._list_offsets
+
+    # Queries
+
+    def search(self, vector: np.ndarray, top_k: int = 10, exclude: Optional[int] = None) -> List[SimilarResume]:
+        """
+        Return the resumes most similar to a vector.
+
+        Args:
+            vector (np.ndarray): The query vector.
+            top_k (int): The number of resumes to return.
+            exclude (int, optional): A resume ID left out of the results, e.g. the query resume.
+
+        Returns:
+            List[SimilarResume]: The most similar resumes, highest score first.
+        """
+        query = self._normalize(np.asarray(vector, dtype=np.float32))
+        with self._lock:
+            if not self._load() or not self._meta['count'] or top_k <= 0:
+                return []
+            count = self._meta['count']
+            if self._centroids is None:
+                rows = np.arange(count)
+            else:
+                order, offsets = self._inverted_lists()
+                probes = min(self.probes, len(self._centroids))
+                nearest = np.argpartition(-(self._centroids @ query), probes - 1)[:probes]
+                rows = np.concatenate([order[offsets[list_id]:offsets[list_id + 1]] for list_id in nearest])
+                rows.sort()  # Sequential reads from the memory-mapped file
+            scores = np.asarray(self._vectors[rows]) @ query
+            resume_ids = np.asarray(self._ids[rows])
+
+        keep = resume_ids != REMOVED_ID
+        if exclude is not None:
+            keep &= resume_ids != exclude
+        scores, resume_ids = scores[keep], resume_ids[keep]
+        top_k = min(top_k, len(scores))
+        if not top_k:
+            return []
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.lexsort((resume_ids[best], -scores[best]))]
+        return [SimilarResume(int(resume_ids[row]), float(scores[row])) for row in best]
+
+    def vector_of(self, resume_id: int) -> Optional[np.ndarray]:
+        """
+        Return the stored vector of a resume.
+
+        Args:
+            resume_id (int): The ID of the resume.
+
+        Returns:
+            np.ndarray: The vector, or None if the resume is not indexed.
+        """
+        with self._lock:
+            if not self._load():
+                return None
+            rows = np.flatnonzero(np.asarray(self._ids[:self._meta['count']]) == resume_id)
+            return np.array(self._vectors[rows[0]]) if len(rows) else None
+
+    def similar_to(self, resume_id: int, top_k: int = 10, text: Optional[str] = None) -> List[SimilarResume]:
+        """
+        Return the resumes most similar to a resume.
+
+        Args:
+            resume_id (int): The ID of the resume.
+            top_k (int): The number of resumes to return.
+            text (str, optional): The text of the resume, embedded if the resume is not indexed yet.
+
+        Returns:
+            List[SimilarResume]: The most similar other resumes, highest score first.
+        """
+        vector = self.vector_of(resume_id)
+        if vector is None:
+            if text is None:
+                return []
+            vector = self.embed(text)
+        return self.search(vector, top_k=top_k, exclude=resume_id)
@@ -0,0 +1,320 @@
+"""
+skill_index.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: skill_index.py
+Revised: [Add revised date]
+
+Description:
+This module records the skills found in resumes and searches resumes by skill.
+The hard skills found in a resume are stored as ResumeSkill rows when the resume is stored.
+An in-memory inverted index maps each skill to the sorted array of the resumes that have it,
+and boolean queries such as "Python AND AWS AND NOT Java" are evaluated with bitmap AND, OR
+and NOT over those postings, so a query over the whole corpus takes milliseconds. The mappings
+of a resume are written together with its content, so on refresh the index reads the mappings
+of the resumes stored or edited since its last refresh, and drops the deleted resumes.
+
+Classes:
+    SkillQueryError: Raised when a skill query cannot be parsed.
+    SkillIndex: An inverted index from skills to resumes with boolean queries.
+
+Functions:
+    extract_skills: Returns the hard skills mentioned in a text.
+    record_resume_skills: Stores the ResumeSkill rows of resumes in the session.
+
+Usage:
+    Call record_resume_skills whenever the content of resumes is stored, and query the SkillIndex created by
+    the application factory (current_app.skill_index).
+
+Example:
+    from app.services.skill_index import SkillIndex
+
+    index = SkillIndex()
+    resume_ids = index.query("(Python OR Java) AND AWS AND NOT PHP")
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+from app.db_manager import db
+from app.log import AppLogger
+from app.models import ResumeSkill, Skill
+from app.services.content_analysis import KEYWORD_MATCHER
+from app.services.resume_changes import RECONCILE_INTERVAL, REFRESH_WINDOW, ResumeChangeFeed
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+SKILL_CATEGORY = 'hard_skills'
+# Resumes whose mappings are read per database round trip when the index catches up
+REFRESH_BATCH_SIZE = 1000
+
+# Operators are upper case so skill names like "Scrum and Kanban" are not split
+_QUERY_TOKEN = re.compile(r'\(|\)|\bAND\b|\bOR\b|\bNOT\b')
+
+
+class SkillQueryError(ValueError):
+    """
+    Raised when a skill query cannot be parsed.
+    """
+
+
+def extract_skills(text: str) -> Set[str]:
+    """
+    Returns the hard skills mentioned in a text.
+
+    Args:
+        text (str): The resume text.
+
+    Returns:
+        Set[str]: The skills as declared in the vocabulary.
+    """
+    return {match.keyword for match in KEYWORD_MATCHER.iter_matches(text) if match.category == SKILL_CATEGORY}
+
+
+def record_resume_skills(resumes: Iterable[Tuple[int, str]]) -> int:
+    """
+    Stores the ResumeSkill rows of resumes in the session.
+
+    Missing Skill rows are created, and the mappings of skills a resume no longer mentions are
+    deleted. The caller commits, so the mappings are stored in the same transaction as the
+    content of the resumes.
+
+    Args:
+        resumes (Iterable[Tuple[int, str]]): The ID and text of each resume.
+
+    Returns:
+        int: The number of ResumeSkill rows added.
+    """
+    skills_by_resume = {resume_id: extract_skills(text) for resume_id, text in resumes}
+    if not skills_by_resume:
+        return 0
+    existing = {(resume_id, skill_id): mapping_id for mapping_id, resume_id, skill_id
+                in db.session.query(ResumeSkill.id, ResumeSkill.resume_id, ResumeSkill.skill_id)
+                .filter(ResumeSkill.resume_id.in_(list(skills_by_resume))).all()}
+    names = set().union(*skills_by_resume.values())
+
+    skills = {}
+    if names:
+        for skill in Skill.query.filter(Skill.name.in_(names)).order_by(Skill.id).all():
+            skills.setdefault(skill.name, skill)
+        missing = [Skill(name=name) for name in sorted(names - set(skills))]
+        db.session.add_all(missing)
+        db.session.flush()
+        skills.update((skill.name, skill) for skill in missing)
+
+    wanted = {(resume_id, skills[name].id) for resume_id, resume_skills in skills_by_resume.items()
+              for name in resume_skills}
+    stale = [mapping_id for key, mapping_id in existing.items() if key not in wanted]
+    if stale:
+        ResumeSkill.query.filter(ResumeSkill.id.in_(stale)).delete(synchronize_session=False)
+    mappings = [ResumeSkill(resume_id=resume_id, skill_id=skill_id)
+                for resume_id, skill_id in sorted(wanted) if (resume_id, skill_id) not in existing]
+    db.session.add_all(mappings)
+    return len(mappings)
+
+
+class SkillIndex:
+    """
+    An inverted index from skills to resumes with boolean queries.
+    """
+
+    def __init__(self, refresh_window: float = REFRESH_WINDOW, reconcile_interval: float = RECONCILE_INTERVAL):
+        """
+        Args:
+            refresh_window (float): Seconds of resume changes that every refresh reads again.
+            reconcile_interval (float): Seconds between two checks for deleted resumes.
+        """
+        self._postings: Dict[int, np.ndarray] = {}
+        self._skill_ids: Dict[str, List[int]] = {}
+        self._resume_ids = np.zeros(0, dtype=np.int64)
+        self._resume_skills: Dict[int, Tuple[int, ...]] = {}
+        self._changes = ResumeChangeFeed(refresh_window, reconcile_interval)
+        self._lock = threading.Lock()
+
+    def _replace(self, resume_skills: Dict[int, Tuple[int, ...]], deleted: Iterable[int]):
+        removed: Dict[int, List[int]] = {}
+        added: Dict[int, List[int]] = {}
+        for resume_id in deleted:
+            for skill_id in self._resume_skills.pop(resume_id, ()):
+                removed.setdefault(skill_id, []).append(resume_id)
+        for resume_id, skill_ids in resume_skills.items():
+            previous = set(self._resume_skills.get(resume_id, ()))
+            for skill_id in previous.difference(skill_ids):
+                removed.setdefault(skill_id, []).append(resume_id)
+            for skill_id in set(skill_ids).difference(previous):
+                added.setdefault(skill_id, []).append(resume_id)
+            if skill_ids:
+                self._resume_skills[resume_id] = skill_ids
+            else:
+                self._resume_skills.pop(resume_id, None)
+
+        # Only the postings of the skills that changed are rebuilt; they stay sorted and free of duplicates
+        for skill_id in set(removed) | set(added):
+            postings = self._postings.get(skill_id, np.zeros(0, np.int64))
+            if skill_id in removed:
+                postings = np.setdiff1d(postings, np.array(removed[skill_id], dtype=np.int64), assume_unique=True)
+            if skill_id in added:
+                postings = np.union1d(postings, np.array(added[skill_id], dtype=np.int64))
+            if len(postings):
+                self._postings[skill_id] = postings
+            else:
+                self._postings.pop(skill_id, None)
+
+        self._resume_ids = np.setdiff1d(np.union1d(self._resume_ids, np.array(list(resume_skills), dtype=np.int64)),
+                                        np.array(list(deleted), dtype=np.int64), assume_unique=True)
+
+    def refresh(self) -> int:
+        """
+        Read the skills of the resumes stored or edited since the last refresh and drop the deleted resumes.
+
+        Returns:
+            int: The number of resumes whose skills were read.
+        """
+        with self._lock:
+            changes = self._changes.poll()
+            self._replace({}, changes.deleted)
+            for start in range(0, len(changes.changed), REFRESH_BATCH_SIZE):
+                batch = changes.changed[start:start + REFRESH_BATCH_SIZE]
+                skills_by_resume: Dict[int, List[int]] = {resume_id: [] for resume_id in batch}
+                for resume_id, skill_id, name in (db.session.query(ResumeSkill.resume_id, Skill.id, Skill.name)
+                                                  .join(Skill, ResumeSkill.skill_id == Skill.id)
+                                                  .filter(ResumeSkill.resume_id.in_(batch))):
+                    skills_by_resume[resume_id].append(skill_id)
+                    skill_ids = self._skill_ids.setdefault(name.lower(), [])
+                    if skill_id not in skill_ids:
+                        skill_ids.append(skill_id)
+                self._replace({resume_id: tuple(sorted(skill_ids))
+                               for resume_id, skill_ids in skills_by_resume.items()}, ())
+        if changes.changed or changes.deleted:
+            logger.info(f"Indexed the skills of {len(changes.changed)} resumes and removed {len(changes.deleted)} "
+                        f"({len(self._postings)} skills)")
+        return len(changes.changed)
+
+    def resume_ids(self, skill: str) -> np.ndarray:
+        """
+        Return the resumes that have a skill.
+
+        Args:
+            skill (str): The skill name, in any case.
+
+        Returns:
+            np.ndarray: The sorted resume IDs.
+        """
+        postings = [self._postings[skill_id] for skill_id in self._skill_ids.get(skill.strip().lower(), [])
+                    if skill_id in self._postings]
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return postings[0] if len(postings) == 1 else np.unique(np.concatenate(postings))
+
+    def query(self, expression: str, refresh: bool = True) -> np.ndarray:
+        """
+        Return the resumes matching a boolean skill query.
+
+        Skills are combined with AND, OR and NOT (upper case) and grouped with parentheses;
+        AND binds tighter than OR. Unknown skills match no resume.
+
+        Args:
+            expression (str): The query, e.g. "Python AND AWS AND NOT Java".
+            refresh (bool): Whether to apply the resume changes in the database first.
+
+        Returns:
+            np.ndarray: The sorted IDs of the matching resumes.
+
+        Raises:
+            SkillQueryError: If the query is malformed.
+        """
+        tokens = self._tokenize(expression)
+        if not tokens:
+            raise SkillQueryError("The query is empty")
+        if refresh:
+            self.refresh()
+
+        with self._lock:
+            universe = self._resume_ids
+            size = int(universe[-1]) + 1 if len(universe) else 0
+            parser = _QueryParser(tokens, lambda skill: self._bitmap(self.resume_ids(skill), size),
+                                  self._bitmap(universe, size))
+            bitmap = parser.parse()
+        return np.flatnonzero(bitmap)
+
+    @staticmethod
+    def _bitmap(resume_ids: np.ndarray, size: int) -> np.ndarray:
+        bitmap = np.zeros(size, dtype=bool)
+        bitmap[resume_ids[resume_ids < size]] = True
+        return bitmap
+
+    @staticmethod
+    def _tokenize(expression: str) -> List[str]:
+        tokens = []
+        position = 0
+        for operator in _QUERY_TOKEN.finditer(expression):
+            name = expression[position:operator.start()].strip()
+            if name:
+                tokens.append(name)
+            tokens.append(operator.group())
+            position = operator.end()
+        name = expression[position:].strip()
+        if name:
+            tokens.append(name)
+        return tokens
+
+
+class _QueryParser:
+    # Recursive descent over: expression := term (OR term)*, term := factor (AND factor)*,
+    # factor := NOT factor | ( expression ) | skill
+    OPERATORS = ('AND', 'OR', 'NOT', '(', ')')
+
+    def __init__(self, tokens: List[str], skill_bitmap, universe: np.ndarray):
+        self.tokens = tokens
+        self.position = 0
+        self.skill_bitmap = skill_bitmap
+        self.universe = universe
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self):
+        token = self._peek()
+        if token is None:
+            raise SkillQueryError("The query ends unexpectedly")
+        self.position += 1
+        return token
+
+    def parse(self) -> np.ndarray:
+        bitmap = self._expression()
+        if self._peek() is not None:
+            raise SkillQueryError(f"Unexpected '{self._peek()}' in the query")
+        return bitmap
+
+    def _expression(self) -> np.ndarray:
+        bitmap = self._term()
+        while self._peek() == 'OR':
+            self._take()
+            bitmap = bitmap | self._term()
+        return bitmap
+
+    def _term(self) -> np.ndarray:
+        bitmap = self._factor()
+        while self._peek() == 'AND':
+            self._take()
+            bitmap = bitmap & self._factor()
+        return bitmap
+
+    def _factor(self) -> np.ndarray:
+        token = self._take()
+        if token == 'NOT':
+            # Relative to every stored resume, including those without any skills
+            return self.universe & ~self._factor()
+        if token == '(':
+            bitmap = self._expression()
+            if self._take() != ')':
+                raise SkillQueryError("Missing ')' in the query")
+            return bitmap
+        if token in self.OPERATORS:
+            raise SkillQueryError(f"Unexpected '{token}' in the query")
+        return self.skill_bitmap(token)
@@ -0,0 +1,342 @@
+"""
+text_extraction.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: text_extraction.py
+Revised: [Add revised date]
+
+Description:
+This module extracts text from PDF files once per file content.
+The text of each page is stored once, in the ExtractedText table keyed by the SHA-256 of the
+file, so analysing the same upload again, or an identical file uploaded by someone else,
+reads the stored text instead of running pdfminer again.
+Documents with many pages are split by page and the pages are extracted concurrently in a
+process pool, since pdfminer is pure Python and CPU-bound.
+
+Classes:
+    ExtractedDocument: The text of a file and of each of its pages.
+    PDFPageExtractor: Extracts the pages of large PDF files in parallel worker processes.
+    PDFTextCache: A two-tier (LRU + database) cache of text extracted from PDF files.
+
+Functions:
+    can_start_worker_processes: Tells whether the current process may start worker processes.
+    file_sha256: Computes the SHA-256 of a file without reading it into memory at once.
+    count_pdf_pages: Counts the pages of a PDF file without extracting their text.
+    extract_pdf_pages: Extracts the text of each page of a PDF file.
+
+Usage:
+    Use the module level pdf_text_cache to read the text of a PDF file.
+
+Example:
+    from app.services.text_extraction import pdf_text_cache
+
+    text = pdf_text_cache.get_text('uploads/resume.pdf')
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional
+
+from flask import has_app_context
+from pdfminer.high_level import extract_text
+from pdfminer.pdfpage import PDFPage
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db_manager import db
+from app.log import AppLogger
+from app.models import ExtractedText
+
+# Set up logging using AppLogger
+logger = AppLogger.get_logger()
+
+# pdfminer ends every page with a form feed
+PAGE_SEPARATOR = '\x0c'
+HASH_CHUNK_SIZE = 1024 * 1024
+PDF_EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PAGE_TIMEOUT = 30
+PDF_PARALLEL_MIN_PAGES = 8
+
+
+class ExtractedDocument(NamedTuple):
+    """
+    The text of a file and of each of its pages.
+    """
+    content_hash: str
+    pages: List[str]
+
+    @property
+    def text(self) -> str:
+        return ''.join(page + PAGE_SEPARATOR for page in self.pages)
+
+
+def can_start_worker_processes() -> bool:
+    """
+    Tells whether the current process may start worker processes. Daemonic processes, such as
+    the workers of Celery's prefork pool, may not have children.
+
+    Returns:
+        bool: False if worker processes must not be started.
+    """
+    return not multiprocessing.current_process().daemon
+
+
+def file_sha256(file_path: str) -> str:
+    """
+    Computes the SHA-256 of a file without reading it into memory at once.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pdf_pages(file_path: str) -> List[str]:
+    """
+    Extracts the text of each page of a PDF file.
+
+    Args:
+        file_path (str): The path to the PDF file.
+
+    Returns:
+        List[str]: The text of each page, in order.
+    """
+    text = extract_text(file_path)
+    if not text:
+        return []
+    # The separator after the last page would leave an empty trailing element
+    return text[:-1].split(PAGE_SEPARATOR) if text.endswith(PAGE_SEPARATOR) else text.split(PAGE_SEPARATOR)
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """
+    Counts the pages of a PDF file without extracting their text.
+
+    Args:
+        file_path (str): The path to the PDF file.
+
+    Returns:
+        int: The number of pages.
+    """
+    with open(file_path, 'rb') as f:
+        return sum(1 for _ in PDFPage.get_pages(f))
+
+
+def _extract_page(file_path: str, page_number: int) -> str:
+    # Runs in a worker process, so it must stay a module level function
+    text = extract_text(file_path, page_numbers=[page_number])
+    return text[:-1] if text.endswith(PAGE_SEPARATOR) else text
+
+
+class PDFPageExtractor:
+    """
+    Extracts the pages of large PDF files in parallel worker processes.
+
+    Files with fewer pages than min_parallel_pages are extracted in the calling thread, where
+    the cost of starting work in another process would outweigh the gain, as are all files in
+    daemonic processes, which may not start worker processes. The worker pool is
+    created on first use and shared by every caller.
+    """
+
+    def __init__(self, max_workers: int = PDF_EXTRACTION_WORKERS, page_timeout: float = PDF_PAGE_TIMEOUT,
+                 min_parallel_pages: int = PDF_PARALLEL_MIN_PAGES):
+        """
+        Args:
+            max_workers (int): The maximum number of worker processes.
+            page_timeout (float): Seconds to wait for each page before giving up on the document.
+            min_parallel_pages (int): The smallest page count extracted in parallel.
+        """
+        self.max_workers = max_workers
+        self.page_timeout = page_timeout
+        self.min_parallel_pages = min_parallel_pages
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        # A stuck worker cannot be interrupted, so later documents get a fresh pool instead
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, file_path: str) -> List[str]:
+        """
+        Extract the text of each page of a PDF file, in parallel if the file is large enough.
+
+        Args:
+            file_path (str): The path to the PDF file.
+
+        Returns:
+            List[str]: The text of each page, in order.
+
+        Raises:
+            TimeoutError: If a page takes longer than the page timeout.
+        """
+        if self.max_workers <= 1:
+            return extract_pdf_pages(file_path)
+        page_count = count_pdf_pages(file_path)
+        if page_count < self.min_parallel_pages or not can_start_worker_processes():
+            return extract_pdf_pages(file_path)
+
+        pool = self._get_pool()
+        try:
+            futures = [pool.submit(_extract_page, file_path, page_number) for page_number in range(page_count)]
+        except (AssertionError, OSError, BrokenProcessPool) as e:
+            # The workers are started by the first submit
+            logger.error(f"PDF extraction pool is not usable, extracting {file_path} serially: {e}")
+            self._discard_pool(pool)
+            return extract_pdf_pages(file_path)
+
+        pages = []
+        for page_number, future in enumerate(futures):
+            try:
+                # Pages run concurrently, so each wait is bounded by the timeout of that page
+                pages.append(future.result(timeout=self.page_timeout))
+            except FutureTimeoutError:
+                logger.error(f"Page {page_number + 1} of {file_path} took longer than {self.page_timeout}s")
+                self._discard_pool(pool)
+                raise TimeoutError(f"Timed out extracting page {page_number + 1} of {file_path}")
+            except BrokenProcessPool as e:
+                logger.error(f"PDF extraction pool is broken, extracting {file_path} serially: {e}")
+                self._discard_pool(pool)
+                return extract_pdf_pages(file_path)
+        return pages
+
+    def shutdown(self):
+        """
+        Stop the worker processes, if any were started.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+class PDFTextCache:
+    """
+    A two-tier (LRU + database) cache of text extracted from PDF files.
+    """
+
+    def __init__(self, max_size: int = 128, persistent: bool = True,
+                 extractor: Optional[PDFPageExtractor] = None):
+        """
+        Args:
+            max_size (int): The maximum number of documents kept in memory.
+            persistent (bool): Whether documents are also stored in and read from the ExtractedText table.
+            extractor (PDFPageExtractor, optional): Extracts the pages of files that are not cached.
+        """
+        self.max_size = max_size
+        self.persistent = persistent
+        self.extractor = extractor or PDFPageExtractor()
+        self._entries: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, content_hash: str, pages: List[str]):
+        with self._lock:
+            self._entries[content_hash] = pages
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, content_hash: str) -> Optional[List[str]]:
+        with self._lock:
+            pages = self._entries.get(content_hash)
+            if pages is not None:
+                self._entries.move_to_end(content_hash)
+                return pages
+
+        if self.persistent and has_app_context():
+            try:
+                with Session(db.engine) as session:
+                    stored = session.scalar(select(ExtractedText.pages).filter_by(content_hash=content_hash))
+                if stored is not None:
+                    pages = json.loads(stored)
+                    self._remember(content_hash, pages)
+                    return pages
+            except (SQLAlchemyError, ValueError) as e:
+                logger.error(f"Error reading extracted text for {content_hash}: {e}")
+        return None
+
+    def _store(self, content_hash: str, pages: List[str]):
+        self._remember(content_hash, pages)
+        if self.persistent and has_app_context():
+            # Own session: the caller's transaction is neither committed nor rolled back by the cache
+            try:
+                with Session(db.engine) as session, session.begin():
+                    session.add(ExtractedText(content_hash=content_hash, pages=json.dumps(pages),
+                                              page_count=len(pages)))
+            except SQLAlchemyError as e:
+                # Another request may have stored the same file first
+                logger.error(f"Error storing extracted text for {content_hash}: {e}")
+
+    def get_document(self, file_path: str, content_hash: Optional[str] = None) -> ExtractedDocument:
+        """
+        Return the text of a PDF file, extracting it only if the file content has not been seen before.
+
+        Args:
+            file_path (str): The path to the PDF file.
+            content_hash (str, optional): The SHA-256 of the file, if already known.
+
+        Returns:
+            ExtractedDocument: The content hash and the text of each page.
+        """
+        if content_hash is None:
+            content_hash = file_sha256(file_path)
+
+        pages = self._lookup(content_hash)
+        if pages is not None:
+            with self._lock:
+                self.hits += 1
+            return ExtractedDocument(content_hash, pages)
+
+        with self._lock:
+            self.misses += 1
+        pages = self.extractor.extract(file_path)
+        self._store(content_hash, pages)
+        return ExtractedDocument(content_hash, pages)
+
+    def get_text(self, file_path: str, content_hash: Optional[str] = None) -> str:
+        """
+        Return the plain text of a PDF file.
+
+        Args:
+            file_path (str): The path to the PDF file.
+            content_hash (str, optional): The SHA-256 of the file, if already known.
+
+        Returns:
+            str: The extracted text, in the same form pdfminer's extract_text returns it.
+        """
+        return self.get_document(file_path, content_hash).text
+
+    def clear(self):
+        """
+        Drop every document held in memory.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+pdf_text_cache = PDFTextCache()
@@ -0,0 +1,409 @@
+"""
+tracing.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: tracing.py
+Revised: [Add revised date]
+
+Description:
+This module implements lightweight tracing of the analysis pipeline.
+Code runs a stage, e.g. text extraction or model inference, inside a span. The span measures
+the stage with a monotonic clock and adds the duration to a latency histogram of that stage.
+The histograms are HDR-style: values are bucketed log-linearly, with 128 buckets per power of
+two, so any percentile is reported within 1% of the true value, from microseconds to hours, in a
+few kilobytes per stage. A trace collects the spans of one request or task, e.g. for a
+Server-Timing header. The histograms are served in the Prometheus text format and summarised
+on the admin dashboard.
+A span costs about a microsecond, so tracing adds far less than 1% to an analysis. When tracing
+is disabled, spans do nothing. Every process keeps its own histograms, so the spans of a Celery
+worker are not in the metrics of the web process.
+
+Classes:
+    LatencyHistogram: An HDR-style histogram of durations in microseconds.
+    Trace: The spans of one request or task.
+    Tracer: Records spans into per-stage histograms.
+
+Usage:
+    Wrap each stage in tracer.span(name), and a whole request or task in tracer.trace(name).
+    Use tracer.render_prometheus() for the metrics endpoint and tracer.summary() for dashboards.
+
+Example:
+    from app.services.tracing import tracer
+
+    with tracer.trace('analyze_resume') as trace:
+        with tracer.span('extraction'):
+            resume_text = extract(resume_file)
+    print(trace.server_timing())
+    print(tracer.summary())
+"""
+
+import contextvars
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# The stages of the analysis pipeline, in the order they run; the dashboard lists them first
+PIPELINE_STAGES = ('extraction', 'section_parsing', 'cache_lookup', 'inference', 'phrase_matching', 'scoring',
+                   'persistence')
+# The upper bounds, in seconds, of the buckets of the Prometheus histogram
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Buckets per power of two: the relative error of a bucket is at most 1 / 128
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF_COUNT = 1 << SUB_BUCKET_BITS
+
+# The trace collecting the spans of the current request or task, if any
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('resumate_trace', default=None)
+
+
+def _bucket_index(value: int) -> int:
+    # Values below 256 have a bucket each; above, every power of two is split into 128 buckets
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift + 1) * SUB_BUCKET_HALF_COUNT + (value >> shift) - SUB_BUCKET_HALF_COUNT
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """
+    Return the lowest and highest value counted in a bucket.
+    """
+    if index < 2 * SUB_BUCKET_HALF_COUNT:
+        return index, index
+    shift = index // SUB_BUCKET_HALF_COUNT - 1
+    lowest = (index - shift * SUB_BUCKET_HALF_COUNT) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    An HDR-style histogram of durations in microseconds.
+    Only the buckets that were hit are stored, so the histogram stays small.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value: int):
+        """
+        Add a duration.
+
+        Args:
+            value (int): The duration in microseconds.
+        """
+        value = max(0, int(value))
+        index = _bucket_index(value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def snapshot(self) -> 'LatencyHistogram':
+        """
+        Return a copy, so a consistent state can be read while durations are still recorded.
+        """
+        copy = LatencyHistogram()
+        with self._lock:
+            copy._counts = dict(self._counts)
+            copy.count, copy.total, copy.min, copy.max = self.count, self.total, self.min, self.max
+        return copy
+
+    def _cumulative(self) -> Iterable[Tuple[int, int]]:
+        """
+        Yield the highest value of every non-empty bucket and the count up to it, lowest first.
+        """
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            yield _bucket_bounds(index)[1], seen
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Return the duration below or at which a percentage of the durations fall.
+
+        Args:
+            percentile (float): The percentage, from 0 to 100.
+
+        Returns:
+            int: The duration in microseconds, within 1% of the exact value, or 0 if the histogram is empty.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percentile // 100))
+        for highest, seen in self._cumulative():
+            if seen >= rank:
+                return min(highest, self.max)
+        return self.max
+
+    def count_at_or_below(self, value: int) -> int:
+        """
+        Return the number of durations at or below a value, counting a bucket only if it is entirely below.
+
+        Args:
+            value (int): The duration in microseconds.
+
+        Returns:
+            int: The number of durations.
+        """
+        result = 0
+        for highest, seen in self._cumulative():
+            if highest > value:
+                break
+            result = seen
+        return result
+
+
+class Trace:
+    """
+    The spans of one request or task, in the order they finished.
+
+    Attributes:
+        name (str): The name of the request or task.
+        spans (List[Tuple[str, int]]): The name and duration in nanoseconds of every span.
+        duration (int): The duration of the whole trace in nanoseconds, once it has finished.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.spans: List[Tuple[str, int]] = []
+        self.duration: Optional[int] = None
+
+    def stage_durations(self) -> Dict[str, float]:
+        """
+        Return the total milliseconds spent in each stage.
+        """
+        durations: Dict[str, float] = {}
+        for name, duration in self.spans:
+            durations[name] = durations.get(name, 0.0) + duration / 1e6
+        return durations
+
+    def server_timing(self) -> str:
+        """
+        Return the stage durations as the value of a Server-Timing header.
+        """
+        durations = self.stage_durations()
+        if self.duration is not None:
+            durations['total'] = self.duration / 1e6
+        return ', '.join(f'{name};dur={duration:.2f}' for name, duration in durations.items())
+
+
+class _Span:
+    """
+    Measures a stage and records it when the block exits.
+    """
+    __slots__ = ('tracer', 'name', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str):
+        self.tracer = tracer
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.record(self.name, time.perf_counter_ns() - self.start, failed=exc_type is not None)
+        return False
+
+
+class _TraceSpan(_Span):
+    """
+    Measures a request or task and collects the spans run inside it.
+    """
+    __slots__ = ('trace', 'token')
+
+    def __init__(self, tracer: 'Tracer', name: str):
+        super().__init__(tracer, name)
+        self.trace = Trace(name)
+        self.token = None
+
+    def __enter__(self):
+        self.token = _current_trace.set(self.trace)
+        super().__enter__()
+        return self.trace
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter_ns() - self.start
+        _current_trace.reset(self.token)
+        self.trace.duration = duration
+        self.tracer.record(self.name, duration, failed=exc_type is not None)
+        return False
+
+
+class _NullSpan:
+    """
+    Used instead of a span when tracing is disabled.
+    """
+
+    def __init__(self, result=None):
+        self.result = result
+
+    def __enter__(self):
+        return self.result
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Records spans into per-stage histograms.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled (bool): Whether spans are recorded.
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._errors: Dict[str, int] = {}
+
+    def span(self, name: str):
+        """
+        Return a context manager measuring a stage.
+
+        Args:
+            name (str): The name of the stage, e.g. 'inference'.
+        """
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def trace(self, name: str):
+        """
+        Return a context manager measuring a request or task, which yields the Trace of its spans.
+        The duration of the whole trace is also recorded as a stage with its name.
+
+        Args:
+            name (str): The name of the request or task, e.g. 'analyze_resume'.
+        """
+        return _TraceSpan(self, name) if self.enabled else _NullSpan(Trace(name))
+
+    def record(self, name: str, duration: int, failed: bool = False):
+        """
+        Record the duration of a stage, and add it to the current trace.
+
+        Args:
+            name (str): The name of the stage.
+            duration (int): The duration in nanoseconds.
+            failed (bool): Whether the stage raised an exception.
+        """
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        histogram.record(duration // 1000)
+        if failed:
+            with self._lock:
+                self._errors[name] = self._errors.get(name, 0) + 1
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.spans.append((name, duration))
+
+    def reset(self):
+        """
+        Drop the recorded durations.
+        """
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
+
+    def _snapshots(self) -> List[Tuple[str, LatencyHistogram, int]]:
+        """
+        Return a copy of the histogram and the error count of every stage, pipeline stages first.
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+            errors = dict(self._errors)
+        order = {name: index for index, name in enumerate(PIPELINE_STAGES)}
+        names = sorted(histograms, key=lambda name: (order.get(name, len(order)), name))
+        return [(name, histograms[name].snapshot(), errors.get(name, 0)) for name in names]
+
+    def summary(self) -> List[dict]:
+        """
+        Return the latency of every stage in milliseconds, pipeline stages first.
+
+        Returns:
+            List[dict]: The stage, the number of spans and errors, and the mean, p50, p90, p99 and
+            maximum durations.
+        """
+        return [{
+            "stage": name,
+            "count": histogram.count,
+            "errors": errors,
+            "mean_ms": histogram.total / histogram.count / 1000 if histogram.count else 0.0,
+            "p50_ms": histogram.percentile(50) / 1000,
+            "p90_ms": histogram.percentile(90) / 1000,
+            "p99_ms": histogram.percentile(99) / 1000,
+            "max_ms": (histogram.max or 0) / 1000,
+        } for name, histogram, errors in self._snapshots()]
+
+    def render_prometheus(self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = 'resumate') -> str:
+        """
+        Return the stage latencies in the Prometheus text exposition format.
+
+        Every stage has a histogram with the given buckets, a summary with the quantiles of the HDR
+        histogram, which are more precise than the buckets, and a counter of the spans that raised.
+
+        Args:
+            buckets (Iterable[float]): The upper bounds of the histogram buckets, in seconds.
+            prefix (str): The prefix of the metric names.
+
+        Returns:
+            str: The metrics.
+        """
+        buckets = sorted(buckets)
+        snapshots = self._snapshots()
+        histogram_name = f'{prefix}_stage_duration_seconds'
+        summary_name = f'{prefix}_stage_latency_seconds'
+        errors_name = f'{prefix}_stage_errors_total'
+
+        lines = [f'# HELP {histogram_name} Duration of the analysis pipeline stages.',
+                 f'# TYPE {histogram_name} histogram']
+        for name, histogram, _ in snapshots:
+            stage = _escape_label(name)
+            for bound in buckets:
+                count = histogram.count_at_or_below(int(bound * 1e6))
+                lines.append(f'{histogram_name}_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+            lines.append(f'{histogram_name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{histogram_name}_sum{{stage="{stage}"}} {histogram.total / 1e6:.6f}')
+            lines.append(f'{histogram_name}_count{{stage="{stage}"}} {histogram.count}')
+
+        lines += [f'# HELP {summary_name} Quantiles of the duration of the analysis pipeline stages.',
+                  f'# TYPE {summary_name} summary']
+        for name, histogram, _ in snapshots:
+            stage = _escape_label(name)
+            for quantile in SUMMARY_QUANTILES:
+                value = histogram.percentile(quantile * 100) / 1e6
+                lines.append(f'{summary_name}{{stage="{stage}",quantile="{quantile:g}"}} {value:.6f}')
+            lines.append(f'{summary_name}_sum{{stage="{stage}"}} {histogram.total / 1e6:.6f}')
+            lines.append(f'{summary_name}_count{{stage="{stage}"}} {histogram.count}')
+
+        lines += [f'# HELP {errors_name} Analysis pipeline stages that raised an exception.',
+                  f'# TYPE {errors_name} counter']
+        for name, _, errors in snapshots:
+            lines.append(f'{errors_name}{{stage="{_escape_label(name)}"}} {errors}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Shared by the application; create_app enables or disables it from TRACING_ENABLED
+tracer = Tracer()
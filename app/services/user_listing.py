@@ -0,0 +1,175 @@
+"""
+user_listing.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: user_listing.py
+Revised: [Add revised date]
+
+Description:
+This module implements keyset (seek) pagination of the users.
+Instead of an offset, a page starts after the sort key of the last user of the previous page,
+which is passed around as an opaque cursor. Every page is then a range scan on the unique index of
+the sort column, however deep the page, and only one page of users is loaded at a time.
+Users can be sorted by ID, username or email, which are all unique and not nullable, and filtered
+by a username or email prefix.
+
+Classes:
+    InvalidCursorError: Raised when a cursor is malformed or belongs to another sort order.
+    UserPage: A page of users and the cursor of the next page.
+
+Functions:
+    list_users: Returns a page of users.
+    list_users_from_args: Returns the page of users described by request query parameters.
+
+Usage:
+    Call list_users with the cursor of the previous page, or none for the first page.
+
+Example:
+    from app.services.user_listing import list_users
+
+    page = list_users(limit=50, sort='username', search='jo')
+    next_page = list_users(after=page.next_cursor, limit=50, sort='username', search='jo')
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from typing import List, Mapping, Optional
+
+from sqlalchemy import or_
+
+from app.models import User
+
+# Sort key -> column, every one unique so the sort value alone locates a user
+SORT_COLUMNS = {
+    'id': User.id,
+    'username': User.username,
+    'email': User.email,
+}
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a cursor is malformed or belongs to another sort order.
+    """
+
+
+@dataclass
+class UserPage:
+    """
+    A page of users and the cursor of the next page.
+
+    Attributes:
+        users (List[User]): The users of the page, in sort order.
+        next_cursor (str): The cursor of the next page, or None on the last page.
+        sort (str): The sort key of the page.
+        descending (bool): Whether the users are in descending order.
+    """
+    users: List[User] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    sort: str = 'id'
+    descending: bool = False
+
+    def to_dict(self) -> dict:
+        """
+        Return the page as a JSON serializable dictionary.
+        """
+        return {
+            "users": [{"id": user.id, "username": user.username, "email": user.email} for user in self.users],
+            "next_cursor": self.next_cursor,
+            "sort": self.sort,
+            "order": 'desc' if self.descending else 'asc',
+        }
+
+
+def _encode_cursor(sort: str, descending: bool, value) -> str:
+    payload = json.dumps([sort, descending, value], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, sort: str, descending: bool):
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, value = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    if cursor_sort != sort or cursor_descending != descending:
+        raise InvalidCursorError("The cursor belongs to another sort order")
+    if not isinstance(value, int if sort == 'id' else str) or isinstance(value, bool):
+        raise InvalidCursorError("Malformed cursor")
+    return value
+
+
+def _escape_like(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def list_users(after: Optional[str] = None, limit: int = 50, sort: str = 'id', descending: bool = False,
+               search: Optional[str] = None) -> UserPage:
+    """
+    Return a page of users.
+
+    Args:
+        after (str, optional): The cursor of the previous page. Defaults to the first page.
+        limit (int): The number of users per page.
+        sort (str): The sort key, one of SORT_COLUMNS.
+        descending (bool): Whether to sort in descending order.
+        search (str, optional): Only return users whose username or email starts with this text.
+            Prefix matching keeps the filter on the unique indexes; it is case-insensitive on
+            databases with case-insensitive collations, such as SQL Server and SQLite.
+
+    Returns:
+        UserPage: The page, with the cursor of the next page if there is one.
+
+    Raises:
+        ValueError: If the sort key is unknown.
+        InvalidCursorError: If the cursor is malformed or belongs to another sort order.
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Unknown sort key '{sort}'")
+    column = SORT_COLUMNS[sort]
+
+    query = User.query
+    if search:
+        pattern = _escape_like(search) + '%'
+        query = query.filter(or_(User.username.like(pattern, escape='\\'), User.email.like(pattern, escape='\\')))
+    if after:
+        value = _decode_cursor(after, sort, descending)
+        query = query.filter(column < value if descending else column > value)
+
+    # One extra row tells whether there is a next page, without counting
+    users = query.order_by(column.desc() if descending else column.asc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = _encode_cursor(sort, descending, getattr(users[-1], sort))
+    return UserPage(users=users, next_cursor=next_cursor, sort=sort, descending=descending)
+
+
+def list_users_from_args(args: Mapping, default_limit: int = 50, max_limit: int = 200) -> UserPage:
+    """
+    Return the page of users described by request query parameters.
+
+    Args:
+        args (Mapping): The query parameters: 'after', 'limit', 'sort', 'order' ('asc' or 'desc') and 'q'.
+        default_limit (int): The page size when 'limit' is missing.
+        max_limit (int): The largest page size a request may ask for.
+
+    Returns:
+        UserPage: The page of users.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+        InvalidCursorError: If the cursor is malformed or belongs to another sort order.
+    """
+    try:
+        limit = int(args.get('limit') or default_limit)
+    except ValueError:
+        raise ValueError("The page size must be a number")
+    order = args.get('order') or 'asc'
+    if order not in ('asc', 'desc'):
+        raise ValueError(f"Unknown sort order '{order}'")
+    return list_users(after=args.get('after') or None, limit=max(1, min(limit, max_limit)),
+                      sort=args.get('sort') or 'id', descending=order == 'desc', search=args.get('q') or None)
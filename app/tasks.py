@@ -4,50 +4,308 @@ tasks.py
 Author: William Richmond
 Created on: 28 July 2024
 File name: tasks.py
-Revised: [Add revised date]
+Revised: 18 October 2026
 
 Description:
 This module defines the Celery tasks for the ResuMate application.
-It includes tasks for processing uploaded files using AI.
+It includes the task that runs the analysis pipeline on an uploaded file: text extraction,
+section parsing, scoring with ContentAnalyzer and AIService, and storing the output in AIResult.
+Every stage runs in a tracing span, so its latency shows in the stage histograms.
+The progress of each queued analysis is tracked in an AnalysisJob row. Bulk ingestions of
+archives run as a task tracked by an IngestJob row, outside of the request that uploaded them.
+Another task adds newly stored resumes to the similarity index.
+
+Functions:
+    init_celery: Configures the Celery application from the Flask configuration.
+    enqueue_analysis: Creates an AnalysisJob for an uploaded file and queues process_file.
+    process_file: Celery task that analyses an uploaded file.
+    enqueue_ingest: Creates an IngestJob for an uploaded archive and queues ingest_archive.
+    ingest_archive: Celery task that ingests the resumes of an archive.
+    enqueue_similarity_update: Queues update_similarity_index.
+    update_similarity_index: Celery task that adds new resumes to the similarity index.
 
 Usage:
-    Import this module to register and use the defined Celery tasks.
+    Call init_celery from the application factory, then use enqueue_analysis from the routes.
+    Start a worker with: celery -A celery_worker.celery worker
 
 Example:
-    from tasks import process_file
+    from app.tasks import enqueue_analysis
 
-    process_file.delay(file_id, file_path)
+    job = enqueue_analysis(uploaded_file, job_description, user_id)
 """
 
-import time
-from celery import Celery
+import json
+import os
+import uuid
 import logging
+from celery import Celery
+from flask import current_app, has_app_context
+from app.db_manager import db
+from app.models import AIResult, AnalysisJob, IngestJob
+from app.resume_parser import ResumeParser
+from app.services.bulk_ingest import BulkIngestor, iter_archive
+from app.services.content_analysis import TAXONOMY_VERSION
+from app.services.text_extraction import file_sha256
+from app.services.tracing import tracer
 
-# Initialize Celery
-celery = Celery(__name__, broker='your_broker_url')
+# Initialize Celery; the broker is set by init_celery from the Flask configuration
+celery = Celery(__name__)
 
 # Initialize logger
 logger = logging.getLogger('resumate.tasks')
 
 
+def init_celery(app):
+    """
+    Configures the Celery application from the Flask configuration.
+
+    Args:
+        app (Flask): The Flask application the tasks run against.
+    """
+    celery.conf.update(
+        broker_url=app.config['CELERY_BROKER_URL'],
+        result_backend=app.config['CELERY_RESULT_BACKEND'],
+        task_always_eager=app.config.get('CELERY_TASK_ALWAYS_EAGER', False),
+    )
+    celery.flask_app = app
+    app.celery = celery
+
+
+def _update_job(job, **fields):
+    if job is None:
+        return
+    for name, value in fields.items():
+        setattr(job, name, value)
+    db.session.commit()
+
+
+def enqueue_analysis(uploaded_file, job_description, user_id=None):
+    """
+    Creates an AnalysisJob for an uploaded file and queues process_file.
+
+    Args:
+        uploaded_file (UploadedFile): The stored upload to analyse.
+        job_description (str): The job description to score the resume against.
+        user_id (int, optional): The ID of the user queuing the analysis.
+
+    Returns:
+        AnalysisJob: The job, 'queued' or already finished if tasks run eagerly.
+    """
+    job = AnalysisJob(id=str(uuid.uuid4()), user_id=user_id, file_id=uploaded_file.id,
+                      job_description=job_description or '', status='queued', progress=0.0)
+    db.session.add(job)
+    db.session.commit()
+
+    try:
+        process_file.apply_async(args=[uploaded_file.id, uploaded_file.file_path],
+                                 kwargs={'job_description': job.job_description, 'job_id': job.id,
+                                         'content_hash': uploaded_file.content_hash},
+                                 task_id=job.id)
+    except Exception as e:
+        logger.error(f"Error queuing analysis of file {uploaded_file.id}: {e}")
+        _update_job(job, status='failed', error='The analysis could not be queued')
+
+    # In eager mode the task committed through the same session, so reload the final state
+    db.session.refresh(job)
+    return job
+
+
+def _run_pipeline(file_id, file_path, job_description, job, content_hash):
+    _update_job(job, status='running', progress=0.1)
+    if content_hash is None:
+        # Uploads stored before content hashes were recorded
+        content_hash = file_sha256(file_path)
+
+    with tracer.span('extraction'):
+        resume_text = ResumeParser.extract_text_from_file(file_path, content_hash)
+    if not resume_text.strip():
+        raise ValueError("No text could be extracted from the file")
+    _update_job(job, progress=0.4)
+
+    with tracer.span('section_parsing'):
+        sections = ResumeParser.identify_sections(resume_text)
+    _update_job(job, progress=0.5)
+
+    ai_service = current_app.ai_service
+    analysis_cache = current_app.analysis_cache
+    cache_key = analysis_cache.make_key_for_hash(content_hash, job_description, ai_service.model_version,
+                                                 TAXONOMY_VERSION)
+
+    with tracer.span('cache_lookup'):
+        analysis_result = analysis_cache.get(cache_key)
+    if analysis_result is None:
+        analysis_result = ai_service.analyze_resume(resume_text, job_description)
+        if "error" in analysis_result:
+            raise RuntimeError(analysis_result["error"])
+        analysis_result = dict(analysis_result, sections=sections)
+        with tracer.span('persistence'):
+            ai_result = analysis_cache.put(cache_key, analysis_result, file_id=file_id)
+            db.session.commit()
+    else:
+        ai_result = None
+    _update_job(job, progress=0.9)
+
+    if ai_result is None:
+        # Cache hit (or an in-memory only cache): still record the result against this file
+        with tracer.span('persistence'):
+            ai_result = AIResult(file_id=file_id, cache_key=cache_key,
+                                 result_data=json.dumps(dict(analysis_result, sections=sections)))
+            db.session.add(ai_result)
+            db.session.commit()
+
+    _update_job(job, status='done', progress=1.0, ai_result_id=ai_result.id)
+    return ai_result.id
+
+
 @celery.task
-def process_file(file_id, file_path):
+def process_file(file_id, file_path, job_description='', job_id=None, content_hash=None):
     """
     Process the uploaded file using AI.
 
     Args:
         file_id (int): The ID of the uploaded file.
         file_path (str): The path to the uploaded file.
+        job_description (str): The job description to score the resume against.
+        job_id (str, optional): The AnalysisJob tracking this task.
+        content_hash (str, optional): The SHA-256 of the file. Computed from the file if missing.
 
     Returns:
-        None
+        int: The ID of the AIResult, or None if the analysis failed.
     """
-    try:
-        logger.info(f"Processing file {file_id} at {file_path}")
+    if has_app_context():
+        return _process_file(file_id, file_path, job_description, job_id, content_hash)
+    with celery.flask_app.app_context():
+        return _process_file(file_id, file_path, job_description, job_id, content_hash)
 
-        # Simulate processing time
-        time.sleep(10)
 
+def _process_file(file_id, file_path, job_description, job_id, content_hash):
+    job = db.session.get(AnalysisJob, job_id) if job_id else None
+    try:
+        logger.info(f"Processing file {file_id} at {file_path}")
+        with tracer.trace('process_file'):
+            ai_result_id = _run_pipeline(file_id, file_path, job_description, job, content_hash)
         logger.info(f"Completed processing file {file_id}")
+        return ai_result_id
     except Exception as e:
         logger.error(f"Error processing file {file_id} at {file_path}: {e}")
+        db.session.rollback()
+        _update_job(job, status='failed', error=str(e))
+        return None
+
+
+def enqueue_ingest(archive_path, filename, user_id):
+    """
+    Creates an IngestJob for an uploaded archive and queues ingest_archive.
+
+    Args:
+        archive_path (str): The archive, on storage the workers can read; it is removed once ingested.
+        filename (str): The name of the uploaded archive.
+        user_id (int): The ID of the admin queuing the ingestion.
+
+    Returns:
+        IngestJob: The job, 'queued' or already finished if tasks run eagerly.
+    """
+    job = IngestJob(id=str(uuid.uuid4()), user_id=user_id, filename=filename, archive_path=archive_path,
+                    status='queued', files=0)
+    db.session.add(job)
+    db.session.commit()
+
+    try:
+        ingest_archive.apply_async(args=[job.id], task_id=job.id)
+    except Exception as e:
+        logger.error(f"Error queuing ingestion of {filename}: {e}")
+        _update_job(job, status='failed', error='The ingestion could not be queued')
+        _remove_archive(archive_path)
+
+    # In eager mode the task committed through the same session, so reload the final state
+    db.session.refresh(job)
+    return job
+
+
+def _remove_archive(archive_path):
+    try:
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+    except OSError as e:
+        logger.error(f"Error removing archive {archive_path}: {e}")
+
+
+@celery.task
+def ingest_archive(job_id):
+    """
+    Ingest the resumes of an uploaded archive.
+
+    Args:
+        job_id (str): The IngestJob tracking this task.
+
+    Returns:
+        dict: The ingestion report, or None if the ingestion failed.
+    """
+    if has_app_context():
+        return _ingest_archive(job_id)
+    with celery.flask_app.app_context():
+        return _ingest_archive(job_id)
+
+
+def _ingest_archive(job_id):
+    job = db.session.get(IngestJob, job_id)
+    if job is None:
+        logger.error(f"Ingest job {job_id} not found")
+        return None
+    try:
+        logger.info(f"Ingesting archive {job.filename} for job {job_id}")
+        _update_job(job, status='running')
+        config = current_app.config
+        ingestor = BulkIngestor(current_app.blob_store, job.user_id,
+                                batch_size=config.get('INGEST_BATCH_SIZE', 200),
+                                max_workers=config.get('INGEST_WORKERS', 4),
+                                max_size=config.get('MAX_UPLOAD_SIZE'))
+        report = ingestor.ingest(iter_archive(job.archive_path),
+                                 on_batch=lambda progress: _update_job(job, files=progress.files))
+        _update_job(job, status='done', files=report.files, report=json.dumps(report.to_dict()))
+        enqueue_similarity_update()
+        return report.to_dict()
+    except Exception as e:
+        logger.error(f"Error ingesting archive {job.filename} for job {job_id}: {e}")
+        db.session.rollback()
+        _update_job(job, status='failed', error=str(e))
+        return None
+    finally:
+        _remove_archive(job.archive_path)
+
+
+def enqueue_similarity_update():
+    """
+    Queues update_similarity_index, unless the application has no similarity index.
+    """
+    if not has_app_context() or getattr(current_app, 'similarity_index', None) is None:
+        return
+    try:
+        update_similarity_index.delay()
+    except Exception as e:
+        logger.error(f"Error queuing similarity index update: {e}")
+
+
+@celery.task
+def update_similarity_index():
+    """
+    Add the resumes stored since the last update to the similarity index.
+
+    Returns:
+        int: The number of resumes added, or None if the update failed.
+    """
+    if has_app_context():
+        return _update_similarity_index()
+    with celery.flask_app.app_context():
+        return _update_similarity_index()
+
+
+def _update_similarity_index():
+    similarity_index = getattr(current_app, 'similarity_index', None)
+    if similarity_index is None:
+        return 0
+    try:
+        return similarity_index.refresh()
+    except Exception as e:
+        logger.error(f"Error updating similarity index: {e}")
+        return None
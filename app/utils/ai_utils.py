@@ -7,8 +7,8 @@ File name: transformers.py
 Revised: [Add revised date]
 
 Description:
-This module loads a pre-trained BERT model and tokenizer for named entity recognition (NER)
-and provides a function to extract keywords from text.
+This module provides a function to extract keywords from text using a pre-trained BERT model
+for named entity recognition (NER). Inference runs on the shared NER service.
 
 Functions:
     extract_keywords: Extracts keywords from text using a pre-trained BERT model for NER.
@@ -22,24 +22,11 @@ Example:
 """
 
 import logging
-from transformers import BertTokenizer, BertForTokenClassification, pipeline
+from app.services.ner_service import ner_service
 
 # Configure logging
-logger = logging.getLogger('transformers')
+logger = logging.getLogger('ai_utils')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('transformers.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-# Load pre-trained model and tokenizer
-logger.info("Loading pre-trained model and tokenizer...")
-tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
-model = BertForTokenClassification.from_pretrained('bert-base-uncased', num_labels=2)
-
-# Create a pipeline for named entity recognition (NER)
-logger.info("Creating NER pipeline...")
-nlp = pipeline("ner", model=model, tokenizer=tokenizer)
 
 
 def extract_keywords(text):
@@ -53,7 +40,6 @@ def extract_keywords(text):
         list: A list of extracted keywords.
     """
     logger.info(f"Extracting keywords from text: {text}")
-    ner_results = nlp(text)
-    keywords = [result['word'] for result in ner_results if result['entity'] == 'LABEL_1']
+    keywords = ner_service.extract_keywords(text)
     logger.info(f"Extracted keywords: {keywords}")
     return keywords
@@ -29,14 +29,14 @@ from flask_login import current_user
 from werkzeug.utils import secure_filename
 from app.db_manager import DBManager
 from app.models import Resume, UploadedFile
+from app.resume_parser import ResumeParser
+from app.services.skill_index import record_resume_skills
+from app.tasks import enqueue_analysis, enqueue_similarity_update
+from app.utils.file_utils import FileTooLargeError, save_upload
 
 # Configure logging
 logger = logging.getLogger('file_handler')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('file_handler.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 db = DBManager().get_db()
 
@@ -46,17 +46,69 @@ class FileHandler:
     A class to handle file uploads and save them to the database.
     """
 
+    @staticmethod
+    def save(file, upload_folder=None):
+        """
+        Stream an uploaded file to disk, enforcing the configured maximum upload size.
+
+        Args:
+            file (FileStorage): The uploaded file.
+            upload_folder (str, optional): The directory to save the file. Defaults to UPLOAD_FOLDER.
+
+        Returns:
+            SavedFile: The file path, secure filename, SHA-256 and size of the saved file.
+
+        Raises:
+            FileTooLargeError: If the file is larger than MAX_UPLOAD_SIZE.
+        """
+        return save_upload(file, upload_folder or current_app.config['UPLOAD_FOLDER'],
+                           max_size=current_app.config.get('MAX_UPLOAD_SIZE'))
+
+    @staticmethod
+    def store(file, user_id):
+        """
+        Store an uploaded file in the content-addressed blob store and record the upload.
+
+        Identical bytes are stored once; the new UploadedFile row points at the existing blob. The
+        reference to the blob and the UploadedFile row are committed together.
+
+        Args:
+            file (FileStorage): The uploaded file.
+            user_id (int): The ID of the user uploading the file.
+
+        Returns:
+            UploadedFile: The recorded upload.
+
+        Raises:
+            FileTooLargeError: If the file is larger than MAX_UPLOAD_SIZE.
+        """
+        filename = secure_filename(file.filename)
+        blob = current_app.blob_store.store(file.stream, extension=os.path.splitext(filename)[1],
+                                            max_size=current_app.config.get('MAX_UPLOAD_SIZE'))
+        content_hash, storage_path = blob.content_hash, blob.storage_path
+        try:
+            uploaded_file = UploadedFile(user_id=user_id, filename=filename, file_path=storage_path,
+                                         content_hash=content_hash, blob_id=blob.id)
+            db.session.add(uploaded_file)
+            db.session.commit()
+        except Exception:
+            # Drops the reference with the row; a blob created for this upload is removed with its file
+            db.session.rollback()
+            current_app.blob_store.discard_unrecorded(content_hash, storage_path)
+            raise
+        return uploaded_file
+
     @staticmethod
     def upload(request, user_id=None):
         """
-        Save an uploaded file and store its information in the database.
+        Save an uploaded file, store its information in the database and queue its analysis.
 
         Args:
-            request (Request): The Flask request object containing the file.
+            request (Request): The Flask request object containing the file and an optional job_description.
             user_id (int, optional): The ID of the user uploading the file. Defaults to None.
 
         Returns:
-            tuple: JSON response with the upload status and file ID, and the status code.
+            tuple: JSON response with the upload status, file ID and analysis job ID, and the status code.
         """
         logger.info("Handling file upload...")
         if 'resume' not in request.files and 'file' not in request.files:
@@ -70,21 +122,24 @@ class FileHandler:
             flash('No selected file', 'danger')
             return jsonify({'message': 'No selected file'}), 400
 
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
-
         if user_id is None:
             user_id = current_user.id
 
-        # Save the file information to the database
-        uploaded_file = UploadedFile(user_id=user_id, filename=filename, file_path=file_path)
-        db.session.add(uploaded_file)
-        db.session.commit()
+        try:
+            uploaded_file = FileHandler.store(file, user_id)
+        except FileTooLargeError as e:
+            logger.error(f"Rejected upload {file.filename}: {e}")
+            flash('File is too large', 'danger')
+            return jsonify({'message': str(e)}), 413
+        filename = uploaded_file.filename
+
+        job = enqueue_analysis(uploaded_file, request.form.get('job_description', ''), user_id)
 
-        logger.info(f"File {filename} uploaded successfully by user {user_id}")
+        logger.info(f"File {filename} uploaded successfully by user {user_id}, analysis job {job.id}")
         flash('File successfully uploaded', 'success')
-        return jsonify({'message': 'File uploaded successfully', 'file_id': uploaded_file.id}), 201
+        return jsonify({'message': 'File uploaded successfully', 'file_id': uploaded_file.id,
+                        'job_id': job.id, 'status': job.status,
+                        'status_url': url_for('members.job_status', job_id=job.id)}), 202
 
     @staticmethod
     def upload_resume(request):
@@ -109,13 +164,21 @@ class FileHandler:
             flash('No selected file', 'danger')
             return jsonify({'message': 'No selected file'}), 400
 
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(os.getcwd(), 'app/static/uploads', filename)
-        file.save(file_path)
+        try:
+            saved = FileHandler.save(file, os.path.join(os.getcwd(), 'app/static/uploads'))
+        except FileTooLargeError as e:
+            logger.error(f"Rejected upload {file.filename}: {e}")
+            flash('File is too large', 'danger')
+            return jsonify({'message': str(e)}), 413
+        filename = saved.filename
 
-        new_resume = Resume(user_id=current_user.id, content=file.read())
+        # The stream has been consumed by the save, so the content comes from the stored file
+        new_resume = Resume(user_id=current_user.id, content=ResumeParser.extract_text_from_file(saved.file_path))
         db.session.add(new_resume)
+        db.session.flush()
+        record_resume_skills([(new_resume.id, new_resume.content)])
         db.session.commit()
+        enqueue_similarity_update()
 
         logger.info(f"Resume {filename} uploaded successfully by user {current_user.id}")
         flash('File successfully uploaded', 'success')
@@ -4,32 +4,162 @@ file_utils.py
 Author: William Richmond
 Created on: 08 July 2024
 File name: file_utils.py
-Revised: [Add revised date]
+Revised: 18 October 2026
 
 Description:
 This module provides utility functions for handling file operations.
+Uploads are streamed to a temporary file in fixed-size chunks while their SHA-256 and size
+are computed, so memory use stays flat regardless of the file size. Uploads larger than the
+maximum size are rejected as soon as the limit is crossed, and complete files are moved
+into place atomically, so a partially written file is never visible under its final name.
+Before that, request bodies larger than MAX_CONTENT_LENGTH, or the limit of the view they
+are routed to, are refused with 413 without being parsed.
+
+Classes:
+    FileTooLargeError: Raised when an upload exceeds the maximum size.
+    SavedFile: The location, content hash and size of a saved upload.
+    SizeLimitedRequest: A request whose body limit may be raised by the view it is routed to.
 
 Functions:
+    request_size_limit: Lets a view accept request bodies up to a configured size.
+    stream_to_temp_file: Copies a stream to a temporary file, hashing it on the way.
+    save_upload: Streams an uploaded file to the specified directory.
     save_file: Saves an uploaded file to the specified directory.
 
 Usage:
-    Import this module and use the save_file function to handle file saving operations.
+    Import this module and use save_upload for every file upload.
 
 Example:
-    file_path, filename = save_file(file, upload_folder)
+    saved = save_upload(file, upload_folder, max_size=current_app.config['MAX_UPLOAD_SIZE'])
+    print(saved.file_path, saved.content_hash, saved.size)
 """
 
+import hashlib
 import os
+import tempfile
 import logging
+from typing import NamedTuple, Optional, Tuple
+from flask import Request, current_app
 from werkzeug.utils import secure_filename
 
 # Configure logging
 logger = logging.getLogger('file_utils')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('file_utils.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the form fields and multipart headers sent along with a file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """
+    Raised when an upload exceeds the maximum size.
+    """
+
+
+class SavedFile(NamedTuple):
+    """
+    The location, content hash and size of a saved upload.
+    """
+    file_path: str
+    filename: str
+    content_hash: str
+    size: int
+
+
+def request_size_limit(config_key: str):
+    """
+    Lets a view accept request bodies up to a configured size instead of MAX_CONTENT_LENGTH.
+
+    Args:
+        config_key (str): The configuration value holding the largest file accepted, in bytes.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(view):
+        view.request_size_limit = config_key
+        return view
+    return decorator
+
+
+class SizeLimitedRequest(Request):
+    """
+    A request whose body limit may be raised by the view it is routed to.
+    """
+
+    @property
+    def max_content_length(self) -> Optional[int]:
+        view = current_app.view_functions.get(self.endpoint) if current_app and self.endpoint else None
+        config_key = getattr(view, 'request_size_limit', None)
+        if config_key is not None:
+            return current_app.config[config_key] + MULTIPART_OVERHEAD
+        return super().max_content_length
+
+
+def stream_to_temp_file(stream, directory: str, max_size: Optional[int] = None,
+                        chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[str, str, int]:
+    """
+    Copies a stream to a temporary file in the directory, hashing it on the way.
+
+    Args:
+        stream: A binary file-like object to read from.
+        directory (str): The directory the temporary file is created in.
+        max_size (int, optional): The maximum number of bytes to accept.
+        chunk_size (int): The number of bytes read and written at a time.
+
+    Returns:
+        tuple: The temporary file path, the hex SHA-256 and the size in bytes.
+
+    Raises:
+        FileTooLargeError: If the stream is longer than max_size. The temporary file is removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    # Same directory as the destination, so the final rename never crosses file systems
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-', suffix='.part')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            for chunk in iter(lambda: stream.read(chunk_size), b''):
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise FileTooLargeError(f"File exceeds the maximum upload size of {max_size} bytes")
+                digest.update(chunk)
+                temp_file.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path, digest.hexdigest(), size
+
+
+def save_upload(file, upload_folder: str, max_size: Optional[int] = None,
+                chunk_size: int = UPLOAD_CHUNK_SIZE) -> SavedFile:
+    """
+    Streams an uploaded file to the specified directory.
+
+    Args:
+        file (FileStorage): The file to be saved.
+        upload_folder (str): The directory to save the file.
+        max_size (int, optional): The maximum file size in bytes.
+        chunk_size (int): The number of bytes read and written at a time.
+
+    Returns:
+        SavedFile: The file path, secure filename, SHA-256 and size of the saved file.
+
+    Raises:
+        FileTooLargeError: If the file is larger than max_size. Nothing is left on disk.
+    """
+    filename = secure_filename(file.filename)
+    if max_size is not None and file.content_length and file.content_length > max_size:
+        raise FileTooLargeError(f"File exceeds the maximum upload size of {max_size} bytes")
+
+    logger.info(f"Saving file {filename} to {upload_folder}...")
+    temp_path, content_hash, size = stream_to_temp_file(file.stream, upload_folder, max_size, chunk_size)
+    file_path = os.path.join(upload_folder, filename)
+    os.replace(temp_path, file_path)
+    logger.info(f"File {filename} ({size} bytes, sha256 {content_hash}) saved successfully to {file_path}")
+    return SavedFile(file_path, filename, content_hash, size)
 
 
 def save_file(file, upload_folder):
@@ -43,9 +173,5 @@ def save_file(file, upload_folder):
     Returns:
         tuple: The file path and the secure filename.
     """
-    logger.info(f"Saving file {file.filename} to {upload_folder}...")
-    filename = secure_filename(file.filename)
-    file_path = os.path.join(upload_folder, filename)
-    file.save(file_path)
-    logger.info(f"File {filename} saved successfully to {file_path}")
-    return file_path, filename
+    saved = save_upload(file, upload_folder)
+    return saved.file_path, saved.filename
@@ -0,0 +1,238 @@
+"""
+query_benchmark.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: query_benchmark.py
+Revised: [Add revised date]
+
+Description:
+This module benchmarks the foreign key lookups behind the per-user pages, with and without the
+indexes and unique mapping constraints added in migration d93a6b1f4e27.
+A scratch database is created from the models without those indexes, filled with generated rows,
+and every lookup is timed; the indexes are then created and the lookups timed again.
+
+Classes:
+    QueryTiming: The timing of one lookup before and after indexing.
+
+Functions:
+    run_query_benchmark: Runs the benchmark on a scratch database.
+
+Usage:
+    Run 'python manage.py benchmark-queries', or call run_query_benchmark directly.
+
+Example:
+    from app.utils.query_benchmark import run_query_benchmark
+
+    for timing in run_query_benchmark(users=200, resumes_per_user=50):
+        print(timing.to_dict())
+"""
+
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import sqlalchemy as sa
+
+from app.models import db
+
+# The indexes and unique constraints added by migration d93a6b1f4e27
+ADDED_INDEXES = {
+    'ix_resume_user_id', 'ix_feedback_resume_id', 'ix_resume_template_template_id', 'ix_resume_skill_skill_id',
+    'ix_user_session_user_id', 'ix_user_session_session_token', 'ix_log_user_id',
+    'ix_template_category_mapping_category_id', 'ix_uploaded_file_user_id', 'ix_ai_result_file_id',
+}
+ADDED_CONSTRAINTS = {
+    'uq_resume_template_resume_id_template_id', 'uq_resume_skill_resume_id_skill_id',
+    'uq_template_category_mapping_template_id_category_id',
+}
+
+# Lookup name -> (table, column) filtered on
+LOOKUPS = {
+    'resumes_of_user': ('resume', 'user_id'),
+    'feedback_of_resume': ('feedback', 'resume_id'),
+    'skills_of_resume': ('resume_skill', 'resume_id'),
+    'resumes_with_skill': ('resume_skill', 'skill_id'),
+    'uploads_of_user': ('uploaded_file', 'user_id'),
+    'results_of_file': ('ai_result', 'file_id'),
+    'logs_of_user': ('log', 'user_id'),
+    'sessions_of_user': ('user_session', 'user_id'),
+    'session_by_token': ('user_session', 'session_token'),
+}
+
+SKILL_COUNT = 200
+SKILLS_PER_RESUME = 5
+LOGS_PER_USER = 20
+INSERT_CHUNK_SIZE = 10000
+
+
+@dataclass
+class QueryTiming:
+    """
+    The timing of one lookup before and after indexing.
+
+    Attributes:
+        lookup (str): The name of the lookup.
+        before_ms (float): Median time of one lookup without the indexes, in milliseconds.
+        after_ms (float): Median time of one lookup with the indexes, in milliseconds.
+    """
+    lookup: str
+    before_ms: float
+    after_ms: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.before_ms / self.after_ms if self.after_ms else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Return the timing as a JSON serializable dictionary.
+        """
+        return {"lookup": self.lookup, "before_ms": round(self.before_ms, 4), "after_ms": round(self.after_ms, 4),
+                "speedup": round(self.speedup, 1)}
+
+
+def _unindexed_metadata() -> sa.MetaData:
+    """
+    Copy the tables of the models without the indexes and constraints added by the migration.
+    """
+    metadata = sa.MetaData()
+    for table in db.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for index in [index for index in copy.indexes if index.name in ADDED_INDEXES]:
+            copy.indexes.discard(index)
+        for constraint in [constraint for constraint in copy.constraints if constraint.name in ADDED_CONSTRAINTS]:
+            copy.constraints.discard(constraint)
+    return metadata
+
+
+def _create_added_indexes(metadata: sa.MetaData, connection) -> None:
+    """
+    Create the indexes added by the migration on the scratch tables. The unique constraints are
+    created as unique indexes, which is how they are enforced and what lookups use.
+    """
+    for table in db.metadata.sorted_tables:
+        copy = metadata.tables[table.name]
+        added = [(index.name, index.columns, index.unique) for index in table.indexes if index.name in ADDED_INDEXES]
+        added += [(constraint.name, constraint.columns, True) for constraint in table.constraints
+                  if constraint.name in ADDED_CONSTRAINTS]
+        for name, columns, unique in added:
+            sa.Index(name, *[copy.c[column.name] for column in columns], unique=unique).create(connection)
+
+
+def _insert(connection, table: sa.Table, rows) -> None:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == INSERT_CHUNK_SIZE:
+            connection.execute(table.insert(), chunk)
+            chunk = []
+    if chunk:
+        connection.execute(table.insert(), chunk)
+
+
+def _populate(metadata: sa.MetaData, connection, users: int, resumes_per_user: int, rng: random.Random) -> None:
+    """
+    Fill the scratch tables with users, their resumes and the rows hanging off them.
+    """
+    tables = metadata.tables
+    now = datetime.utcnow()
+    resumes = users * resumes_per_user
+    _insert(connection, tables['user'], ({"id": user_id, "first_name": "First", "last_name": "Last",
+                                          "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+                                          "password_hash": "x"} for user_id in range(1, users + 1)))
+    _insert(connection, tables['skill'], ({"id": skill_id, "name": f"skill{skill_id}"}
+                                          for skill_id in range(1, SKILL_COUNT + 1)))
+    # Rows are spread over the users, as they are when many users upload over time
+    owners = [rng.randint(1, users) for _ in range(resumes)]
+    _insert(connection, tables['resume'], ({"id": resume_id, "user_id": owners[resume_id - 1], "content": "resume"}
+                                           for resume_id in range(1, resumes + 1)))
+    _insert(connection, tables['feedback'], ({"resume_id": resume_id, "content": "feedback"}
+                                             for resume_id in range(1, resumes + 1)))
+    _insert(connection, tables['resume_skill'], ({"resume_id": resume_id, "skill_id": skill_id}
+                                                 for resume_id in range(1, resumes + 1)
+                                                 for skill_id in rng.sample(range(1, SKILL_COUNT + 1),
+                                                                            SKILLS_PER_RESUME)))
+    _insert(connection, tables['uploaded_file'], ({"id": file_id, "user_id": owners[file_id - 1],
+                                                   "filename": "resume.pdf", "file_path": "uploads/resume.pdf"}
+                                                  for file_id in range(1, resumes + 1)))
+    _insert(connection, tables['ai_result'], ({"file_id": file_id, "result_data": "{}"}
+                                              for file_id in range(1, resumes + 1)))
+    _insert(connection, tables['log'], ({"user_id": rng.randint(1, users), "action": "login"}
+                                        for _ in range(users * LOGS_PER_USER)))
+    _insert(connection, tables['user_session'], ({"user_id": user_id, "session_token": f"{rng.getrandbits(128):032x}",
+                                                  "expires_at": now + timedelta(days=1)}
+                                                 for user_id in range(1, users + 1)))
+
+
+def _time_lookups(metadata: sa.MetaData, connection, keys: Dict[str, list]) -> Dict[str, float]:
+    """
+    Return the median time of every lookup in milliseconds.
+    """
+    timings = {}
+    for lookup, (table_name, column_name) in LOOKUPS.items():
+        table = metadata.tables[table_name]
+        query = sa.select(table.c.id).where(table.c[column_name] == sa.bindparam('key'))
+        samples = []
+        for key in keys[lookup]:
+            start = time.perf_counter()
+            connection.execute(query, {"key": key}).fetchall()
+            samples.append(time.perf_counter() - start)
+        timings[lookup] = statistics.median(samples) * 1000
+    return timings
+
+
+def run_query_benchmark(users: int = 500, resumes_per_user: int = 100, lookups: int = 50,
+                        database_url: str = 'sqlite://', seed: int = 0) -> List[QueryTiming]:
+    """
+    Run the benchmark on a scratch database.
+
+    Args:
+        users (int): The number of users generated.
+        resumes_per_user (int): The average number of resumes, uploads, results and feedback rows per user.
+        lookups (int): The number of timed lookups per query and schema.
+        database_url (str): The scratch database. Every table of the models is dropped and recreated in it.
+        seed (int): Seed of the generated data and lookup keys.
+
+    Returns:
+        List[QueryTiming]: The timing of every lookup, in the order of LOOKUPS.
+    """
+    rng = random.Random(seed)
+    engine = sa.create_engine(database_url)
+    metadata = _unindexed_metadata()
+    try:
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        with engine.begin() as connection:
+            _populate(metadata, connection, users, resumes_per_user, rng)
+
+        resumes = users * resumes_per_user
+        with engine.connect() as connection:
+            tokens = connection.execute(sa.select(metadata.tables['user_session'].c.session_token)).scalars().all()
+        keys = {}
+        for lookup, (table_name, column_name) in LOOKUPS.items():
+            if lookup == 'session_by_token':
+                keys[lookup] = rng.choices(tokens, k=lookups)
+            elif column_name == 'user_id':
+                keys[lookup] = [rng.randint(1, users) for _ in range(lookups)]
+            elif column_name == 'skill_id':
+                keys[lookup] = [rng.randint(1, SKILL_COUNT) for _ in range(lookups)]
+            else:
+                keys[lookup] = [rng.randint(1, resumes) for _ in range(lookups)]
+
+        with engine.connect() as connection:
+            timings = [QueryTiming(lookup, before_ms)
+                       for lookup, before_ms in _time_lookups(metadata, connection, keys).items()]
+        with engine.begin() as connection:
+            _create_added_indexes(metadata, connection)
+        with engine.connect() as connection:
+            after = _time_lookups(metadata, connection, keys)
+        for timing in timings:
+            timing.after_ms = after[timing.lookup]
+        return timings
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
@@ -12,7 +12,7 @@ for the ResuMate application. It includes functions for extracting text
 from PDF and DOCX files, and for processing resumes using transformers.
 
 Functions:
-    extract_text_from_pdf(file_path): Extracts text from a PDF file.
+    extract_text_from_pdf(file_path): Extracts text from a PDF file, reusing text cached for the same content.
     extract_text_from_docx(file_path): Extracts text from a DOCX file.
     extract_keywords(text): Extracts keywords from the given text using transformers.
     process_resume(file_path): Processes a resume file to extract keywords.
@@ -27,26 +27,18 @@ Example:
 
 import os
 import logging
-from transformers import pipeline
-from pdfminer.high_level import extract_text as extract_pdf_text
 from docx import Document
+from app.services.ner_service import ner_service
+from app.services.text_extraction import pdf_text_cache
 
 # Configure logging
 logger = logging.getLogger('text_utils')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('text_utils.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-# Load pre-trained NLP model from transformers
-logger.info("Loading pre-trained NLP model...")
-nlp = pipeline("ner", model="bert-base-uncased", tokenizer="bert-base-uncased")
 
 
 def extract_text_from_pdf(file_path):
     """
-    Extracts text from a PDF file.
+    Extracts text from a PDF file. The text is cached by file content, so a file is only parsed once.
 
     Parameters:
         file_path (str): The path to the PDF file.
@@ -56,7 +48,7 @@ def extract_text_from_pdf(file_path):
     """
     try:
         logger.info(f"Extracting text from PDF file: {file_path}")
-        return extract_pdf_text(file_path)
+        return pdf_text_cache.get_text(file_path)
     except Exception as e:
         logger.error(f"Error extracting text from PDF file: {e}")
         raise
@@ -93,8 +85,7 @@ def extract_keywords(text):
     """
     try:
         logger.info("Extracting keywords from text")
-        ner_results = nlp(text)
-        keywords = [result['word'] for result in ner_results if result['entity'] == 'LABEL_1']
+        keywords = ner_service.extract_keywords(text)
         logger.info(f"Extracted keywords: {keywords}")
         return keywords
     except Exception as e:
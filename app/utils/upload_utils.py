@@ -19,30 +19,26 @@ Example:
     from app.utils.upload_utils import handle_file_upload
 """
 
-import os
 import logging
-from flask import current_app, request, jsonify
-from werkzeug.utils import secure_filename
-from app.models import UploadedFile
+from flask import request, jsonify, url_for
 from app.db_manager import DBManager
+from app.tasks import enqueue_analysis
+from app.utils.file_handler import FileHandler
+from app.utils.file_utils import FileTooLargeError
 
 # Configure logging
 logger = logging.getLogger('upload_utils')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('upload_utils.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 db = DBManager().get_db()
 
 
 def handle_file_upload():
     """
-    Handles the file upload logic and saves the file.
+    Handles the file upload logic, saves the file and queues its analysis.
 
     Returns:
-        response (dict): JSON response with the upload status and file ID.
+        response (dict): JSON response with the upload status, file ID and analysis job ID.
     """
     try:
         logger.info("Handling file upload...")
@@ -55,16 +51,19 @@ def handle_file_upload():
             return jsonify({'error': 'No selected file'}), 400
 
         user_id = request.form.get('user_id')
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        try:
+            uploaded_file = FileHandler.store(file, user_id)
+        except FileTooLargeError as e:
+            logger.error(f"Rejected upload {file.filename}: {e}")
+            return jsonify({'error': str(e)}), 413
+        filename = uploaded_file.filename
 
-        uploaded_file = UploadedFile(user_id=user_id, filename=filename, file_path=file_path)
-        db.session.add(uploaded_file)
-        db.session.commit()
+        job = enqueue_analysis(uploaded_file, request.form.get('job_description', ''), user_id)
 
-        logger.info(f"File {filename} uploaded successfully by user {user_id}")
-        return jsonify({'message': 'File uploaded successfully', 'file_id': uploaded_file.id}), 201
+        logger.info(f"File {filename} uploaded successfully by user {user_id}, analysis job {job.id}")
+        return jsonify({'message': 'File uploaded successfully', 'file_id': uploaded_file.id,
+                        'job_id': job.id, 'status': job.status,
+                        'status_url': url_for('members.job_status', job_id=job.id)}), 202
     except Exception as e:
         logger.error(f"Error handling file upload: {e}")
         return jsonify({'error': 'An error occurred during file upload'}), 500
@@ -0,0 +1,23 @@
+"""
+celery_worker.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: celery_worker.py
+Revised: [Add revised date]
+
+Description:
+This script creates the Flask application for Celery workers, so tasks run with the
+application's configuration, database and AI services.
+
+Usage:
+    Start a worker that processes queued resume analyses.
+
+Example:
+    celery -A celery_worker.celery worker --loglevel=info
+"""
+
+from app import create_app
+from app.tasks import celery  # noqa: F401 - imported for the Celery command line
+
+app = create_app()
@@ -41,10 +41,6 @@ log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
 os.makedirs(log_dir, exist_ok=True)
 logger = logging.getLogger('config')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler(os.path.join(log_dir, 'config.log'))
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 
 class Config:
@@ -74,8 +70,88 @@ class Config:
     SQLALCHEMY_ECHO = True
     SESSION_TYPE = "filesystem"
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'uploads')
-    CELERY_BROKER_URL = 'redis://localhost:6379/0'
-    CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
+    # Largest accepted upload in bytes; uploads are streamed to disk and rejected once they exceed it
+    MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+    # Larger request bodies are refused with 413 before they are parsed; the extra 64 KB is for the form fields
+    MAX_CONTENT_LENGTH = MAX_UPLOAD_SIZE + 64 * 1024
+    # Uploaded contents are stored once per SHA-256 under this directory
+    BLOB_STORE_FOLDER = os.path.join(UPLOAD_FOLDER, 'blobs')
+    # Bulk ingestion: rows inserted per transaction, text extraction processes and largest archive accepted
+    INGEST_BATCH_SIZE = 200
+    INGEST_WORKERS = min(4, os.cpu_count() or 1)
+    INGEST_MAX_ARCHIVE_SIZE = 2 * 1024 * 1024 * 1024
+    # Uploaded archives wait here for the ingest task; it must be shared with the Celery workers
+    INGEST_FOLDER = os.path.join(UPLOAD_FOLDER, 'ingest')
+    # Candidate ranking: candidates returned by default and the most a request may ask for
+    CANDIDATE_RANK_TOP_K = 10
+    CANDIDATE_RANK_MAX_K = 100
+    # Most resume IDs returned by one skill search
+    SKILL_SEARCH_MAX_RESULTS = 1000
+    # User listings: users per page by default and the most a request may ask for
+    USERS_PAGE_SIZE = 50
+    USERS_MAX_PAGE_SIZE = 200
+    # Logging: every logger writes through one queue and a background thread to LOG_FOLDER/LOG_FILE as JSON
+    # lines (or text if LOG_JSON is off), rotated at LOG_MAX_BYTES, or by time if LOG_ROTATE_WHEN is set
+    LOG_FOLDER = log_dir
+    LOG_FILE = 'app.log'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_MAX_BYTES = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT = 5
+    LOG_ROTATE_WHEN = os.environ.get('LOG_ROTATE_WHEN') or None
+    LOG_JSON = True
+    # Loggers kept out of the log file, with their children: SQL echo already goes to the console
+    LOG_EXCLUDED_LOGGERS = ('sqlalchemy.engine',)
+    # Admin log viewer: the directory of the viewable log files, entries per page by default and the most
+    # a request may ask for, and how often and for how long a followed log is polled per connection
+    LOG_VIEWER_FOLDER = log_dir
+    LOG_VIEWER_PAGE_SIZE = 200
+    LOG_VIEWER_MAX_PAGE_SIZE = 1000
+    LOG_FOLLOW_POLL_INTERVAL = 1.0
+    LOG_FOLLOW_MAX_DURATION = 300
+    # Memory-mapped nearest-neighbour index of resume embeddings, and inverted lists scanned per query
+    SIMILARITY_INDEX_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'indexes', 'similarity')
+    SIMILARITY_INDEX_PROBES = 8
+    CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL') or 'redis://localhost:6379/0'
+    CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND') or 'redis://localhost:6379/0'
+    # Run queued tasks in the calling process instead of sending them to a worker
+    CELERY_TASK_ALWAYS_EAGER = False
+    # Long polling of analysis jobs: the longest a status request is held, and how often the job is re-read
+    JOB_POLL_MAX_WAIT = 30
+    JOB_POLL_INTERVAL = 0.5
+    # Load the NLP models in a background thread at startup instead of on first use
+    MODEL_WARMUP = os.environ.get('MODEL_WARMUP', '').lower() in ('1', 'true', 'yes')
+    # Build the candidate and skill indexes in a background thread at startup instead of on first use
+    INDEX_WARMUP = os.environ.get('INDEX_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+    # Resume changes every index refresh reads again; must exceed the longest transaction writing resumes
+    INDEX_REFRESH_WINDOW = 60
+    # Seconds between two checks of the indexes for deleted resumes
+    INDEX_RECONCILE_INTERVAL = 60
+    # NER keyword extraction: requests waiting for the model before new ones are refused, and seconds a caller waits
+    NER_QUEUE_SIZE = 64
+    NER_TIMEOUT = 60
+    # Micro-batching of resume classification requests
+    AI_BATCH_MAX_SIZE = 16
+    AI_BATCH_MAX_WAIT_MS = 10
+    # Sliding-window scoring of long resumes: tokens shared by consecutive windows, and
+    # how window scores are combined ('mean', 'max' or 'length_weighted')
+    AI_WINDOW_OVERLAP = 128
+    AI_WINDOW_AGGREGATION = 'mean'
+    # Keyword matching of the content analysis: 'exact', or 'semantic' to also credit phrases whose
+    # word vectors are at least SEMANTIC_MATCH_THRESHOLD similar to a keyword (needs a model with vectors)
+    CONTENT_ANALYSIS_MODE = os.environ.get('CONTENT_ANALYSIS_MODE', 'exact')
+    SEMANTIC_MATCH_THRESHOLD = 0.7
+    # Number of analysis results kept in the in-process cache (the database tier is unbounded)
+    ANALYSIS_CACHE_SIZE = 1024
+    # PDFs with at least PDF_PARALLEL_MIN_PAGES pages are extracted page by page in worker processes
+    PDF_EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+    PDF_PAGE_TIMEOUT = 30
+    PDF_PARALLEL_MIN_PAGES = 8
+    # Latency histograms of the analysis pipeline stages, served by /metrics in the Prometheus text format
+    # to admins, or to scrapers sending 'Authorization: Bearer <METRICS_TOKEN>'; bucket bounds are in seconds
+    TRACING_ENABLED = os.environ.get('TRACING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or None
+    METRICS_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                               30.0, 60.0)
 
     @staticmethod
     def init_app(app):
@@ -96,6 +172,13 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    CELERY_BROKER_URL = 'memory://'
+    CELERY_RESULT_BACKEND = 'cache+memory://'
+    CELERY_TASK_ALWAYS_EAGER = True
+    # The similarity index needs the word vectors of the large SpaCy model
+    SIMILARITY_INDEX_FOLDER = None
+    # The tables are created after the application
+    INDEX_WARMUP = False
 
 
 config = {
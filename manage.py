@@ -4,7 +4,7 @@ manage.py
 Author: William Richmond
 Created on: 01 July 2024
 File name: manage.py
-Revised: 23 July 2024
+Revised: 18 October 2026
 
 Description:
 This script sets up the Flask application, initializing the database and migration tool.
@@ -16,17 +16,24 @@ Usage:
 Example:
     python manage.py runserver
     python manage.py db init
+    python manage.py ingest campus_drop/ --user-id 1
+    python manage.py benchmark-queries --users 1000
 """
 
+import json
 import logging
+import os
 import click
 from flask_migrate import Migrate, init as migrate_init, migrate as migrate_migrate, upgrade as migrate_upgrade
 from app import create_app
 from app.db_manager import db
 from app.models import (
     User, Resume, Feedback, Template, ResumeTemplate, Skill, ResumeSkill, JobDescription,
-    UserSession, Log, Admin, TemplateCategory, TemplateCategoryMapping, FeedbackTemplate, UploadedFile, AIResult
+    UserSession, Log, TemplateCategory, TemplateCategoryMapping, FeedbackTemplate, UploadedFile, AIResult
 )
+from app.services.bulk_ingest import BulkIngestor, iter_archive, iter_directory
+from app.tasks import enqueue_similarity_update
+from app.utils.query_benchmark import run_query_benchmark
 
 # Create and configure the Flask application
 app = create_app()
@@ -50,7 +57,7 @@ def make_shell_context():
     return {
         'app': app, 'db': db, 'User': User, 'Resume': Resume, 'Feedback': Feedback, 'Template': Template,
         'ResumeTemplate': ResumeTemplate, 'Skill': Skill, 'ResumeSkill': ResumeSkill, 'JobDescription': JobDescription,
-        'UserSession': UserSession, 'Log': Log, 'Admin': Admin, 'TemplateCategory': TemplateCategory,
+        'UserSession': UserSession, 'Log': Log, 'TemplateCategory': TemplateCategory,
         'TemplateCategoryMapping': TemplateCategoryMapping, 'FeedbackTemplate': FeedbackTemplate,
         'UploadedFile': UploadedFile, 'AIResult': AIResult
     }
@@ -100,5 +107,57 @@ def db(command, message):
         logger.error(f"Error performing database migration: {e}")
 
 
+@cli.command()
+@click.argument('path', type=click.Path(exists=True))
+@click.option('--user-id', required=True, type=int, help='The user the resumes are ingested for')
+@click.option('--batch-size', default=None, type=int, help='Rows inserted per transaction')
+@click.option('--workers', default=None, type=int, help='Text extraction processes')
+def ingest(path, user_id, batch_size, workers):
+    """
+    Ingest every resume in a directory or a zip/tar archive.
+
+    Args:
+        path (str): The directory or archive to ingest.
+        user_id (int): The ID of the user the resumes are ingested for.
+        batch_size (int): The number of rows inserted per transaction.
+        workers (int): The number of text extraction processes.
+    """
+    try:
+        with app.app_context():
+            ingestor = BulkIngestor(app.blob_store, user_id,
+                                    batch_size=batch_size or app.config['INGEST_BATCH_SIZE'],
+                                    max_workers=workers or app.config['INGEST_WORKERS'],
+                                    max_size=app.config.get('MAX_UPLOAD_SIZE'))
+            entries = iter_directory(path) if os.path.isdir(path) else iter_archive(path)
+            report = ingestor.ingest(entries)
+            enqueue_similarity_update()
+            click.echo(json.dumps(report.to_dict(), indent=2))
+    except Exception as e:
+        logger.error(f"Error ingesting {path}: {e}")
+
+
+@cli.command('benchmark-queries')
+@click.option('--users', default=500, type=int, help='Users generated in the scratch database')
+@click.option('--resumes-per-user', default=100, type=int, help='Resumes generated per user')
+@click.option('--lookups', default=50, type=int, help='Timed lookups per query')
+@click.option('--database-url', default='sqlite://', help='The scratch database, emptied before and after')
+def benchmark_queries(users, resumes_per_user, lookups, database_url):
+    """
+    Time the foreign key lookups with and without the indexes of the models.
+
+    Args:
+        users (int): The number of users generated.
+        resumes_per_user (int): The number of resumes generated per user.
+        lookups (int): The number of timed lookups per query.
+        database_url (str): The scratch database.
+    """
+    try:
+        timings = run_query_benchmark(users=users, resumes_per_user=resumes_per_user, lookups=lookups,
+                                      database_url=database_url)
+        click.echo(json.dumps([timing.to_dict() for timing in timings], indent=2))
+    except Exception as e:
+        logger.error(f"Error running the query benchmark: {e}")
+
+
 if __name__ == '__main__':
     cli()
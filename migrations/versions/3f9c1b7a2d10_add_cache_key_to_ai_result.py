@@ -0,0 +1,33 @@
+"""Add cache key to ai_result
+
+Revision ID: 3f9c1b7a2d10
+Revises: ec4082a2eb95
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1b7a2d10'
+down_revision: Union[str, None] = 'ec4082a2eb95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('ai_result') as batch_op:
+        batch_op.add_column(sa.Column('cache_key', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+        batch_op.alter_column('file_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.create_index('ix_ai_result_cache_key', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('ai_result') as batch_op:
+        batch_op.drop_index('ix_ai_result_cache_key')
+        batch_op.alter_column('file_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('created_at')
+        batch_op.drop_column('cache_key')
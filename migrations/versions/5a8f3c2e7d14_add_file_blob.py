@@ -0,0 +1,40 @@
+"""Add file_blob and uploaded_file blob reference
+
+Revision ID: 5a8f3c2e7d14
+Revises: c41d7e9a5b62
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8f3c2e7d14'
+down_revision: Union[str, None] = 'c41d7e9a5b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('file_blob',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('content_hash', sa.String(length=64), nullable=False),
+                    sa.Column('size', sa.BigInteger(), nullable=False),
+                    sa.Column('storage_path', sa.String(length=256), nullable=False),
+                    sa.Column('ref_count', sa.Integer(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=True),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('content_hash')
+                    )
+    with op.batch_alter_table('uploaded_file') as batch_op:
+        batch_op.add_column(sa.Column('blob_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_uploaded_file_blob_id', 'file_blob', ['blob_id'], ['id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('uploaded_file') as batch_op:
+        batch_op.drop_constraint('fk_uploaded_file_blob_id', type_='foreignkey')
+        batch_op.drop_column('blob_id')
+    op.drop_table('file_blob')
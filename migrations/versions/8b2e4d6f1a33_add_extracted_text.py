@@ -0,0 +1,39 @@
+"""Add extracted_text and uploaded_file content hash
+
+Revision ID: 8b2e4d6f1a33
+Revises: 3f9c1b7a2d10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6f1a33'
+down_revision: Union[str, None] = '3f9c1b7a2d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('extracted_text',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('content_hash', sa.String(length=64), nullable=False),
+                    sa.Column('pages', sa.Text(), nullable=False),
+                    sa.Column('page_count', sa.Integer(), nullable=False),
+                    sa.Column('created_at', sa.DateTime(), nullable=True),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('content_hash')
+                    )
+    with op.batch_alter_table('uploaded_file') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_uploaded_file_content_hash', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('uploaded_file') as batch_op:
+        batch_op.drop_index('ix_uploaded_file_content_hash')
+        batch_op.drop_column('content_hash')
+    op.drop_table('extracted_text')
@@ -0,0 +1,34 @@
+"""Add resume revision and keywords
+
+Revision ID: a7d3f9c2e184
+Revises: e6b2c8d41f09
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9c2e184'
+down_revision: Union[str, None] = 'e6b2c8d41f09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing resumes keep NULL keywords and are vectorized from their content when first indexed
+    with op.batch_alter_table('resume') as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='1'))
+        batch_op.add_column(sa.Column('keywords', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('taxonomy_version', sa.String(length=16), nullable=True))
+        batch_op.create_index('ix_resume_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume') as batch_op:
+        batch_op.drop_index('ix_resume_updated_at')
+        batch_op.drop_column('taxonomy_version')
+        batch_op.drop_column('keywords')
+        batch_op.drop_column('revision')
@@ -0,0 +1,40 @@
+"""Add analysis_job
+
+Revision ID: c41d7e9a5b62
+Revises: 8b2e4d6f1a33
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a5b62'
+down_revision: Union[str, None] = '8b2e4d6f1a33'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('analysis_job',
+                    sa.Column('id', sa.String(length=36), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=True),
+                    sa.Column('file_id', sa.Integer(), nullable=False),
+                    sa.Column('job_description', sa.Text(), nullable=True),
+                    sa.Column('status', sa.String(length=16), nullable=False),
+                    sa.Column('progress', sa.Float(), nullable=False),
+                    sa.Column('error', sa.Text(), nullable=True),
+                    sa.Column('ai_result_id', sa.Integer(), nullable=True),
+                    sa.Column('created_at', sa.DateTime(), nullable=True),
+                    sa.Column('updated_at', sa.DateTime(), nullable=True),
+                    sa.ForeignKeyConstraint(['ai_result_id'], ['ai_result.id'], ),
+                    sa.ForeignKeyConstraint(['file_id'], ['uploaded_file.id'], ),
+                    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+
+
+def downgrade() -> None:
+    op.drop_table('analysis_job')
@@ -0,0 +1,59 @@
+"""Add foreign key indexes and unique mapping constraints
+
+Revision ID: d93a6b1f4e27
+Revises: 5a8f3c2e7d14
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a6b1f4e27'
+down_revision: Union[str, None] = '5a8f3c2e7d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) of every single column index added
+INDEXES = [
+    ('resume', 'user_id'),
+    ('feedback', 'resume_id'),
+    ('resume_template', 'template_id'),
+    ('resume_skill', 'skill_id'),
+    ('user_session', 'user_id'),
+    ('user_session', 'session_token'),
+    ('log', 'user_id'),
+    ('template_category_mapping', 'category_id'),
+    ('uploaded_file', 'user_id'),
+    ('ai_result', 'file_id'),
+]
+
+# (table, columns) of the mapping tables. The unique constraint also indexes the first column.
+UNIQUE_MAPPINGS = [
+    ('resume_template', ('resume_id', 'template_id')),
+    ('resume_skill', ('resume_id', 'skill_id')),
+    ('template_category_mapping', ('template_id', 'category_id')),
+]
+
+
+def upgrade() -> None:
+    for table, columns in UNIQUE_MAPPINGS:
+        # Keep the first row of every duplicated pair, or the constraint cannot be created
+        group_by = ', '.join(columns)
+        op.execute(f"DELETE FROM {table} WHERE id NOT IN "
+                   f"(SELECT id FROM (SELECT MIN(id) AS id FROM {table} GROUP BY {group_by}) AS first_rows)")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_unique_constraint(f"uq_{table}_{'_'.join(columns)}", list(columns))
+
+    for table, column in INDEXES:
+        op.create_index(f'ix_{table}_{column}', table, [column], unique=False)
+
+
+def downgrade() -> None:
+    for table, column in reversed(INDEXES):
+        op.drop_index(f'ix_{table}_{column}', table_name=table)
+
+    for table, columns in reversed(UNIQUE_MAPPINGS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f"uq_{table}_{'_'.join(columns)}", type_='unique')
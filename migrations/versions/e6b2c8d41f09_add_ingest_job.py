@@ -0,0 +1,40 @@
+"""Add ingest_job
+
+Revision ID: e6b2c8d41f09
+Revises: d93a6b1f4e27
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Union, Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2c8d41f09'
+down_revision: Union[str, None] = 'd93a6b1f4e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ingest_job',
+                    sa.Column('id', sa.String(length=36), nullable=False),
+                    sa.Column('user_id', sa.Integer(), nullable=False),
+                    sa.Column('filename', sa.String(length=256), nullable=False),
+                    sa.Column('archive_path', sa.String(length=512), nullable=False),
+                    sa.Column('status', sa.String(length=16), nullable=False),
+                    sa.Column('files', sa.Integer(), nullable=False),
+                    sa.Column('report', sa.Text(), nullable=True),
+                    sa.Column('error', sa.Text(), nullable=True),
+                    sa.Column('created_at', sa.DateTime(), nullable=True),
+                    sa.Column('updated_at', sa.DateTime(), nullable=True),
+                    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_ingest_job_user_id', 'ingest_job', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingest_job_user_id', table_name='ingest_job')
+    op.drop_table('ingest_job')
@@ -24,10 +24,6 @@ from app import create_app, db_manager  # Import db_manager instead of db
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('script')
-handler = logging.FileHandler('script.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 try:
     app = create_app()
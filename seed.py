@@ -20,10 +20,6 @@ from sqlalchemy.exc import SQLAlchemyError
 # Configure logging
 logger = logging.getLogger('seed')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('seed.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 app = create_app('development')
 
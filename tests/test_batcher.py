@@ -0,0 +1,134 @@
+"""
+test_batcher.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_batcher.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the DynamicBatcher class and the micro-batched,
+sliding-window classification path of AIService. A stand-in model is used so no model is downloaded.
+
+Classes:
+    TestDynamicBatcher: Unit tests for the DynamicBatcher class.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_batcher
+"""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from app.services.ai_service import AIService
+from app.services.batcher import DynamicBatcher
+from app.services.model_registry import model_registry
+
+
+class FakeTokenizer:
+    """
+    A whitespace tokenizer standing in for a HuggingFace tokenizer.
+    """
+    model_max_length = 6
+
+    @staticmethod
+    def num_special_tokens_to_add():
+        return 2
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {'input_ids': [[len(word) for word in text.split()] for text in texts]}
+
+
+def fake_classifier():
+    """
+    Build a stand-in for a text-classification pipeline.
+    """
+    config = SimpleNamespace(id2label={0: 'NEGATIVE', 1: 'POSITIVE'}, max_position_embeddings=512)
+    return SimpleNamespace(tokenizer=FakeTokenizer(), model=SimpleNamespace(config=config))
+
+
+class TestDynamicBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.batches = []
+
+        def double_all(items):
+            self.batches.append(list(items))
+            return [item * 2 for item in items]
+
+        self.batcher = DynamicBatcher(double_all, max_batch_size=8, max_wait_ms=50)
+
+    def test_concurrent_requests_are_batched(self):
+        """
+        Test that concurrent callers are served in shared batches and each gets its own result.
+        """
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(self.batcher.process, range(32)))
+
+        self.assertEqual(results, [i * 2 for i in range(32)])
+        self.assertTrue(all(len(batch) <= 8 for batch in self.batches))
+        self.assertLess(len(self.batches), 32)
+
+        stats = self.batcher.stats()
+        self.assertEqual(stats["items"], 32)
+        self.assertEqual(stats["batches"], len(self.batches))
+        self.assertAlmostEqual(stats["fill_rate"], 32 / len(self.batches) / 8)
+
+    def test_errors_are_returned_to_every_caller(self):
+        """
+        Test that a failing batch raises the error in the calling thread.
+        """
+        batcher = DynamicBatcher(lambda items: 1 / 0, max_batch_size=4, max_wait_ms=1)
+        with self.assertRaises(ZeroDivisionError):
+            batcher.process("resume")
+
+    def test_ai_service_batches_classification(self):
+        """
+        Test that AIService.analyze_resume classifies through the batcher.
+        """
+        ai_service = AIService(model_path='test-classifier', max_batch_size=4, max_wait_ms=20)
+        model_registry.register(ai_service.model_name, fake_classifier)
+        batch_sizes = []
+
+        def predict_windows(windows):
+            batch_sizes.append(len(windows))
+            return np.array([[0.2, 0.8] for _ in windows])
+
+        with patch.object(ai_service, '_predict_windows', side_effect=predict_windows):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda text: ai_service.analyze_resume(text, "Python developer"),
+                                            ["Python", "Java developer", "SQL", "Python and SQL"]))
+
+        self.assertEqual([result["ai_analysis"][0]["label"] for result in results], ["POSITIVE"] * 4)
+        self.assertEqual(sum(batch_sizes), 4)
+        self.assertEqual(ai_service.batch_stats()["items"], 4)
+
+    def test_ai_service_scores_long_resumes_in_windows(self):
+        """
+        Test that a long resume is split into overlapping windows that are scored together.
+        """
+        ai_service = AIService(model_path='test-classifier', window_overlap=1, aggregation='max')
+        model_registry.register(ai_service.model_name, fake_classifier)
+        scored_windows = []
+
+        def predict_windows(windows):
+            scored_windows.extend(windows)
+            return np.array([[0.9, 0.1]] + [[0.4, 0.6] for _ in windows[1:]])
+
+        with patch.object(ai_service, '_predict_windows', side_effect=predict_windows):
+            result = ai_service.analyze_resume("a bb ccc dddd eeeee ffffff", "Python developer")
+
+        # Four tokens per window with one token of overlap
+        self.assertEqual(scored_windows, [[1, 2, 3, 4], [4, 5, 6]])
+        self.assertEqual(result["ai_analysis"][0]["label"], "NEGATIVE")
+        self.assertAlmostEqual(result["ai_analysis"][0]["score"], 0.9, places=5)
+        self.assertEqual(result["ai_analysis"][0]["windows"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+test_blob_store.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_blob_store.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the BlobStore class.
+
+Classes:
+    TestBlobStore: Unit tests for content-addressed storage and reference counting.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_blob_store
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from sqlalchemy.exc import IntegrityError
+from werkzeug.datastructures import FileStorage
+from app.db_manager import db
+from app.models import FileBlob, UploadedFile, User
+from app.services.blob_store import BlobStore
+from app.utils.file_handler import FileHandler
+from tests.base_test import TestBaseTestCase
+
+
+class TestBlobStore(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.root = tempfile.mkdtemp()
+        self.blob_store = BlobStore(self.root)
+        self.user = User.query.filter_by(username='testuser').first()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        super().tearDown()
+
+    def record_upload(self, blob, filename='resume.pdf'):
+        uploaded_file = UploadedFile(user_id=self.user.id, filename=filename, file_path=blob.storage_path,
+                                     content_hash=blob.content_hash, blob_id=blob.id)
+        db.session.add(uploaded_file)
+        db.session.commit()
+        return uploaded_file
+
+    def test_content_is_stored_by_hash(self):
+        """
+        Test that content is stored under a path derived from its SHA-256.
+        """
+        blob = self.blob_store.store(io.BytesIO(b"resume one"), extension='.PDF')
+        content_hash = hashlib.sha256(b"resume one").hexdigest()
+
+        self.assertEqual(blob.content_hash, content_hash)
+        self.assertEqual(blob.storage_path,
+                         os.path.join(self.root, content_hash[:2], content_hash[2:4], content_hash + '.pdf'))
+        with open(blob.storage_path, 'rb') as f:
+            self.assertEqual(f.read(), b"resume one")
+        self.assertEqual(os.listdir(self.blob_store.temp_dir), [])
+
+    def test_identical_content_is_stored_once(self):
+        """
+        Test that identical uploads share one blob and different uploads with the same name do not collide.
+        """
+        first = self.blob_store.store(io.BytesIO(b"resume one"), extension='.pdf')
+        second = self.blob_store.store(io.BytesIO(b"resume one"), extension='.pdf')
+        other = self.blob_store.store(io.BytesIO(b"resume two"), extension='.pdf')
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(second.ref_count, 2)
+        self.assertNotEqual(other.storage_path, first.storage_path)
+        self.assertEqual(FileBlob.query.count(), 2)
+
+    def test_unreferenced_blobs_are_collected(self):
+        """
+        Test that deleting uploads releases references and unreferenced blobs are removed.
+        """
+        blob = self.blob_store.store(io.BytesIO(b"resume one"), extension='.pdf')
+        first = self.record_upload(blob)
+        blob = self.blob_store.store(io.BytesIO(b"resume one"), extension='.pdf')
+        second = self.record_upload(blob)
+
+        db.session.delete(first)
+        db.session.commit()
+        self.assertEqual(self.blob_store.collect_garbage(), 0)
+        self.assertTrue(os.path.exists(blob.storage_path))
+
+        db.session.delete(second)
+        db.session.commit()
+        self.assertEqual(self.blob_store.collect_garbage(), 1)
+        self.assertFalse(os.path.exists(blob.storage_path))
+        self.assertEqual(FileBlob.query.count(), 0)
+
+    def test_failed_upload_leaves_no_reference(self):
+        """
+        Test that a reference is committed with its upload row, so a failed insert drops the reference
+        and removes the file of a blob created for the upload.
+        """
+        self.app.blob_store = self.blob_store
+        shared = self.record_upload(self.blob_store.store(io.BytesIO(b"resume one"), extension='.pdf'))
+
+        for content in (b"resume one", b"resume two"):
+            upload = FileStorage(io.BytesIO(content), filename='resume.pdf')
+            with self.assertRaises(IntegrityError):
+                # The user is required
+                FileHandler.store(upload, None)
+
+        self.assertEqual([(blob.content_hash, blob.ref_count) for blob in FileBlob.query.all()],
+                         [(shared.content_hash, 1)])
+        self.assertTrue(os.path.exists(shared.file_path))
+        new_hash = hashlib.sha256(b"resume two").hexdigest()
+        self.assertFalse(os.path.exists(self.blob_store.path_for(new_hash, '.pdf')))
+
+    def test_files_are_kept_if_the_garbage_commit_fails(self):
+        """
+        Test that blob files are only removed once the deletion of their rows is committed.
+        """
+        blob = self.blob_store.store(io.BytesIO(b"resume one"), extension='.pdf')
+        db.session.delete(self.record_upload(blob))
+        db.session.commit()
+
+        with patch.object(db.session, 'commit', side_effect=IntegrityError('DELETE', {}, Exception())):
+            self.assertEqual(self.blob_store.collect_garbage(), 0)
+        self.assertTrue(os.path.exists(blob.storage_path))
+        self.assertEqual(FileBlob.query.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
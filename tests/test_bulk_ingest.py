@@ -0,0 +1,179 @@
+"""
+test_bulk_ingest.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_bulk_ingest.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for bulk resume ingestion from archives and directories.
+
+Classes:
+    TestBulkIngest: Tests for BulkIngestor, the archive readers and the admin ingest endpoint.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_bulk_ingest
+"""
+
+import io
+import multiprocessing
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+from app.db_manager import db
+from app.models import FileBlob, Resume, ResumeSkill, UploadedFile, User
+from app.services.blob_store import BlobStore
+from app.services.bulk_ingest import BulkIngestor, iter_archive, iter_directory
+from tests.base_test import TestBaseTestCase
+
+FILES = {
+    'drop/alice.txt': b"Alice Smith\nSkills: Python, SQL",
+    'drop/bob.txt': b"Bob Jones\nSkills: Java",
+    'drop/copy_of_alice.txt': b"Alice Smith\nSkills: Python, SQL",
+    'drop/empty.txt': b"   ",
+    'drop/notes.csv': b"not,a,resume",
+    '__MACOSX/drop/._alice.txt': b"metadata",
+}
+
+
+def ingest_in_daemon(ingestor, archive_path, results):
+    # Runs in a daemonic process, like the workers of Celery's prefork pool
+    report = ingestor.ingest(iter_archive(archive_path))
+    results.put((report.ingested, report.duplicates, [failure["file"] for failure in report.failures],
+                 Resume.query.count()))
+
+
+class TestBulkIngest(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.work_dir = tempfile.mkdtemp()
+        self.blob_store = BlobStore(os.path.join(self.work_dir, 'blobs'))
+        self.app.blob_store = self.blob_store
+        self.user = User.query.filter_by(username='testuser').first()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+        super().tearDown()
+
+    def write_tar(self):
+        archive_path = os.path.join(self.work_dir, 'drop.tar.gz')
+        with tarfile.open(archive_path, 'w:gz') as archive:
+            for name, content in FILES.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                archive.addfile(info, io.BytesIO(content))
+        return archive_path
+
+    def assert_drop_ingested(self, report):
+        self.assertEqual(report.files, 4)
+        self.assertEqual(report.ingested, 3)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual([failure["file"] for failure in report.failures], ['drop/empty.txt'])
+        self.assertEqual(UploadedFile.query.count(), 4)
+        self.assertEqual(Resume.query.count(), 3)
+        self.assertEqual(FileBlob.query.filter(FileBlob.ref_count == 2).count(), 1)
+        # Python and SQL twice, Java once
+        self.assertEqual(ResumeSkill.query.count(), 5)
+
+    def test_ingest_tar_archive_in_worker_processes(self):
+        """
+        Test that a streamed tar archive is ingested with parallel extraction and batched inserts.
+        """
+        ingestor = BulkIngestor(self.blob_store, self.user.id, batch_size=2, max_workers=2)
+        report = ingestor.ingest(iter_archive(self.write_tar()))
+        self.assert_drop_ingested(report)
+        self.assertIn("Skills: Java", [resume.content for resume in Resume.query.all()][1])
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_ingest_in_daemonic_process_extracts_in_process(self):
+        """
+        Test that ingesting from a daemonic process, which may not start worker processes, still
+        extracts every file.
+        """
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        ingestor = BulkIngestor(self.blob_store, self.user.id, batch_size=2, max_workers=2)
+        worker = context.Process(target=ingest_in_daemon, args=(ingestor, self.write_tar(), results), daemon=True)
+        worker.start()
+        worker.join(60)
+
+        self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(results.get(timeout=5), (3, 1, ['drop/empty.txt'], 3))
+
+    def test_ingest_zip_archive(self):
+        """
+        Test that the members of a zip archive are ingested.
+        """
+        archive_path = os.path.join(self.work_dir, 'drop.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            for name, content in FILES.items():
+                archive.writestr(name, content)
+
+        report = BulkIngestor(self.blob_store, self.user.id, max_workers=1).ingest(iter_archive(archive_path))
+        self.assert_drop_ingested(report)
+
+    def test_ingest_directory(self):
+        """
+        Test that the resumes under a directory are ingested.
+        """
+        for name, content in FILES.items():
+            path = os.path.join(self.work_dir, 'source', name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+
+        report = BulkIngestor(self.blob_store, self.user.id, max_workers=1).ingest(
+            iter_directory(os.path.join(self.work_dir, 'source')))
+        self.assert_drop_ingested(report)
+        self.assertEqual(report.to_dict()["failed"], 1)
+
+    def test_ingest_endpoint_requires_admin(self):
+        """
+        Test that the admin ingest endpoint rejects regular users and queues the archive for admins,
+        whose job reports on it once done.
+        """
+        self.app.config['INGEST_WORKERS'] = 1
+        self.app.config['INGEST_FOLDER'] = os.path.join(self.work_dir, 'ingest')
+        self.set_user_session()
+        with open(self.write_tar(), 'rb') as f:
+            content = f.read()
+
+        response = self.client.post('/ingest', data={'archive': (io.BytesIO(content), 'drop.tar.gz')},
+                                    content_type='multipart/form-data')
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_admin = True
+        db.session.commit()
+        response = self.client.post('/ingest', data={'archive': (io.BytesIO(content), 'drop.tar.gz')},
+                                    content_type='multipart/form-data')
+        # The testing configuration runs the task eagerly, so the job has already finished
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.get_json()["status"], 'done')
+        status = self.client.get(response.get_json()["status_url"]).get_json()
+        self.assertEqual((status["files"], status["report"]["ingested"]), (4, 3))
+        self.assertEqual(os.listdir(self.app.config['INGEST_FOLDER']), [])
+
+    def test_failed_batch_removes_its_files(self):
+        """
+        Test that the files written for a batch that cannot be committed are removed and reported as failed.
+        """
+        ingestor = BulkIngestor(self.blob_store, self.user.id, max_workers=1)
+        with patch('app.services.bulk_ingest.record_resume_skills', side_effect=RuntimeError("deadlock")):
+            report = ingestor.ingest(iter_archive(self.write_tar()))
+
+        self.assertEqual((report.ingested, len(report.failures)), (0, 4))
+        self.assertEqual((UploadedFile.query.count(), FileBlob.query.count()), (0, 0))
+        stored = [name for _, _, names in os.walk(self.blob_store.root) for name in names]
+        self.assertEqual(stored, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+test_candidate_ranking.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_candidate_ranking.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for ranking the stored resumes against a job description.
+
+Classes:
+    TestCandidateRanking: Tests for CandidateIndex and the admin candidate ranking endpoint.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_candidate_ranking
+"""
+
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+from sqlalchemy.orm import Session
+from app import warm_up_indexes
+from app.db_manager import db
+from app.models import JobDescription, Resume, User
+from app.services.candidate_ranking import CandidateIndex
+from app.services.content_analysis import KEYWORD_MATCHER
+from tests.base_test import TestBaseTestCase
+
+JOB_DESCRIPTION = "We are looking for a Software Engineer with Python, SQL and AWS experience."
+
+
+class TestCandidateRanking(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.query.filter_by(username='testuser').first()
+
+    def add_resumes(self, *contents):
+        resumes = [Resume(user_id=self.user.id, content=content) for content in contents]
+        db.session.add_all(resumes)
+        db.session.commit()
+        return [resume.id for resume in resumes]
+
+    def test_rank_orders_by_matched_job_keywords(self):
+        """
+        Test that candidates are ranked by the fraction of job keywords they mention, ties by resume ID.
+        """
+        ids = self.add_resumes("Java and C++ developer",
+                               "Python developer with SQL and AWS",
+                               "Python and SQL",
+                               "SQL reporting",
+                               "Python scripting")
+        ranked = CandidateIndex().rank(JOB_DESCRIPTION, top_k=3)
+
+        self.assertEqual([candidate.resume_id for candidate in ranked], [ids[1], ids[2], ids[3]])
+        self.assertAlmostEqual(ranked[0].score, 1.0)
+        self.assertAlmostEqual(ranked[1].score, 2 / 3)
+        self.assertEqual(ranked[1].matched_keywords, ["Python", "SQL"])
+
+    def test_refresh_indexes_new_resumes_incrementally(self):
+        """
+        Test that only resumes stored after the last refresh are vectorized again.
+        """
+        index = CandidateIndex()
+        self.add_resumes("Python", "SQL")
+        self.assertEqual(index.refresh(), 2)
+        self.assertEqual(index.refresh(), 0)
+
+        new_id = self.add_resumes("Python, SQL and AWS")[0]
+        self.assertEqual(index.rank(JOB_DESCRIPTION, top_k=1)[0].resume_id, new_id)
+        self.assertEqual(len(index), 3)
+
+    def test_index_is_built_from_the_stored_keywords(self):
+        """
+        Test that the keywords are stored with the resume, and that building the index does not scan the text again.
+        """
+        resume_id = self.add_resumes("Python developer with SQL and AWS")[0]
+        self.assertEqual(db.session.get(Resume, resume_id).keywords, "AWS\nPython\nSQL")
+
+        index = CandidateIndex()
+        with patch.object(KEYWORD_MATCHER, 'iter_matches', side_effect=AssertionError("text scanned")):
+            self.assertEqual(index.refresh(), 1)
+        self.assertEqual(index.rank(JOB_DESCRIPTION)[0].score, 1.0)
+
+    def test_edited_and_deleted_resumes_are_refreshed(self):
+        """
+        Test that an edited resume is vectorized again and that a deleted resume leaves the index.
+        """
+        index = CandidateIndex(reconcile_interval=0)
+        edited, deleted = self.add_resumes("Java developer", "Python, SQL and AWS")
+        index.refresh()
+
+        db.session.get(Resume, edited).content = "Python, SQL and AWS developer"
+        db.session.delete(db.session.get(Resume, deleted))
+        db.session.commit()
+
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual([candidate.resume_id for candidate in index.rank(JOB_DESCRIPTION)], [edited])
+        self.assertEqual(len(index), 1)
+
+    def test_concurrent_edits_each_increment_the_revision(self):
+        """
+        Test that two sessions editing the same resume both count, so no index misses the last edit.
+        """
+        resume_id, = self.add_resumes("Java developer")
+        db.session.commit()
+        first, second = Session(db.engine, expire_on_commit=False), Session(db.engine, expire_on_commit=False)
+        stale = first.get(Resume, resume_id)
+        first.commit()
+
+        second.get(Resume, resume_id).content = "Python developer"
+        second.commit()
+        stale.content = "Python and SQL developer"
+        first.commit()
+        first.close()
+        second.close()
+
+        self.assertEqual(db.session.get(Resume, resume_id).revision, 3)
+
+    def test_resumes_committed_out_of_id_order_are_indexed(self):
+        """
+        Test that a resume with a lower ID than the indexed ones, committed after them, is still indexed.
+        """
+        index = CandidateIndex()
+        newest = Resume(id=100, user_id=self.user.id, content="SQL reporting")
+        db.session.add(newest)
+        db.session.commit()
+        index.refresh()
+
+        # A transaction that took its ID first but committed last
+        late = Resume(id=50, user_id=self.user.id, content="Python, SQL and AWS",
+                      updated_at=newest.updated_at - timedelta(seconds=5))
+        db.session.add(late)
+        db.session.commit()
+
+        self.assertEqual([candidate.resume_id for candidate in index.rank(JOB_DESCRIPTION)], [50, 100])
+
+    def test_indexes_are_warmed_up_in_the_background(self):
+        """
+        Test that the warm-up thread builds the index before any ranking.
+        """
+        self.add_resumes("Python", "SQL")
+        # The in-memory database has a single connection, which the thread can only use between transactions
+        db.session.commit()
+        index = CandidateIndex()
+        warm_up_indexes(self.app, index).join()
+        self.assertEqual(len(index), 2)
+
+    def test_index_grows_past_its_initial_capacity(self):
+        """
+        Test that vectors are kept when the matrix is reallocated, and that re-adding a resume replaces it.
+        """
+        index = CandidateIndex()
+        index.add_many((resume_id, "Python") for resume_id in range(1, 3001))
+        index.add(1500, "Python, SQL and AWS")
+
+        ranked = index.rank(JOB_DESCRIPTION, top_k=2, refresh=False)
+        self.assertEqual(len(index), 3000)
+        self.assertEqual([candidate.resume_id for candidate in ranked], [1500, 1])
+
+    def test_job_without_known_keywords_ranks_nobody(self):
+        """
+        Test that a job description without vocabulary keywords returns no candidates.
+        """
+        self.add_resumes("Python developer")
+        self.assertEqual(CandidateIndex().rank("Friendly barista wanted"), [])
+
+    def test_rank_endpoint_requires_admin(self):
+        """
+        Test that the ranking endpoint rejects regular users and returns the top candidates for admins.
+        """
+        ids = self.add_resumes("Python developer with SQL and AWS", "Java developer")
+        job = JobDescription(title="Backend Engineer", description=JOB_DESCRIPTION)
+        db.session.add(job)
+        db.session.commit()
+        self.set_user_session()
+
+        response = self.client.get(f'/job_descriptions/{job.id}/candidates')
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_admin = True
+        db.session.commit()
+        response = self.client.get(f'/job_descriptions/{job.id}/candidates?k=1')
+        self.assertEqual(response.status_code, 200)
+        candidates = response.get_json()["candidates"]
+        self.assertEqual([candidate["resume_id"] for candidate in candidates], [ids[0]])
+        self.assertEqual(candidates[0]["user_id"], self.user.id)
+
+        response = self.client.get('/job_descriptions/999/candidates')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
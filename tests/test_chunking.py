@@ -0,0 +1,65 @@
+"""
+test_chunking.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_chunking.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the token window splitting and score aggregation
+functions implemented in the chunking.py module.
+
+Classes:
+    TestChunking: Unit tests for the chunking functions.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_chunking
+"""
+
+import unittest
+import numpy as np
+from app.services.chunking import aggregate_window_scores, split_into_windows
+
+
+class TestChunking(unittest.TestCase):
+
+    def test_short_text_is_a_single_window(self):
+        """
+        Test that a text shorter than the window is kept whole.
+        """
+        self.assertEqual(split_into_windows([1, 2, 3], window_size=5, overlap=2), [[1, 2, 3]])
+        self.assertEqual(split_into_windows([], window_size=5, overlap=2), [[]])
+
+    def test_windows_overlap_and_cover_the_text(self):
+        """
+        Test that consecutive windows share the overlap and cover every token.
+        """
+        windows = split_into_windows(list(range(10)), window_size=4, overlap=1)
+        self.assertEqual(windows, [[0, 1, 2, 3], [3, 4, 5, 6], [6, 7, 8, 9]])
+
+    def test_invalid_overlap(self):
+        """
+        Test that an overlap as large as the window is rejected.
+        """
+        with self.assertRaises(ValueError):
+            split_into_windows([1, 2, 3], window_size=2, overlap=2)
+
+    def test_aggregation_strategies(self):
+        """
+        Test the mean, max and length-weighted aggregation strategies.
+        """
+        scores = np.array([[0.8, 0.2], [0.2, 0.8]])
+        lengths = [3, 1]
+        np.testing.assert_allclose(aggregate_window_scores(scores, lengths, 'mean'), [0.5, 0.5])
+        np.testing.assert_allclose(aggregate_window_scores(scores, lengths, 'max'), [0.8, 0.8])
+        np.testing.assert_allclose(aggregate_window_scores(scores, lengths, 'length_weighted'), [0.65, 0.35])
+        with self.assertRaises(ValueError):
+            aggregate_window_scores(scores, lengths, 'median')
+
+
+if __name__ == '__main__':
+    unittest.main()
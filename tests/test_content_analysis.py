@@ -55,3 +55,12 @@ class TestContentAnalyzer(TestBaseTestCase):
         except Exception as e:
             logger.error(f"Error in analysis method test: {e}")
             self.fail("ContentAnalyzer analysis test failed")
+
+    def test_analyze_respects_word_boundaries(self):
+        """
+        Test that keywords embedded in longer words are not reported as matches.
+        """
+        logger.info("Testing word boundary handling of ContentAnalyzer")
+        resume_data = {"entities": [], "noun_chunks": ["JavaScript", "MySQL", "Python"]}
+        analysis_results = self.analyzer.analyze(resume_data, self.job_description)
+        self.assertEqual(set(analysis_results["matching_hard_skills"]), {"JavaScript", "MySQL", "Python"})
@@ -0,0 +1,67 @@
+"""
+test_file_utils.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_file_utils.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the streaming upload functions in file_utils.
+
+Classes:
+    TestSaveUpload: Unit tests for the save_upload function.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_file_utils
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from werkzeug.datastructures import FileStorage
+from app.utils.file_utils import FileTooLargeError, save_upload
+
+
+class TestSaveUpload(unittest.TestCase):
+
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.content = b"Python developer resume\n" * 1000
+
+    def tearDown(self):
+        shutil.rmtree(self.upload_dir)
+
+    def test_file_is_hashed_while_written(self):
+        """
+        Test that the saved file, its hash and its size match the uploaded bytes.
+        """
+        upload = FileStorage(stream=io.BytesIO(self.content), filename='../my resume.pdf')
+        saved = save_upload(upload, self.upload_dir, max_size=len(self.content), chunk_size=1024)
+
+        self.assertEqual(saved.filename, 'my_resume.pdf')
+        self.assertEqual(saved.file_path, os.path.join(self.upload_dir, 'my_resume.pdf'))
+        self.assertEqual(saved.content_hash, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(saved.size, len(self.content))
+        with open(saved.file_path, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(os.listdir(self.upload_dir), ['my_resume.pdf'])
+
+    def test_oversized_file_is_rejected(self):
+        """
+        Test that an upload over the limit is rejected and leaves nothing on disk.
+        """
+        upload = FileStorage(stream=io.BytesIO(self.content), filename='resume.pdf')
+        with self.assertRaises(FileTooLargeError):
+            save_upload(upload, self.upload_dir, max_size=4096, chunk_size=1024)
+        self.assertEqual(os.listdir(self.upload_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
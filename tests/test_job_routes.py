@@ -0,0 +1,145 @@
+"""
+test_job_routes.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_job_routes.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the analysis job status and result endpoints.
+
+Classes:
+    TestJobRoutes: Tests for the job polling endpoints, conditional requests and long polling.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_job_routes
+"""
+
+import json
+import threading
+import time
+import unittest
+from app.db_manager import db
+from app.models import AIResult, AnalysisJob, UploadedFile, User
+from tests.base_test import TestBaseTestCase
+
+
+class TestJobRoutes(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['JOB_POLL_INTERVAL'] = 0.05
+        user = User.query.filter_by(username='testuser').first()
+        uploaded_file = UploadedFile(user_id=user.id, filename='resume.pdf', file_path='resume.pdf')
+        db.session.add(uploaded_file)
+        db.session.commit()
+        self.job = AnalysisJob(id='job-1', user_id=user.id, file_id=uploaded_file.id, status='running',
+                               progress=0.4)
+        db.session.add(self.job)
+        db.session.commit()
+        self.set_user_session()
+
+    def finish_job(self):
+        ai_result = AIResult(file_id=self.job.file_id, result_data=json.dumps({"score": 0.8}))
+        db.session.add(ai_result)
+        db.session.commit()
+        self.job.status, self.job.progress, self.job.ai_result_id = 'done', 1.0, ai_result.id
+        db.session.commit()
+
+    def test_status_reports_progress_and_result(self):
+        """
+        Test that the status endpoint reports progress, then the result once the job is done.
+        """
+        response = self.client.get('/jobs/job-1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["status"], 'running')
+        self.assertEqual(response.get_json()["progress"], 0.4)
+        self.assertNotIn("analysis_result", response.get_json())
+
+        self.finish_job()
+        response = self.client.get('/jobs/job-1')
+        self.assertEqual(response.get_json()["analysis_result"], {"score": 0.8})
+        self.assertEqual(self.client.get('/jobs/job-1/result').get_json()["analysis_result"], {"score": 0.8})
+
+    def test_unchanged_job_returns_not_modified(self):
+        """
+        Test that sending the current ETag returns 304 until the job changes.
+        """
+        etag = self.client.get('/jobs/job-1').headers['ETag']
+        response = self.client.get('/jobs/job-1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.finish_job()
+        response = self.client.get('/jobs/job-1', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_long_poll_times_out(self):
+        """
+        Test that a long poll on an unchanged job is held for the wait time and returns 304.
+        """
+        etag = self.client.get('/jobs/job-1').headers['ETag']
+        started = time.monotonic()
+        response = self.client.get('/jobs/job-1?wait=0.3', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+    def test_long_poll_returns_on_change(self):
+        """
+        Test that a long poll returns as soon as the job changes.
+        """
+        etag = self.client.get('/jobs/job-1').headers['ETag']
+        app = self.app
+
+        def finish_later():
+            time.sleep(0.2)
+            with app.app_context():
+                job = db.session.get(AnalysisJob, 'job-1')
+                job.status, job.progress = 'failed', 0.5
+                job.error = 'model unavailable'
+                db.session.commit()
+
+        worker = threading.Thread(target=finish_later)
+        worker.start()
+        response = self.client.get('/jobs/job-1?wait=5', headers={'If-None-Match': etag})
+        worker.join()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["status"], 'failed')
+
+    def test_long_poll_without_etag_waits_for_a_change(self):
+        """
+        Test that a long poll without If-None-Match is held until the job changes from its current state.
+        """
+        started = time.monotonic()
+        response = self.client.get('/jobs/job-1?wait=0.3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["status"], 'running')
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+    def test_jobs_of_other_users_are_hidden(self):
+        """
+        Test that jobs without an owner, or of another user, are only visible to admins.
+        """
+        db.session.add(AnalysisJob(id='job-2', user_id=None, file_id=self.job.file_id, status='queued'))
+        db.session.commit()
+        self.assertEqual(self.client.get('/jobs/job-2').status_code, 404)
+
+        user = User.query.filter_by(username='testuser').first()
+        user.is_admin = True
+        db.session.commit()
+        self.assertEqual(self.client.get('/jobs/job-2').status_code, 200)
+
+    def test_pending_and_missing_results(self):
+        """
+        Test that the result endpoint returns 202 while the job runs and 404 for unknown jobs.
+        """
+        self.assertEqual(self.client.get('/jobs/job-1/result').status_code, 202)
+        self.assertEqual(self.client.get('/jobs/unknown').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+"""
+test_log.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_log.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the queue-backed logging of the application.
+
+Classes:
+    TestLog: Tests for AppLogger and JsonFormatter.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_log
+"""
+
+import importlib
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+import unittest
+import app.log
+from app.log import MAX_FORWARDED_RECORD, AppLogger, _ForwardingQueue
+from app.services.log_reader import list_log_files, tail
+from tests.base_test import TestBaseTestCase
+
+
+class TestLog(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.log_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger('resumate.test_log')
+
+    def tearDown(self):
+        AppLogger.configure_from(self.app.config)
+        shutil.rmtree(self.log_dir)
+        super().tearDown()
+
+    def flush(self):
+        """
+        Write the queued records by switching logging back to the application settings.
+        """
+        AppLogger.configure_from(self.app.config)
+
+    def read_entries(self, name='app.log'):
+        with open(os.path.join(self.log_dir, name), encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def queue_handlers(self):
+        return [handler for handler in logging.getLogger().handlers
+                if getattr(handler, 'is_resumate_queue_handler', False)]
+
+    def test_records_are_written_as_json_lines(self):
+        """
+        Test that records are written as JSON with their message, traceback and extra fields,
+        and that the excluded loggers are not written.
+        """
+        AppLogger.configure(log_dir=self.log_dir)
+        self.logger.info("Uploaded %s files", 3, extra={"user_id": 7})
+        logging.getLogger('sqlalchemy.engine.Engine').warning("SELECT 1")
+        try:
+            raise ValueError("bad file")
+        except ValueError:
+            self.logger.exception("Upload failed")
+        self.flush()
+
+        info, error = self.read_entries()
+        self.assertEqual((info["level"], info["logger"], info["message"], info["user_id"]),
+                         ('INFO', 'resumate.test_log', 'Uploaded 3 files', 7))
+        self.assertEqual(error["level"], 'ERROR')
+        self.assertIn('ValueError: bad file', error["exception"])
+        self.assertEqual([entry.level for entry in tail(os.path.join(self.log_dir, 'app.log'), level='ERROR').entries],
+                         ['ERROR'])
+
+    def test_handlers_are_not_duplicated(self):
+        """
+        Test that configuring again and reloading the module keep a single handler, so records are written once.
+        """
+        AppLogger.configure(log_dir=self.log_dir)
+        AppLogger.configure(log_dir=self.log_dir)
+        reloaded = importlib.reload(app.log)
+        reloaded.AppLogger.configure(log_dir=self.log_dir)
+        self.assertEqual(len(self.queue_handlers()), 1)
+
+        self.logger.warning("once")
+        self.flush()
+        self.assertEqual([entry["message"] for entry in self.read_entries()], ['once'])
+
+    def test_files_are_rotated_by_size(self):
+        """
+        Test that the log file is rotated at the size limit, keeping the configured number of files.
+        """
+        AppLogger.configure(log_dir=self.log_dir, max_bytes=1000, backup_count=2)
+        for index in range(100):
+            self.logger.info("message %d", index)
+        self.flush()
+        self.assertEqual(list_log_files(self.log_dir), ['app.log', 'app.log.1', 'app.log.2'])
+        self.assertEqual(self.read_entries()[-1]["message"], 'message 99')
+
+    def test_logging_does_not_wait_for_the_file(self):
+        """
+        Test that logging returns while the writer thread is still busy with earlier records.
+        """
+        AppLogger.configure(log_dir=self.log_dir)
+        queue_handler = self.queue_handlers()[0]
+        file_handler = queue_handler.file_handler
+        write = file_handler.handle
+        file_handler.handle = lambda record: (time.sleep(0.05), write(record))
+
+        start = time.perf_counter()
+        for index in range(10):
+            self.logger.info("message %d", index)
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+        self.flush()
+        self.assertEqual(len(self.read_entries()), 10)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "Needs os.fork")
+    def test_forked_processes_send_their_records_to_the_writer(self):
+        """
+        Test that a forked process neither writes nor rotates the file, and that its records are written by the parent.
+        """
+        AppLogger.configure(log_dir=self.log_dir)
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 1
+            try:
+                queue_handler = self.queue_handlers()[0]
+                AppLogger.configure(log_dir=self.log_dir)
+                for index in range(20):
+                    self.logger.info("child %d", index)
+                if queue_handler.listener is None and queue_handler.file_handler is None:
+                    exit_code = 0
+            finally:
+                os._exit(exit_code)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.logger.info("parent")
+
+        # The listener writes each record as it is queued, so wait for the file to hold them all
+        deadline = time.monotonic() + 5
+        path = os.path.join(self.log_dir, 'app.log')
+        while (not os.path.exists(path) or len(self.read_entries()) < 21) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.flush()
+        entries = self.read_entries()
+        self.assertEqual(sorted(entry["message"] for entry in entries),
+                         sorted(['parent'] + [f"child {index}" for index in range(20)]))
+        self.assertEqual({entry["process"] for entry in entries if entry["message"] != 'parent'}, {pid})
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Needs Unix sockets")
+    def test_forwarded_records_fit_in_one_datagram(self):
+        """
+        Test that a record with large 'extra' fields is shortened to fit in one datagram, keeping its message.
+        """
+        receive_socket, send_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(receive_socket.close)
+        self.addCleanup(send_socket.close)
+        send_socket.setblocking(False)
+        record = logging.makeLogRecord({'msg': "upload failed", **{f'field{i}': 'x' * 100000 for i in range(5)}})
+
+        forwarding_queue = _ForwardingQueue(send_socket)
+        forwarding_queue.put_nowait(record)
+
+        fields = json.loads(receive_socket.recv(4 * MAX_FORWARDED_RECORD))
+        self.assertEqual(forwarding_queue.dropped, 0)
+        self.assertEqual(fields['msg'], "upload failed")
+        self.assertLessEqual(len(json.dumps(fields)), MAX_FORWARDED_RECORD)
+
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Needs Unix sockets")
+    def test_forwarding_drops_records_instead_of_blocking(self):
+        """
+        Test that records are dropped and counted while the writer is not reading, and that the count is reported.
+        """
+        receive_socket, send_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(receive_socket.close)
+        self.addCleanup(send_socket.close)
+        send_socket.setblocking(False)
+        forwarding_queue = _ForwardingQueue(send_socket)
+
+        sent = 0
+        while not forwarding_queue.dropped:
+            forwarding_queue.put_nowait(logging.makeLogRecord({'msg': 'x' * 1000}))
+            sent += 1
+        forwarding_queue.put_nowait(logging.makeLogRecord({'msg': 'x' * 1000}))
+        self.assertEqual(forwarding_queue.dropped, 2)
+
+        receive_socket.setblocking(False)
+        for _ in range(sent - 1):
+            receive_socket.recv(MAX_FORWARDED_RECORD)
+        forwarding_queue.put_nowait(logging.makeLogRecord({'msg': 'after'}))
+        self.assertEqual(json.loads(receive_socket.recv(MAX_FORWARDED_RECORD))['msg'], 'after')
+        notice = json.loads(receive_socket.recv(MAX_FORWARDED_RECORD))
+        self.assertIn("Dropped 2 log records", notice['msg'])
+        self.assertEqual(forwarding_queue.dropped, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
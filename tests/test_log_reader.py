@@ -0,0 +1,154 @@
+"""
+test_log_reader.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_log_reader.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for reading, paging and following log files in the admin log viewer.
+
+Classes:
+    TestLogReader: Tests for tail, follow and the admin log endpoints.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_log_reader
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.db_manager import db
+from app.models import User
+from app.services import log_reader
+from app.services.log_reader import LogFileNotFoundError, follow, resolve_log_file, tail
+from tests.base_test import TestBaseTestCase
+
+
+def record(index, level='INFO', message=None):
+    """
+    Format a log line the way the application loggers do.
+    """
+    return f"2026-10-18 12:00:{index % 60:02d},000 - resumate - {level} - {message or f'message {index}'}\n"
+
+
+class TestLogReader(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.log_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.log_dir, 'app.log')
+        self.app.config['LOG_VIEWER_FOLDER'] = self.log_dir
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+        super().tearDown()
+
+    def write(self, *lines, mode='a'):
+        with open(self.path, mode) as file:
+            file.write(''.join(lines))
+
+    def test_tail_pages_backwards_across_blocks(self):
+        """
+        Test that paging with next_before returns every entry once, with tracebacks kept in their entry.
+        """
+        self.write(*[record(i) for i in range(50)])
+        self.write(record(50, 'ERROR', 'failed'), 'Traceback (most recent call last):\n', '  ValueError\n')
+        self.write(*[record(i) for i in range(51, 100)])
+        self.write('2026-10-18 12:00:00,000 - unfinished')
+
+        texts, before = [], None
+        with patch.object(log_reader, 'BLOCK_SIZE', 100):
+            while True:
+                page = tail(self.path, limit=30, before=before)
+                texts = [entry.text for entry in page.entries] + texts
+                before = page.next_before
+                if before is None:
+                    break
+        self.assertEqual(len(texts), 100)
+        self.assertEqual(texts[50], record(50, 'ERROR', 'failed') + 'Traceback (most recent call last):\n  ValueError')
+        self.assertNotIn('unfinished', texts[-1])
+
+    def test_tail_filters(self):
+        """
+        Test that entries are filtered by minimum level and by text, ignoring case.
+        """
+        self.write(record(1, 'DEBUG'), record(2, 'WARNING', 'Disk low'), record(3, 'ERROR', 'disk full'),
+                   record(4, 'INFO', 'disk ok'))
+        page = tail(self.path, level='warning')
+        self.assertEqual([entry.level for entry in page.entries], ['WARNING', 'ERROR'])
+        page = tail(self.path, level='INFO', contains='DISK')
+        self.assertEqual([entry.level for entry in page.entries], ['WARNING', 'ERROR', 'INFO'])
+        self.assertEqual(page.end, os.path.getsize(self.path))
+        with self.assertRaises(ValueError):
+            tail(self.path, level='LOUD')
+
+    def test_follow_streams_new_entries_and_survives_rotation(self):
+        """
+        Test that following yields appended entries once complete and restarts on a rotated file.
+        """
+        self.write(record(1))
+        writes = [
+            lambda: self.write(record(2, 'ERROR'), 'Traceback line\n'),
+            lambda: self.write(record(3, 'ERROR', 'after rotation'), mode='w'),
+            lambda: None,
+        ]
+        entries = follow(self.path, os.path.getsize(self.path), level='ERROR', poll_interval=0,
+                         max_duration=60, sleep=lambda seconds: writes.pop(0)())
+        received = []
+        for entry in entries:
+            if entry is not None:
+                received.append(entry.text)
+            if not writes:
+                break
+        self.assertEqual(received, [record(2, 'ERROR') + 'Traceback line', record(3, 'ERROR', 'after rotation')[:-1]])
+
+    def test_unknown_files_are_rejected(self):
+        """
+        Test that only the '.log' files of the log directory can be read.
+        """
+        self.write(record(1))
+        self.assertEqual(resolve_log_file(self.log_dir, 'app.log'), self.path)
+        for name in ('../config.py', 'missing.log', ''):
+            with self.assertRaises(LogFileNotFoundError):
+                resolve_log_file(self.log_dir, name)
+
+    def test_log_endpoints(self):
+        """
+        Test that the log pages are admin only and return pages and server-sent events.
+        """
+        self.write(record(1, 'INFO'), record(2, 'ERROR', 'boom'))
+        self.set_user_session()
+        self.assertEqual(self.client.get('/logs?format=json').status_code, 403)
+        self.assertEqual(self.client.get('/logs/follow?file=app.log').status_code, 403)
+
+        user = User.query.filter_by(username='testuser').first()
+        user.is_admin = True
+        db.session.commit()
+
+        response = self.client.get('/logs?format=json&level=ERROR')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry["level"] for entry in response.get_json()["entries"]], ['ERROR'])
+        self.assertEqual(self.client.get('/logs?file=secret.txt&format=json').status_code, 404)
+
+        response = self.client.get('/logs?q=boom')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'boom', response.data)
+
+        self.app.config['LOG_FOLLOW_MAX_DURATION'] = 0
+        response = self.client.get('/logs/follow?file=app.log&from=0', headers={'Last-Event-ID': '0'})
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = [event for event in response.get_data(as_text=True).split('\n\n') if event.startswith('id:')]
+        self.assertEqual(len(events), 2)
+        self.assertEqual(json.loads(events[1].split('data: ', 1)[1])["level"], 'ERROR')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+test_model_registry.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_model_registry.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the ModelRegistry class.
+The tests verify that models are loaded lazily, only once, and that the background
+warm-up thread sets the readiness flag.
+
+Classes:
+    TestModelRegistry: Unit tests for the ModelRegistry class.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_model_registry
+"""
+
+import unittest
+from app.services.model_registry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.load_count = 0
+
+    def load_model(self):
+        self.load_count += 1
+        return object()
+
+    def test_get_loads_lazily_and_once(self):
+        """
+        Test that a model is only loaded on first use and then shared.
+        """
+        self.registry.register('model', self.load_model)
+        self.assertFalse(self.registry.is_loaded('model'))
+        self.assertEqual(self.load_count, 0)
+
+        model = self.registry.get('model')
+        self.assertIs(self.registry.get('model'), model)
+        self.assertEqual(self.load_count, 1)
+
+    def test_get_unknown_model(self):
+        """
+        Test that asking for an unregistered model raises a KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.registry.get('missing')
+
+    def test_warm_up(self):
+        """
+        Test that the warm-up thread loads the models and sets the ready flag.
+        """
+        self.registry.register('model', self.load_model)
+        self.registry.warm_up().join(timeout=5)
+        self.assertTrue(self.registry.ready.is_set())
+        self.assertTrue(self.registry.is_loaded('model'))
+
+
+if __name__ == '__main__':
+    unittest.main()
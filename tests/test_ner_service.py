@@ -0,0 +1,85 @@
+"""
+test_ner_service.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_ner_service.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the NERService class.
+The tests use a stand-in NER pipeline registered in the model registry, so no model is downloaded.
+
+Classes:
+    TestNERService: Unit tests for the NERService class.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_ner_service
+"""
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from app.services.model_registry import model_registry
+from app.services.ner_service import NERService
+
+
+class TestNERService(unittest.TestCase):
+
+    def setUp(self):
+        self.calling_threads = set()
+
+        def fake_ner(text):
+            self.calling_threads.add(threading.current_thread().name)
+            return [{'word': word, 'entity': 'LABEL_1' if word.istitle() else 'LABEL_0'} for word in text.split()]
+
+        model_registry.register('test_ner', lambda: fake_ner)
+        self.service = NERService(model_name='test_ner', max_queue_size=4, timeout=5)
+
+    def test_extract_keywords(self):
+        """
+        Test that keywords are the tokens labelled LABEL_1.
+        """
+        self.assertEqual(self.service.extract_keywords("Python and Java developer"), ["Python", "Java"])
+
+    def test_concurrent_requests_share_one_worker(self):
+        """
+        Test that concurrent callers each get their own result and all run on the single worker thread.
+        """
+        texts = [f"Skill{i} and more" for i in range(20)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.service.extract_keywords, texts))
+        self.assertEqual(results, [[f"Skill{i}"] for i in range(20)])
+        self.assertEqual(self.calling_threads, {'ner-service'})
+
+    def test_errors_are_returned_to_the_caller(self):
+        """
+        Test that a failure in the model is raised in the calling thread.
+        """
+        model_registry.register('test_ner', lambda: None)
+        with self.assertRaises(TypeError):
+            self.service.extract_keywords("Python")
+
+    def test_full_queue_rejects_requests(self):
+        """
+        Test that requests are refused once the configured number of requests is waiting for the model.
+        """
+        release = threading.Event()
+        model_registry.register('test_ner', lambda: lambda text: release.wait() and [])
+        self.service.configure(max_queue_size=1, timeout=0.2)
+        running = self.service.submit("first")
+        # Wait until the worker has taken the first request off the queue
+        while not running.running():
+            release.wait(0.01)
+        queued = self.service.submit("second")
+        with self.assertRaises(RuntimeError):
+            self.service.submit("third")
+        release.set()
+        self.assertEqual((running.result(timeout=5), queued.result(timeout=5)), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+test_query_benchmark.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_query_benchmark.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the foreign key indexes, the unique mapping constraints and the query benchmark.
+
+Classes:
+    TestQueryBenchmark: Tests for the model indexes and run_query_benchmark.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_query_benchmark
+"""
+
+import unittest
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from app.db_manager import db
+from app.models import Resume, ResumeSkill, Skill, User
+from app.utils.query_benchmark import ADDED_CONSTRAINTS, ADDED_INDEXES, LOOKUPS, run_query_benchmark
+from tests.base_test import TestBaseTestCase
+
+
+class TestQueryBenchmark(TestBaseTestCase):
+
+    def test_models_declare_the_migrated_indexes(self):
+        """
+        Test that the tables created from the models have every index and constraint of the migration.
+        """
+        inspector = inspect(db.engine)
+        names = set()
+        for table in inspector.get_table_names():
+            names.update(index['name'] for index in inspector.get_indexes(table))
+            names.update(constraint['name'] for constraint in inspector.get_unique_constraints(table))
+        self.assertLessEqual(ADDED_INDEXES | ADDED_CONSTRAINTS, names)
+
+    def test_resume_skill_pairs_are_unique(self):
+        """
+        Test that the same skill cannot be mapped to a resume twice.
+        """
+        user = User.query.filter_by(username='testuser').first()
+        resume = Resume(user_id=user.id, content="Python")
+        skill = Skill(name="Python")
+        db.session.add_all([resume, skill])
+        db.session.flush()
+        db.session.add(ResumeSkill(resume_id=resume.id, skill_id=skill.id))
+        db.session.flush()
+
+        db.session.add(ResumeSkill(resume_id=resume.id, skill_id=skill.id))
+        with self.assertRaises(IntegrityError):
+            db.session.flush()
+        db.session.rollback()
+
+    def test_run_query_benchmark(self):
+        """
+        Test that the benchmark times every lookup before and after indexing.
+        """
+        timings = run_query_benchmark(users=5, resumes_per_user=4, lookups=3)
+        self.assertEqual([timing.lookup for timing in timings], list(LOOKUPS))
+        self.assertTrue(all(timing.before_ms > 0 and timing.after_ms > 0 for timing in timings))
+        self.assertEqual(set(timings[0].to_dict()), {"lookup", "before_ms", "after_ms", "speedup"})
+
+
+if __name__ == '__main__':
+    unittest.main()
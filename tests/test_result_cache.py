@@ -0,0 +1,91 @@
+"""
+test_result_cache.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_result_cache.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the AnalysisCache class.
+
+Classes:
+    TestAnalysisCache: Unit tests for the AnalysisCache class.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_result_cache
+"""
+
+import unittest
+from app.db_manager import db
+from app.models import AIResult, User
+from app.services.result_cache import AnalysisCache
+from tests.base_test import TestBaseTestCase
+
+
+class TestAnalysisCache(TestBaseTestCase):
+
+    def test_key_depends_on_every_input(self):
+        """
+        Test that changing the resume, job description, model or taxonomy changes the key.
+        """
+        key = AnalysisCache.make_key(b"resume", "job", "model-1", "taxonomy-1")
+        self.assertEqual(key, AnalysisCache.make_key(b"resume", "job", "model-1", "taxonomy-1"))
+        self.assertNotEqual(key, AnalysisCache.make_key(b"resume!", "job", "model-1", "taxonomy-1"))
+        self.assertNotEqual(key, AnalysisCache.make_key(b"resume", "job!", "model-1", "taxonomy-1"))
+        self.assertNotEqual(key, AnalysisCache.make_key(b"resume", "job", "model-2", "taxonomy-1"))
+        self.assertNotEqual(key, AnalysisCache.make_key(b"resume", "job", "model-1", "taxonomy-2"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """
+        Test that the in-memory tier keeps at most max_size results.
+        """
+        cache = AnalysisCache(max_size=2, persistent=False)
+        cache.put("a", {"score": 1})
+        cache.put("b", {"score": 2})
+        cache.get("a")
+        cache.put("c", {"score": 3})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"score": 1})
+        self.assertEqual(cache.get("c"), {"score": 3})
+
+    def test_results_are_persisted(self):
+        """
+        Test that a result survives clearing the in-memory tier and is stored in AIResult.
+        """
+        cache = AnalysisCache(max_size=2)
+        cache.put("key", {"score": 0.5})
+        db.session.commit()
+        cache.clear()
+
+        self.assertEqual(cache.get("key"), {"score": 0.5})
+        self.assertEqual(AIResult.query.filter_by(cache_key="key").count(), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_put_leaves_the_callers_transaction_open(self):
+        """
+        Test that storing a result neither commits nor discards the caller's pending changes.
+        """
+        cache = AnalysisCache(max_size=2)
+        user = User(first_name='Cache', last_name='User', username='cacheuser', email='cache@example.com',
+                    password_hash='password')
+        db.session.add(user)
+        cache.put("key", {"score": 0.5})
+        db.session.rollback()
+
+        self.assertEqual((User.query.filter_by(username='cacheuser').count(),
+                          AIResult.query.filter_by(cache_key="key").count()), (0, 0))
+
+        db.session.add(user)
+        cache.put("key", {"score": 0.5})
+        db.session.commit()
+        self.assertEqual((User.query.filter_by(username='cacheuser').count(),
+                          AIResult.query.filter_by(cache_key="key").count()), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,7 +21,9 @@ Usage:
 import unittest
 import logging
 from unittest.mock import patch
+import spacy
 from app.resume_parser import ResumeParser  # Ensure this matches the correct path
+from app.resume_parser import PhraseMatcherRegistry, phrase_matcher_registry
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
@@ -163,6 +165,69 @@ class TestResumeParser(unittest.TestCase):
             logger.error(f"Error in test_identify_sections: {e}")
             self.fail(f"Error in test_identify_sections: {e}")
 
+    def test_identify_sections_heading_variants(self):
+        """
+        Test that headings are matched in any case and without a colon, but not inside a line.
+        """
+        resume_text = "Jane Roe\nEXPERIENCE\n  Built data pipelines with skills: Python\r\nskills :\tSQL\n\fProfile"
+        sections = self.parser.identify_sections(resume_text)
+        self.assertEqual(sections['experience'], "Built data pipelines with skills: Python")
+        self.assertEqual(sections['skills'], "SQL")
+        self.assertEqual(sections['summary'], "")
+        self.assertNotIn("Jane Roe", sections.values())
+
+    def test_section_spans(self):
+        """
+        Test that section_spans returns the offsets of every heading and its content.
+        """
+        resume_text = "Skills: Python\nEducation\nB.S.\nskills: SQL"
+        spans = self.parser.section_spans(resume_text)
+        self.assertEqual([span.section for span in spans], ["skills", "education", "skills"])
+        self.assertEqual([resume_text[span.heading_start:span.start] for span in spans],
+                         ["Skills:", "Education", "skills:"])
+        self.assertEqual([resume_text[span.start:span.end] for span in spans], [" Python", "\nB.S.", " SQL"])
+
+    def test_parse_many(self):
+        """
+        Test that parse_many yields the same results as parse, lazily and in input order.
+        Phrase matching only needs the tokenizer, so a blank English pipeline stands in for the large model.
+        """
+        nlp = spacy.blank("en")
+        registry = PhraseMatcherRegistry(phrase_matcher_registry.base_phrases)
+        with patch('app.resume_parser.get_nlp', return_value=nlp), \
+                patch('app.resume_parser.phrase_matcher_registry', registry):
+            self.check_parse_many()
+
+    def check_parse_many(self):
+        resume_texts = [
+            "John Doe\nSoftware Engineer skilled in Python",
+            "Senior Developer with Java and SQL",
+            "No matching phrases here",
+        ]
+        parsed_iter = self.parser.parse_many(iter(resume_texts), batch_size=2)
+        self.assertFalse(isinstance(parsed_iter, list))
+        self.assertEqual(list(parsed_iter), [self.parser.parse(text) for text in resume_texts])
+        self.assertEqual(next(self.parser.parse_many(resume_texts[:1]))["matched_phrases"],
+                         ["John Doe", "Software Engineer", "Python"])
+
+    def test_phrase_matcher_registry(self):
+        """
+        Test that the phrase matcher is cached, extended in place and rebuilt after invalidation.
+        """
+        nlp = spacy.blank("en")
+        registry = PhraseMatcherRegistry(["Python"])
+        matcher = registry.get_matcher(nlp)
+        self.assertIs(registry.get_matcher(nlp), matcher)
+
+        registry.add_phrases(["Rust"])
+        doc = nlp.make_doc("Python and Rust")
+        self.assertEqual([doc[start:end].text for _, start, end in matcher(doc)], ["Python", "Rust"])
+
+        registry.invalidate()
+        rebuilt_matcher = registry.get_matcher(nlp)
+        self.assertIsNot(rebuilt_matcher, matcher)
+        self.assertEqual([doc[start:end].text for _, start, end in rebuilt_matcher(doc)], ["Python"])
+
 
 if __name__ == '__main__':
     unittest.main()
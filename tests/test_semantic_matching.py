@@ -0,0 +1,100 @@
+"""
+test_semantic_matching.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_semantic_matching.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for semantic keyword matching with word vectors.
+
+Classes:
+    TestSemanticMatching: Tests for WordVectors, SemanticMatcher and the semantic mode of ContentAnalyzer.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_semantic_matching
+"""
+
+import unittest
+import numpy as np
+from app.services.content_analysis import ContentAnalyzer, VOCABULARIES
+from app.services.semantic_matching import SemanticMatcher, WordVectors, split_clauses
+
+# A tiny vector space: databases, programming languages and collaboration
+WORDS = {
+    "sql": [1.0, 0.0, 0.0],
+    "postgresql": [0.95, 0.1, 0.0],
+    "databases": [0.9, 0.0, 0.1],
+    "python": [0.0, 1.0, 0.0],
+    "java": [0.1, 0.9, 0.0],
+    "teamwork": [0.0, 0.0, 1.0],
+    "team": [0.0, 0.1, 0.9],
+    "collaborated": [0.1, 0.0, 0.9],
+}
+
+
+class TestSemanticMatching(unittest.TestCase):
+
+    def setUp(self):
+        self.word_vectors = WordVectors.from_words(WORDS)
+        self.matcher = SemanticMatcher(self.word_vectors, {"hard_skills": ["SQL", "Python"],
+                                                           "soft_skills": ["teamwork"]})
+
+    def test_word_vectors_are_contiguous_float32(self):
+        """
+        Test that the table is one contiguous float32 array and that texts embed to unit vectors.
+        """
+        self.assertEqual(self.word_vectors.data.dtype, np.float32)
+        self.assertTrue(self.word_vectors.data.flags['C_CONTIGUOUS'])
+        self.assertAlmostEqual(float(np.linalg.norm(self.word_vectors.embed("Python and Java"))), 1.0, places=5)
+        self.assertFalse(self.word_vectors.embed("unknown words only").any())
+
+    def test_similar_phrases_match_keywords(self):
+        """
+        Test that keywords are matched by phrases with similar vectors, not only verbatim.
+        """
+        matched = self.matcher.match_categories(["PostgreSQL administration", "Collaborated with the team"])
+        self.assertEqual(matched, {"hard_skills": {"SQL"}, "soft_skills": {"teamwork"}})
+
+    def test_phrase_vectors_are_cached_by_content(self):
+        """
+        Test that a phrase seen before is not embedded again and that the cache stays bounded.
+        """
+        matcher = SemanticMatcher(self.word_vectors, {"hard_skills": ["SQL"]}, cache_size=2)
+        matcher.embed(["PostgreSQL", "Python", "PostgreSQL"])
+        self.assertEqual(len(matcher._cache), 2)
+
+        matcher.word_vectors = None  # Any further embedding would fail
+        self.assertEqual(matcher.embed(["PostgreSQL"]).shape, (1, 3))
+
+    def test_split_clauses(self):
+        """
+        Test that job descriptions are split into clauses at punctuation and conjunctions.
+        """
+        self.assertEqual(split_clauses("Experience with SQL databases and Python. Teamwork; Java, Go"),
+                         ["Experience with SQL databases", "Python", "Teamwork", "Java", "Go"])
+
+    def test_content_analyzer_semantic_mode(self):
+        """
+        Test that the semantic mode credits related terms the exact mode misses.
+        """
+        matcher = SemanticMatcher(self.word_vectors, VOCABULARIES)
+        resume_data = {"noun_chunks": ["PostgreSQL", "Python"]}
+        job_description = "Experience with SQL databases and Python."
+
+        exact = ContentAnalyzer.analyze(resume_data, job_description)
+        semantic = ContentAnalyzer.analyze(resume_data, job_description, mode='semantic',
+                                           semantic_matcher=matcher)
+
+        self.assertNotIn("SQL", exact["matching_hard_skills"])
+        self.assertIn("SQL", semantic["matching_hard_skills"])
+        self.assertEqual(semantic["mode"], 'semantic')
+        self.assertNotIn("mode", exact)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+test_similarity_index.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_similarity_index.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the nearest-neighbour index over resume embeddings.
+
+Classes:
+    TestSimilarityIndex: Tests for ResumeVectorIndex and the admin similar resumes endpoint.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_similarity_index
+"""
+
+import multiprocessing
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from app.db_manager import db
+from app.models import Resume, User
+from app.services.similarity_index import ResumeVectorIndex
+from tests.base_test import TestBaseTestCase
+
+WORDS = ["python", "sql", "aws", "java", "spring", "kotlin", "nurse", "patient", "care"]
+
+
+def bag_of_words(text):
+    """
+    Embeds a text as the counts of a few known words.
+    """
+    tokens = text.lower().split()
+    return np.array([tokens.count(word) for word in WORDS], dtype=np.float32)
+
+
+def add_in_batches(index_dir, first_id, count):
+    """
+    Adds resumes to an index ten at a time, from another process.
+    """
+    index = ResumeVectorIndex(index_dir, embed=bag_of_words, min_train_size=250)
+    for start in range(first_id, first_id + count, 10):
+        index.add(list(range(start, start + 10)), ["python sql"] * 10)
+
+
+class TestSimilarityIndex(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.index_dir = tempfile.mkdtemp()
+        self.user = User.query.filter_by(username='testuser').first()
+
+    def tearDown(self):
+        shutil.rmtree(self.index_dir)
+        super().tearDown()
+
+    def add_resumes(self, *contents):
+        resumes = [Resume(user_id=self.user.id, content=content) for content in contents]
+        db.session.add_all(resumes)
+        db.session.commit()
+        return [resume.id for resume in resumes]
+
+    def test_refresh_is_incremental_and_persistent(self):
+        """
+        Test that refreshes only embed new resumes and that a reopened index sees every vector.
+        """
+        python_sql, java, nurse = self.add_resumes("python sql aws", "java spring kotlin", "nurse patient care")
+        index = ResumeVectorIndex(self.index_dir, embed=bag_of_words)
+        self.assertEqual(index.refresh(), 3)
+        self.assertEqual(index.refresh(), 0)
+
+        python_aws = self.add_resumes("python aws")[0]
+        self.assertEqual(index.refresh(), 1)
+
+        reopened = ResumeVectorIndex(self.index_dir, embed=bag_of_words)
+        self.assertEqual(len(reopened), 4)
+        similar = reopened.similar_to(python_sql, top_k=2)
+        self.assertEqual([match.resume_id for match in similar], [python_aws, java])
+        self.assertAlmostEqual(similar[0].score, 2 / np.sqrt(6), places=5)
+
+    def test_edited_and_deleted_resumes_are_refreshed(self):
+        """
+        Test that an edited resume is embedded again in place and that a deleted resume leaves the results.
+        """
+        edited, deleted, kept = self.add_resumes("java spring", "python sql", "python aws")
+        index = ResumeVectorIndex(self.index_dir, embed=bag_of_words, reconcile_interval=0)
+        index.refresh()
+
+        db.session.get(Resume, edited).content = "python sql aws"
+        db.session.delete(db.session.get(Resume, deleted))
+        db.session.commit()
+
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(len(index), 2)
+        self.assertTrue(np.allclose(index.vector_of(edited), bag_of_words("python sql aws") / np.sqrt(3)))
+        self.assertIsNone(index.vector_of(deleted))
+        self.assertEqual([match.resume_id for match in index.similar_to(kept, top_k=5)], [edited])
+
+        # Another process reads every revision first, but only embeds what is out of date
+        self.assertEqual(ResumeVectorIndex(self.index_dir, embed=bag_of_words).refresh(), 0)
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_concurrent_writers_keep_every_row(self):
+        """
+        Test that processes adding to the same index at the same time take turns, so no row is lost.
+        """
+        context = multiprocessing.get_context('fork')
+        writers = [context.Process(target=add_in_batches, args=(self.index_dir, first_id, 300))
+                   for first_id in (1, 1001)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join(60)
+        self.assertEqual([writer.exitcode for writer in writers], [0, 0])
+
+        index = ResumeVectorIndex(self.index_dir, embed=bag_of_words)
+        self.assertEqual(len(index), 600)
+        indexed = np.sort(np.asarray(index._ids[:len(index)]))
+        self.assertTrue(np.array_equal(indexed, np.r_[1:301, 1001:1301]))
+
+    def test_unindexed_resume_is_embedded_on_the_fly(self):
+        """
+        Test that a resume missing from the index is compared by its text.
+        """
+        index = ResumeVectorIndex(self.index_dir, embed=bag_of_words)
+        index.add([1, 2], ["nurse care", "java"])
+        self.assertIsNone(index.vector_of(3))
+        self.assertEqual(index.similar_to(3, top_k=1, text="patient care")[0].resume_id, 1)
+        self.assertEqual(index.similar_to(3, top_k=1), [])
+
+    def test_inverted_lists_find_the_nearest_cluster(self):
+        """
+        Test that queries use the trained inverted lists and still find the nearest resumes,
+        across file growth and retraining.
+        """
+        rng = np.random.default_rng(7)
+        centers = rng.standard_normal((20, 16)).astype(np.float32)
+        vectors = np.repeat(centers, 100, axis=0) + 0.05 * rng.standard_normal((2000, 16)).astype(np.float32)
+        index = ResumeVectorIndex(self.index_dir, embed=lambda text: vectors[int(text)], probes=4,
+                                  min_train_size=500)
+        for start in range(0, 2000, 400):
+            ids = list(range(start + 1, start + 401))
+            index.add(ids, [str(resume_id - 1) for resume_id in ids])
+
+        reopened = ResumeVectorIndex(self.index_dir, embed=lambda text: vectors[int(text)], probes=4)
+        self.assertEqual(len(reopened), 2000)
+        # Trained at 800 resumes and again at 1600
+        self.assertEqual(len(reopened._centroids), 40)
+        for cluster in range(20):
+            similar = reopened.similar_to(cluster * 100 + 1, top_k=5)
+            self.assertEqual(len(similar), 5)
+            self.assertTrue(all((match.resume_id - 1) // 100 == cluster for match in similar))
+
+    def test_similar_endpoint(self):
+        """
+        Test that the endpoint is admin only, reports when search is disabled and returns the nearest resumes.
+        """
+        python_sql, java, python_aws = self.add_resumes("python sql", "java", "python aws")
+        self.set_user_session()
+
+        response = self.client.get(f'/resumes/{python_sql}/similar')
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_admin = True
+        db.session.commit()
+        response = self.client.get(f'/resumes/{python_sql}/similar')
+        self.assertEqual(response.status_code, 503)
+
+        self.app.similarity_index = ResumeVectorIndex(self.index_dir, embed=bag_of_words)
+        self.app.similarity_index.refresh()
+        response = self.client.get(f'/resumes/{python_sql}/similar?k=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([match["resume_id"] for match in response.get_json()["similar"]], [python_aws])
+
+        # Deleted since the last refresh
+        db.session.delete(db.session.get(Resume, python_aws))
+        db.session.commit()
+        response = self.client.get(f'/resumes/{python_sql}/similar?k=1')
+        self.assertEqual(response.get_json()["similar"], [])
+
+        response = self.client.get('/resumes/999/similar')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
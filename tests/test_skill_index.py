@@ -0,0 +1,161 @@
+"""
+test_skill_index.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_skill_index.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for recording resume skills and searching resumes by skill.
+
+Classes:
+    TestSkillIndex: Tests for record_resume_skills, SkillIndex and the admin skill search endpoint.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_skill_index
+"""
+
+import unittest
+from datetime import timedelta
+from app.db_manager import db
+from app.models import Resume, ResumeSkill, Skill, User
+from app.services.skill_index import SkillIndex, SkillQueryError, extract_skills, record_resume_skills
+from tests.base_test import TestBaseTestCase
+
+
+class TestSkillIndex(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.query.filter_by(username='testuser').first()
+
+    def add_resumes(self, *contents):
+        resumes = [Resume(user_id=self.user.id, content=content) for content in contents]
+        db.session.add_all(resumes)
+        db.session.flush()
+        record_resume_skills((resume.id, resume.content) for resume in resumes)
+        db.session.commit()
+        return [resume.id for resume in resumes]
+
+    def test_extract_skills_returns_hard_skills_only(self):
+        """
+        Test that only hard skills are extracted, respecting word boundaries.
+        """
+        self.assertEqual(extract_skills("JavaScript and AWS, strong communication"), {"JavaScript", "AWS"})
+
+    def test_record_resume_skills_creates_skills_once(self):
+        """
+        Test that skills are created once and that recording a resume again adds no duplicate mappings.
+        """
+        ids = self.add_resumes("Python and SQL", "Python")
+        self.assertEqual(Skill.query.filter_by(name="Python").count(), 1)
+        self.assertEqual(ResumeSkill.query.count(), 3)
+
+        self.assertEqual(record_resume_skills([(ids[1], "Python")]), 0)
+
+    def test_boolean_queries(self):
+        """
+        Test AND, OR, NOT and parentheses over the indexed resumes.
+        """
+        python_aws, python_java_aws, java, no_skills = self.add_resumes(
+            "Python on AWS", "Python, Java and AWS", "Java", "Barista")
+        index = SkillIndex()
+
+        self.assertEqual(index.query("Python AND AWS AND NOT Java").tolist(), [python_aws])
+        self.assertEqual(index.query("python and aws").tolist(), [])
+        self.assertEqual(index.query("Java OR Python").tolist(), [python_aws, python_java_aws, java])
+        self.assertEqual(index.query("NOT (Python OR Java)").tolist(), [no_skills])
+        self.assertEqual(index.query("Java AND (AWS OR Kotlin)").tolist(), [python_java_aws])
+        self.assertEqual(index.query("Cobol").tolist(), [])
+
+    def test_refresh_is_incremental(self):
+        """
+        Test that only the resumes stored after the last refresh are read.
+        """
+        index = SkillIndex()
+        first = self.add_resumes("Python")[0]
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(index.refresh(), 0)
+
+        second = self.add_resumes("Python and Git")[0]
+        self.assertEqual(index.query("Python").tolist(), [first, second])
+        self.assertEqual(index.query("Git", refresh=False).tolist(), [second])
+
+    def test_edited_and_deleted_resumes_are_refreshed(self):
+        """
+        Test that the skills of an edited resume are replaced and that a deleted resume leaves the index.
+        """
+        index = SkillIndex(reconcile_interval=0)
+        edited, deleted = self.add_resumes("Python and Java", "Python")
+        index.refresh()
+
+        resume = db.session.get(Resume, edited)
+        resume.content = "Java and Git"
+        record_resume_skills([(resume.id, resume.content)])
+        ResumeSkill.query.filter_by(resume_id=deleted).delete()
+        db.session.delete(db.session.get(Resume, deleted))
+        db.session.commit()
+
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(index.query("Python", refresh=False).tolist(), [])
+        self.assertEqual(index.query("Java AND Git", refresh=False).tolist(), [edited])
+        self.assertEqual(index.query("NOT Git", refresh=False).tolist(), [])
+
+    def test_resumes_committed_out_of_id_order_are_indexed(self):
+        """
+        Test that the skills of a resume with a lower ID than the indexed ones, committed after them, are indexed.
+        """
+        index = SkillIndex()
+        python = Skill(name="Python")
+        newest = Resume(id=100, user_id=self.user.id, content="Python")
+        db.session.add_all([python, newest])
+        db.session.flush()
+        db.session.add(ResumeSkill(id=100, resume_id=newest.id, skill_id=python.id))
+        db.session.commit()
+        index.refresh()
+
+        # A transaction that took its IDs first but committed last
+        late = Resume(id=50, user_id=self.user.id, content="Python",
+                      updated_at=newest.updated_at - timedelta(seconds=5))
+        db.session.add(late)
+        db.session.flush()
+        db.session.add(ResumeSkill(id=50, resume_id=late.id, skill_id=python.id))
+        db.session.commit()
+
+        self.assertEqual(index.query("Python").tolist(), [50, 100])
+
+    def test_malformed_queries_raise(self):
+        """
+        Test that malformed queries raise SkillQueryError.
+        """
+        index = SkillIndex()
+        for expression in ("", "Python AND", "(Python OR Java", "Python)", "AND Java"):
+            with self.assertRaises(SkillQueryError):
+                index.query(expression)
+
+    def test_search_endpoint_requires_admin(self):
+        """
+        Test that the skill search endpoint rejects regular users and returns matching resumes for admins.
+        """
+        ids = self.add_resumes("Python on AWS", "Java on AWS")
+        self.set_user_session()
+
+        response = self.client.get('/resumes/search', query_string={'q': 'AWS AND NOT Java'})
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_admin = True
+        db.session.commit()
+        response = self.client.get('/resumes/search', query_string={'q': 'AWS AND NOT Java'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"query": "AWS AND NOT Java", "total": 1, "resume_ids": [ids[0]]})
+
+        response = self.client.get('/resumes/search', query_string={'q': 'AWS AND'})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+test_tasks.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_tasks.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the asynchronous analysis pipeline.
+The testing configuration runs Celery tasks eagerly, so no broker is needed, and the
+AI service is patched so no model is downloaded.
+
+Classes:
+    TestAnalysisTasks: Tests for process_file, enqueue_analysis and the upload endpoint.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_tasks
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from docx import Document
+from app.db_manager import db
+from app.models import AIResult, AnalysisJob, UploadedFile, User
+from app.services.blob_store import BlobStore
+from app.services.content_analysis import TAXONOMY_VERSION
+from app.services.result_cache import AnalysisCache
+from app.tasks import enqueue_analysis
+from tests.base_test import TestBaseTestCase
+
+RESUME_TEXT = ["John Doe", "Skills: Python, SQL", "Experience:", "Software Engineer at ABC Corp"]
+ANALYSIS = {"ai_analysis": [{"label": "POSITIVE", "score": 0.9}], "content_analysis": {"score": 0.5}}
+
+
+def docx_bytes(paragraphs):
+    """
+    Build a .docx file in memory with one paragraph per entry.
+    """
+    document = Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class TestAnalysisTasks(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.upload_dir = tempfile.mkdtemp()
+        self.app.config['UPLOAD_FOLDER'] = self.upload_dir
+        self.app.blob_store = BlobStore(self.upload_dir)
+        self.user = User.query.filter_by(username='testuser').first()
+
+    def tearDown(self):
+        shutil.rmtree(self.upload_dir)
+        super().tearDown()
+
+    def create_upload(self, content):
+        file_path = os.path.join(self.upload_dir, 'resume.docx')
+        with open(file_path, 'wb') as f:
+            f.write(content)
+        uploaded_file = UploadedFile(user_id=self.user.id, filename='resume.docx', file_path=file_path)
+        db.session.add(uploaded_file)
+        db.session.commit()
+        return uploaded_file
+
+    @patch('app.services.ai_service.AIService.analyze_resume', return_value=ANALYSIS)
+    def test_pipeline_stores_result(self, mock_analyze_resume):
+        """
+        Test that a queued analysis runs the pipeline and stores the result in AIResult.
+        """
+        uploaded_file = self.create_upload(docx_bytes(RESUME_TEXT))
+        job = enqueue_analysis(uploaded_file, "Python developer", self.user.id)
+
+        self.assertEqual((job.status, job.progress), ('done', 1.0))
+        result = json.loads(db.session.get(AIResult, job.ai_result_id).result_data)
+        self.assertEqual(result["content_analysis"], {"score": 0.5})
+        self.assertIn("Python", result["sections"]["skills"])
+        self.assertEqual(db.session.get(AIResult, job.ai_result_id).file_id, uploaded_file.id)
+        mock_analyze_resume.assert_called_once()
+
+    @patch('app.tasks.file_sha256')
+    @patch('app.services.ai_service.AIService.analyze_resume', return_value=ANALYSIS)
+    def test_pipeline_uses_the_stored_content_hash(self, mock_analyze_resume, mock_file_sha256):
+        """
+        Test that the cache key is built from the hash recorded with the upload, without reading the file again.
+        """
+        content = docx_bytes(RESUME_TEXT)
+        uploaded_file = self.create_upload(content)
+        uploaded_file.content_hash = hashlib.sha256(content).hexdigest()
+        db.session.commit()
+        job = enqueue_analysis(uploaded_file, "Python developer", self.user.id)
+
+        self.assertEqual(job.status, 'done')
+        mock_file_sha256.assert_not_called()
+        self.assertEqual(db.session.get(AIResult, job.ai_result_id).cache_key,
+                         AnalysisCache.make_key(content, "Python developer", self.app.ai_service.model_version,
+                                                TAXONOMY_VERSION))
+
+    @patch('app.services.ai_service.AIService.analyze_resume', return_value={"error": "model unavailable"})
+    def test_failed_analysis_marks_job_failed(self, mock_analyze_resume):
+        """
+        Test that an error in the pipeline is recorded on the job.
+        """
+        uploaded_file = self.create_upload(docx_bytes(RESUME_TEXT))
+        job = enqueue_analysis(uploaded_file, "Python developer", self.user.id)
+
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error, "model unavailable")
+        self.assertIsNone(job.ai_result_id)
+
+    @patch('app.services.ai_service.AIService.analyze_resume', return_value=ANALYSIS)
+    def test_upload_returns_job_id(self, mock_analyze_resume):
+        """
+        Test that uploading a resume queues its analysis and returns the job ID.
+        """
+        self.set_user_session()
+        response = self.client.post('/upload_resume', data={
+            'file': (io.BytesIO(docx_bytes(RESUME_TEXT)), 'resume.docx'),
+            'job_description': 'Python developer',
+            'user_id': self.user.id,
+        }, content_type='multipart/form-data')
+
+        self.assertEqual(response.status_code, 202)
+        job = db.session.get(AnalysisJob, response.get_json()['job_id'])
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.file_id, response.get_json()['file_id'])
+
+    def test_oversized_upload_is_rejected(self):
+        """
+        Test that an upload larger than MAX_UPLOAD_SIZE gets 413 and is not stored.
+        """
+        self.app.config['MAX_UPLOAD_SIZE'] = 1024
+        self.set_user_session()
+        response = self.client.post('/upload_resume', data={
+            'file': (io.BytesIO(b"x" * 4096), 'resume.docx'),
+            'user_id': self.user.id,
+        }, content_type='multipart/form-data')
+
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(UploadedFile.query.count(), 0)
+        self.assertEqual([files for _, _, files in os.walk(self.upload_dir) if files], [])
+
+    def test_request_over_max_content_length_is_refused_unparsed(self):
+        """
+        Test that a body larger than MAX_CONTENT_LENGTH gets 413 before the upload is read, even in views
+        that catch every error, while the ingest endpoint accepts bodies up to its own limit.
+        """
+        self.app.config['MAX_CONTENT_LENGTH'] = 1024
+        self.set_user_session()
+        with patch('app.utils.file_utils.stream_to_temp_file') as mock_stream:
+            response = self.client.post('/upload_resume', data={
+                'file': (io.BytesIO(b"x" * 4096), 'resume.docx'),
+            }, content_type='multipart/form-data')
+            analyze_response = self.client.post('/analyze_resume', data={
+                'resume_file': (io.BytesIO(b"x" * 4096), 'resume.txt'), 'job_description': "Python"})
+
+        self.assertEqual((response.status_code, analyze_response.status_code), (413, 413))
+        self.assertIn("1024 bytes", response.get_json()["error"])
+        mock_stream.assert_not_called()
+
+        self.app.config['INGEST_MAX_ARCHIVE_SIZE'] = 8192
+        response = self.client.post('/ingest', data={'archive': (io.BytesIO(b"x" * 4096), 'drop.zip')},
+                                    content_type='multipart/form-data')
+        # Past the size check; regular users are then refused
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
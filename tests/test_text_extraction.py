@@ -0,0 +1,186 @@
+"""
+test_text_extraction.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_text_extraction.py
+Revised: [Add revised date]
+
+Description:
+This module contains unit tests for the PDFTextCache and PDFPageExtractor classes.
+The cache tests patch pdfminer; the extractor tests build a small multi-page PDF.
+
+Classes:
+    TestPDFTextCache: Unit tests for the PDFTextCache class.
+    TestPDFPageExtractor: Unit tests for the PDFPageExtractor class.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_text_extraction
+"""
+
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.db_manager import db
+from app.models import ExtractedText, User
+from app.services.text_extraction import PDFPageExtractor, PDFTextCache, count_pdf_pages, file_sha256
+from tests.base_test import TestBaseTestCase
+
+
+def write_pdf(file_path, page_texts):
+    """
+    Write a minimal PDF with one line of Helvetica text per page.
+    """
+    page_count = len(page_texts)
+    font_id = 3 + 2 * page_count
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (3 + 2 * i) for i in range(page_count))
+               + b"] /Count %d >>" % page_count]
+    for i, text in enumerate(page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode('ascii') + b") Tj ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (4 + 2 * i, font_id))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    with open(file_path, 'wb') as f:
+        f.write(content)
+
+
+def extract_in_daemon(extractor, pdf_path, results):
+    # Runs in a daemonic process, like the workers of Celery's prefork pool
+    results.put([page.strip() for page in extractor.extract(pdf_path)])
+
+class TestPDFTextCache(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        handle, self.pdf_path = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(b'%PDF-1.4 two pages')
+        self.cache = PDFTextCache(max_size=4, extractor=PDFPageExtractor(max_workers=1))
+
+    def tearDown(self):
+        os.remove(self.pdf_path)
+        super().tearDown()
+
+    @patch('app.services.text_extraction.extract_text', return_value='Page one\x0cPage two\x0c')
+    def test_file_is_parsed_once(self, mock_extract_text):
+        """
+        Test that the second request for the same file reads the cached text.
+        """
+        first = self.cache.get_document(self.pdf_path)
+        second = self.cache.get_document(self.pdf_path)
+
+        mock_extract_text.assert_called_once()
+        self.assertEqual(first.pages, ['Page one', 'Page two'])
+        self.assertEqual(second.text, 'Page one\x0cPage two\x0c')
+        self.assertEqual(first.content_hash, file_sha256(self.pdf_path))
+
+    @patch('app.services.text_extraction.extract_text', return_value='Page one\x0c')
+    def test_text_is_persisted(self, mock_extract_text):
+        """
+        Test that the text is stored in ExtractedText and read back after the memory tier is cleared.
+        """
+        self.cache.get_text(self.pdf_path)
+        self.cache.clear()
+
+        self.assertEqual(self.cache.get_text(self.pdf_path), 'Page one\x0c')
+        mock_extract_text.assert_called_once()
+        extracted = ExtractedText.query.filter_by(content_hash=file_sha256(self.pdf_path)).one()
+        self.assertEqual((extracted.page_count, extracted.pages), (1, '["Page one"]'))
+
+    @patch('app.services.text_extraction.extract_text', return_value='Page one\x0c')
+    def test_storing_text_leaves_the_callers_transaction_alone(self, mock_extract_text):
+        """
+        Test that the text is committed on its own, without committing or discarding the caller's changes.
+        """
+        db.session.add(User(first_name='Pending', last_name='User', username='pending', email='pending@example.com',
+                            password_hash='password'))
+        self.cache.get_text(self.pdf_path)
+        db.session.rollback()
+
+        self.assertEqual(User.query.filter_by(username='pending').count(), 0)
+        self.assertEqual(ExtractedText.query.filter_by(content_hash=file_sha256(self.pdf_path)).count(), 1)
+
+
+class TestPDFPageExtractor(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.pdf_path = tempfile.mkstemp(suffix='.pdf')
+        os.close(handle)
+        write_pdf(self.pdf_path, [f"Page number {i}" for i in range(6)])
+        self.extractor = PDFPageExtractor(max_workers=3, page_timeout=30, min_parallel_pages=4)
+
+    def tearDown(self):
+        self.extractor.shutdown()
+        os.remove(self.pdf_path)
+
+    def test_pages_are_extracted_in_order(self):
+        """
+        Test that pages extracted in worker processes are reassembled in page order.
+        """
+        self.assertEqual(count_pdf_pages(self.pdf_path), 6)
+        pages = self.extractor.extract(self.pdf_path)
+        self.assertEqual([page.strip() for page in pages], [f"Page number {i}" for i in range(6)])
+
+    def test_small_files_are_extracted_in_process(self):
+        """
+        Test that files below the page threshold do not start the worker pool.
+        """
+        extractor = PDFPageExtractor(max_workers=3, min_parallel_pages=10)
+        pages = extractor.extract(self.pdf_path)
+        self.assertEqual(len(pages), 6)
+        self.assertIsNone(extractor._pool)
+
+    def extract_in_daemonic_process(self):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        worker = context.Process(target=extract_in_daemon, args=(self.extractor, self.pdf_path, results),
+                                 daemon=True)
+        worker.start()
+        worker.join(60)
+        self.assertEqual(worker.exitcode, 0)
+        return results.get(timeout=5)
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_daemonic_process_extracts_in_process(self):
+        """
+        Test that a daemonic process, which may not start worker processes, extracts large files itself.
+        """
+        self.assertEqual(self.extract_in_daemonic_process(), [f"Page number {i}" for i in range(6)])
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_pool_start_failure_extracts_in_process(self):
+        """
+        Test that a worker pool that cannot start its processes falls back to extracting in-process.
+        """
+        with patch('app.services.text_extraction.can_start_worker_processes', return_value=True):
+            pages = self.extract_in_daemonic_process()
+        self.assertEqual(pages, [f"Page number {i}" for i in range(6)])
+
+    def test_slow_page_times_out(self):
+        """
+        Test that a page exceeding the timeout fails the document instead of hanging.
+        """
+        self.extractor.page_timeout = 0.000001
+        with self.assertRaises(TimeoutError):
+            self.extractor.extract(self.pdf_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
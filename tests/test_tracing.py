@@ -0,0 +1,162 @@
+"""
+test_tracing.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_tracing.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the tracing spans, latency histograms and metrics endpoint of the analysis pipeline.
+
+Classes:
+    TestTracing: Tests for LatencyHistogram, Tracer, /metrics and the analysis stage spans.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_tracing
+"""
+
+import random
+import time
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+from app.db_manager import db
+from app.models import User
+from app.services.tracing import LatencyHistogram, Tracer, tracer
+from tests.base_test import TestBaseTestCase
+
+
+class TestTracing(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tracer.reset()
+
+    def tearDown(self):
+        tracer.reset()
+        super().tearDown()
+
+    def make_admin(self):
+        self.set_user_session()
+        user = User.query.filter_by(username='testuser').first()
+        user.is_admin = True
+        db.session.commit()
+
+    def test_histogram_percentiles_are_within_one_percent(self):
+        """
+        Test that percentiles of the histogram are within 1% of the exact values, and exact for small values.
+        """
+        histogram = LatencyHistogram()
+        values = sorted(int(random.Random(7).lognormvariate(8, 2)) for _ in range(20000))
+        for value in values:
+            histogram.record(value)
+        for percentile in (50, 90, 99, 99.9):
+            exact = values[int(-(-len(values) * percentile // 100)) - 1]
+            self.assertAlmostEqual(histogram.percentile(percentile), exact, delta=exact / 100 + 1)
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (20000, values[0], values[-1]))
+
+        small = LatencyHistogram()
+        for value in (3, 7, 200):
+            small.record(value)
+        self.assertEqual([small.percentile(p) for p in (1, 50, 100)], [3, 7, 200])
+        self.assertEqual(small.count_at_or_below(7), 2)
+
+    def test_traces_collect_their_spans(self):
+        """
+        Test that spans are recorded per stage and in the current trace, including spans that raise,
+        and that a disabled tracer records nothing.
+        """
+        local_tracer = Tracer()
+        with local_tracer.trace('request') as trace:
+            with local_tracer.span('extraction'):
+                time.sleep(0.002)
+            with self.assertRaises(ValueError):
+                with local_tracer.span('scoring'):
+                    raise ValueError("bad score")
+        with local_tracer.span('extraction'):
+            pass
+
+        self.assertEqual([name for name, _ in trace.spans], ['extraction', 'scoring'])
+        self.assertGreaterEqual(trace.stage_durations()['extraction'], 2)
+        self.assertRegex(trace.server_timing(), r'^extraction;dur=[\d.]+, scoring;dur=[\d.]+, total;dur=[\d.]+$')
+        summary = {stage["stage"]: stage for stage in local_tracer.summary()}
+        self.assertEqual([stage["stage"] for stage in local_tracer.summary()], ['extraction', 'scoring', 'request'])
+        self.assertEqual((summary['extraction']["count"], summary['scoring']["errors"]), (2, 1))
+
+        local_tracer.enabled = False
+        local_tracer.reset()
+        with local_tracer.trace('request') as trace:
+            with local_tracer.span('extraction'):
+                pass
+        self.assertEqual((trace.spans, local_tracer.summary()), ([], []))
+
+    def test_span_overhead_is_small(self):
+        """
+        Test that a span costs well under a millisecond, so it adds less than 1% to stages taking milliseconds.
+        """
+        local_tracer = Tracer()
+        start = time.perf_counter()
+        for _ in range(10000):
+            with local_tracer.span('inference'):
+                pass
+        self.assertLess((time.perf_counter() - start) / 10000, 50e-6)
+
+    def test_prometheus_exposition(self):
+        """
+        Test that stages are rendered as cumulative histograms, quantile summaries and error counters.
+        """
+        local_tracer = Tracer()
+        for duration in (500_000, 2_000_000, 40_000_000):
+            local_tracer.record('inference', duration)
+        local_tracer.record('scoring', 100_000, failed=True)
+
+        lines = local_tracer.render_prometheus(buckets=(0.001, 0.01)).splitlines()
+        self.assertIn('# TYPE resumate_stage_duration_seconds histogram', lines)
+        self.assertIn('resumate_stage_duration_seconds_bucket{stage="inference",le="0.001"} 1', lines)
+        self.assertIn('resumate_stage_duration_seconds_bucket{stage="inference",le="0.01"} 2', lines)
+        self.assertIn('resumate_stage_duration_seconds_bucket{stage="inference",le="+Inf"} 3', lines)
+        self.assertIn('resumate_stage_duration_seconds_sum{stage="inference"} 0.042500', lines)
+        median = next(line for line in lines if line.startswith('resumate_stage_latency_seconds{stage="inference",'
+                                                                  'quantile="0.5"}'))
+        self.assertAlmostEqual(float(median.split()[1]), 0.002, delta=0.002 / 100)
+        self.assertIn('resumate_stage_errors_total{stage="scoring"} 1', lines)
+
+    def test_analysis_stages_are_timed(self):
+        """
+        Test that /analyze_resume records every stage it runs, returns them in Server-Timing, and that
+        the metrics and dashboard show them to admins only.
+        """
+        self.set_user_session()
+        with patch.object(self.app.ai_service.batcher, 'process',
+                          return_value=[{"label": "POSITIVE", "score": 0.9, "windows": 1}]):
+            response = self.client.post('/analyze_resume', data={
+                'resume_file': (BytesIO(b"Python and SQL developer"), 'resume.txt'),
+                'job_description': "Python developer with SQL"})
+        self.assertEqual(response.status_code, 200)
+        timed = [part.split(';')[0] for part in response.headers['Server-Timing'].split(', ')]
+        self.assertEqual(timed, ['cache_lookup', 'extraction', 'inference', 'phrase_matching', 'scoring',
+                                 'persistence', 'total'])
+        self.assertEqual([stage["stage"] for stage in tracer.summary()],
+                         ['extraction', 'cache_lookup', 'inference', 'phrase_matching', 'scoring', 'persistence',
+                          'analyze_resume'])
+
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.app.config['METRICS_TOKEN'] = 'scrape-token'
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        self.assertIn('resumate_stage_duration_seconds_count{stage="inference"} 1', response.get_data(as_text=True))
+
+        self.make_admin()
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+        response = self.client.get('/dashboard')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'phrase_matching', response.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
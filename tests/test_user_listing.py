@@ -0,0 +1,109 @@
+"""
+test_user_listing.py
+------------------------------------------------
+Author: William Richmond
+Created on: 18 October 2026
+File name: test_user_listing.py
+Revised: [Add revised date]
+
+Description:
+This module contains tests for the keyset pagination of the users.
+
+Classes:
+    TestUserListing: Tests for list_users and the paginated users pages.
+
+Usage:
+    Run this module with a tests runner to execute the tests.
+
+Example:
+    python -m unittest test_user_listing
+"""
+
+import unittest
+from app.db_manager import db
+from app.models import User
+from app.services.user_listing import InvalidCursorError, list_users
+from tests.base_test import TestBaseTestCase
+
+
+class TestUserListing(TestBaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ('carol', 'alice', 'dave', 'bob', 'al_x'):
+            db.session.add(User(first_name=name, last_name='Test', username=name, email=f'{name}@example.com',
+                                password_hash='x'))
+        db.session.commit()
+
+    def walk(self, **kwargs):
+        """
+        Collect the usernames of every page.
+        """
+        usernames, cursor, pages = [], None, 0
+        while True:
+            page = list_users(after=cursor, **kwargs)
+            usernames += [user.username for user in page.users]
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                return usernames, pages
+
+    def test_pages_cover_every_user_once(self):
+        """
+        Test that walking the pages returns every user once, in order, in any sort order.
+        """
+        all_ids = [user.id for user in User.query.order_by(User.id)]
+        usernames, pages = self.walk(limit=2)
+        self.assertEqual(pages, 3)
+        self.assertEqual([User.query.filter_by(username=name).first().id for name in usernames], all_ids)
+
+        usernames, _ = self.walk(limit=2, sort='username', descending=True)
+        self.assertEqual(usernames, ['testuser', 'dave', 'carol', 'bob', 'alice', 'al_x'])
+
+    def test_prefix_search_escapes_wildcards(self):
+        """
+        Test that the search matches username or email prefixes and treats '_' literally.
+        """
+        usernames, _ = self.walk(limit=10, sort='username', search='al')
+        self.assertEqual(usernames, ['al_x', 'alice'])
+        usernames, _ = self.walk(limit=10, search='al_')
+        self.assertEqual(usernames, ['al_x'])
+        usernames, _ = self.walk(limit=10, search='tests@')
+        self.assertEqual(usernames, ['testuser'])
+
+    def test_invalid_cursor_raises(self):
+        """
+        Test that a malformed cursor or a cursor of another sort order is rejected.
+        """
+        cursor = list_users(limit=1, sort='email').next_cursor
+        with self.assertRaises(InvalidCursorError):
+            list_users(after=cursor, sort='username')
+        with self.assertRaises(InvalidCursorError):
+            list_users(after='not a cursor')
+        with self.assertRaises(ValueError):
+            list_users(sort='password_hash')
+
+    def test_users_page_json_variant(self):
+        """
+        Test that the users page renders one page and follows the cursor in its JSON variant.
+        """
+        self.set_user_session()
+        response = self.client.get('/users?limit=2&sort=username')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'al_x', response.data)
+        self.assertNotIn(b'bob', response.data)
+        self.assertIn(b'Next page', response.data)
+
+        first = self.client.get('/users?limit=4&sort=username&format=json').get_json()
+        self.assertEqual([user["username"] for user in first["users"]], ['al_x', 'alice', 'bob', 'carol'])
+        second = self.client.get('/users', query_string={'limit': 4, 'sort': 'username', 'format': 'json',
+                                                         'after': first["next_cursor"]}).get_json()
+        self.assertEqual([user["username"] for user in second["users"]], ['dave', 'testuser'])
+        self.assertIsNone(second["next_cursor"])
+
+        response = self.client.get('/users?format=json&order=sideways')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
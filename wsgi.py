@@ -23,10 +23,6 @@ import logging
 # Setup logging
 logger = logging.getLogger('wsgi')
 logger.setLevel(logging.INFO)
-handler = logging.FileHandler('logs/wsgi.log')
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
 try:
     app = create_app()